@@ -13,7 +13,12 @@ Vehicle Routing Problem com Time Windows (VRPTW).
 
 import sys
 import os
+import io
 import json
+import hashlib
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import numpy as np
 from datetime import datetime
 
@@ -24,12 +29,62 @@ from src.utils import (
     create_directories, 
     load_sales_data_as_vrptw, 
     save_instance,
-    load_instance
+    load_instance,
+    save_instance_npz,
+    load_instance_npz,
+    numba_threads_started
 )
 from src.heuristics import SolomonInsertion
-from src.genetic_algorithm import ImprovedGeneticAlgorithm, Solution
+from src.genetic_algorithm import (
+    ImprovedGeneticAlgorithm,
+    IslandGeneticAlgorithm,
+    Solution,
+    create_process_pool,
+    create_thread_pool,
+    free_threading,
+    BatchFitnessEvaluator,
+    warmup_kernels,
+    mpi_worker_loop,
+    mpi_shutdown
+)
 from src.visualization import VRPTWVisualizer
 
+# Modo MPI opcional (mpirun -np P python main.py)
+try:
+    from mpi4py import MPI
+except ImportError:
+    MPI = None
+
+# Serialização JSON rápida opcional (cai para o json da biblioteca padrão)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dump_json(data: dict, path: str):
+    """
+    Grava `data` em JSON indentado; arrays e escalares NumPy são aceitos.
+    
+    Usa orjson quando disponível (serializa NumPy nativamente).
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        return
+    
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, default=lambda obj: obj.tolist())
+
+
+def _render_plot(instance, method: str, args: tuple, kwargs: dict) -> str:
+    """Renderiza um gráfico em processo separado; retorna a saída impressa."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        visualizer = VRPTWVisualizer(instance, show=False)
+        getattr(visualizer, method)(*args, **kwargs)
+    return output.getvalue()
+
 
 class VRPTWProject:
     """Classe principal para gerenciar o projeto VRPTW."""
@@ -48,6 +103,19 @@ class VRPTWProject:
         self.solomon_solution = None
         self.ga_solution = None
         self.ga = None
+        self.pool = None  # Pool persistente de processos (criado sob demanda)
+        self._ga_save_future = None  # Gravação do JSON do AG em segundo plano
+        self._instance_sent = False  # MPI: instância já enviada aos ranks
+        
+        # MPI: só é usado quando lançado com mais de um rank
+        self.comm = None
+        self.rank = 0
+        if MPI is not None and MPI.COMM_WORLD.Get_size() > 1:
+            self.comm = MPI.COMM_WORLD
+            self.rank = self.comm.Get_rank()
+        
+        if self.rank != 0:
+            return
         
         print("\n" + "="*80)
         print(" "*15 + "PROJETO: VRPTW COM ALGORITMO GENÉTICO HÍBRIDO")
@@ -67,12 +135,16 @@ class VRPTWProject:
             'data': {
                 'input_file': 'data/raw/sales_data.csv',
                 'instance_file': 'data/processed/vrptw_instances.json',
-                'max_customers': 40
+                'max_customers': 40,
+                'cache_instance': True,  # Reaproveita instância pré-processada (.npz)
+                'avg_speed': 1.0,  # Tempo de viagem = distância / velocidade
+                'dtype': 'float64'  # 'float32': metade da memória nas matrizes dos kernels
             },
             'solomon': {
                 'alpha': 1.0,
                 'mu': 1.0,
-                'lambda_param': 2.0
+                'lambda_param': 2.0,
+                'parallel_seeds': 0  # >1: primeiras rotas em paralelo (setores angulares, Numba prange)
             },
             'genetic_algorithm': {
                 'pop_size': 100,
@@ -81,12 +153,19 @@ class VRPTWProject:
                 'crossover_rate': 0.8,
                 'mutation_rate': 0.2,
                 'local_search_rate': 0.3,
-                'seed': 42
+                'seed': 42,
+                'n_workers': 1,  # >1 avalia fitness em paralelo (None = todos os núcleos)
+                'device': 'cpu',  # 'numba': lote em paralelo (prange); 'gpu': Numba CUDA
+                'n_islands': 1,  # >1: modelo de ilhas (uma subpopulação por processo)
+                'migration_interval': 10,  # Gerações entre migrações entre ilhas
+                'n_migrants': 3  # Melhores soluções enviadas à próxima ilha
             },
             'output': {
                 'solutions_dir': 'results/solutions',
                 'plots_dir': 'results/plots',
-                'report_file': 'results/report.txt'
+                'report_file': 'results/report.txt',
+                'parallel_plots': True,  # Renderiza os gráficos em processos (sem exibir)
+                'plot_dpi': 150  # Resolução dos PNGs (300 para publicação, ~4x mais lento)
             }
         }
     
@@ -97,6 +176,11 @@ class VRPTWProject:
         
         create_directories()
         
+        # Compila kernels Numba antes dos passos cronometrados (na mesma
+        # precisão que a instância usará)
+        warmup_kernels(self.config['data'].get('dtype', 'float64'))
+        print("✓ Kernels compilados")
+        
         print(f"\n✓ Configuração concluída")
         print("="*80 + "\n")
     
@@ -120,13 +204,36 @@ class VRPTWProject:
             print(f"   Máximo de entregas: {max_customers}")
             print(f"   Capacidade por veículo: {vehicle_capacity:.0f} unidades\n")
             
-            # Carrega instância (AGORA COM ARGUMENTO CORRETO)
-            self.instance = load_food_delivery_instance(
-                max_customers=max_customers,
-                center_id=None,
-                vehicle_capacity=vehicle_capacity,  # AGORA FUNCIONA
-                data_path='data/raw/food_delivery/train.csv'
-            )
+            # Cache da instância pré-processada, indexado pelos dados e parâmetros
+            data_path = 'data/raw/food_delivery/train.csv'
+            cache_file = self._instance_cache_file(data_path, max_customers, vehicle_capacity)
+            use_cache = self.config['data'].get('cache_instance', True) and cache_file is not None
+            
+            if use_cache and os.path.exists(cache_file):
+                self.instance = load_instance_npz(cache_file)
+            else:
+                # Carrega instância (AGORA COM ARGUMENTO CORRETO)
+                self.instance = load_food_delivery_instance(
+                    max_customers=max_customers,
+                    center_id=None,
+                    vehicle_capacity=vehicle_capacity,  # AGORA FUNCIONA
+                    data_path=data_path
+                )
+                
+                if use_cache:
+                    save_instance_npz(self.instance, cache_file)
+            
+            # Precisão dos arrays dos kernels (o cache .npz fica em float64)
+            self.instance.set_dtype(self.config['data'].get('dtype', 'float64'))
+            
+            # Matriz de tempos de viagem pré-calculada (uma única vez)
+            self.instance.set_speed(self.config['data'].get('avg_speed', 1.0))
+            
+            # MPI: só o rank 0 lê o CSV e grava o cache; os demais recebem a
+            # instância pronta (sem leituras e escritas concorrentes do .npz)
+            if self.comm is not None:
+                self.comm.bcast(self.instance, root=0)
+                self._instance_sent = True
             
         except FileNotFoundError as e:
             print(f"\n❌ ERRO: {e}")
@@ -149,6 +256,25 @@ class VRPTWProject:
         
         print("="*80 + "\n")
     
+    @staticmethod
+    def _instance_cache_file(data_path: str, max_customers: int,
+                             vehicle_capacity: float) -> str:
+        """
+        Caminho do cache .npz para (dados, max_customers, capacidade).
+        
+        Os dados são o CSV ou, sem ele, o cache Parquet ao lado (o mesmo
+        arquivo que FoodDeliveryLoader.load_data lerá); None se nenhum dos
+        dois existir (o carregador informa o erro).
+        """
+        source = data_path
+        if not os.path.exists(source):
+            source = os.path.splitext(data_path)[0] + '.parquet'
+            if not os.path.exists(source):
+                return None
+        mtime = os.stat(source).st_mtime
+        key = hashlib.md5(f"{mtime}-{max_customers}-{vehicle_capacity}".encode()).hexdigest()[:8]
+        return os.path.join('data', 'processed', f'instance_{key}.npz')
+    
     def solve_with_solomon(self):
         """Resolve usando heurística de Solomon."""
         print("PASSO 3: SOLUÇÃO INICIAL (HEURÍSTICA DE SOLOMON)")
@@ -158,7 +284,8 @@ class VRPTWProject:
             self.instance,
             alpha=self.config['solomon']['alpha'],
             mu=self.config['solomon']['mu'],
-            lambda_param=self.config['solomon']['lambda_param']
+            lambda_param=self.config['solomon']['lambda_param'],
+            parallel_seeds=self.config['solomon'].get('parallel_seeds', 0)
         )
         
         vehicles = solomon.construct_solution()
@@ -182,6 +309,50 @@ class VRPTWProject:
         
         ga_config = self.config['genetic_algorithm']
         
+        # Modelo de ilhas: cada subpopulação evolui serialmente em seu processo
+        n_islands = ga_config.get('n_islands', 1)
+        if n_islands > 1:
+            print(f"⚙️ Modelo de ilhas: {n_islands} processos "
+                  f"(migração a cada {ga_config.get('migration_interval', 10)} gerações)\n")
+            self.ga = IslandGeneticAlgorithm(
+                instance=self.instance,
+                n_islands=n_islands,
+                migration_interval=ga_config.get('migration_interval', 10),
+                n_migrants=ga_config.get('n_migrants', 3),
+                pop_size=ga_config['pop_size'],
+                elite_size=ga_config['elite_size'],
+                generations=ga_config['generations'],
+                crossover_rate=ga_config['crossover_rate'],
+                mutation_rate=ga_config['mutation_rate'],
+                local_search_rate=ga_config['local_search_rate'],
+                seed=ga_config['seed']
+            )
+            self.ga_solution = self.ga.run()
+            self._start_ga_save()
+            print("="*80 + "\n")
+            return
+        
+        # Pool criado uma única vez (instância enviada no initializer)
+        n_workers = ga_config.get('n_workers', 1) or os.cpu_count()
+        if n_workers > 1 and self.pool is None:
+            if free_threading():
+                # Sem GIL: threads compartilham a instância sem serialização
+                print(f"⚙️ Avaliação paralela (fitness e 2-opt): {n_workers} threads (Python sem GIL)\n")
+                self.pool = create_thread_pool(n_workers)
+            else:
+                print(f"⚙️ Avaliação paralela (fitness e 2-opt): {n_workers} processos (memória compartilhada)\n")
+                self.pool = create_process_pool(self.instance, n_workers)
+        
+        # Avaliação em GPU: instância enviada ao dispositivo uma única vez
+        evaluator = None
+        if ga_config.get('device', 'cpu') == 'gpu':
+            from src.ga_gpu import GPUPopulationEvaluator
+            print("⚙️ Avaliação de fitness em GPU (Numba CUDA)\n")
+            evaluator = GPUPopulationEvaluator(self.instance)
+        elif ga_config.get('device', 'cpu') == 'numba':
+            print("⚙️ Avaliação de fitness em lote (Numba, paralela nos núcleos)\n")
+            evaluator = BatchFitnessEvaluator(self.instance)
+        
         self.ga = ImprovedGeneticAlgorithm(  # MUDOU AQUI
             instance=self.instance,
             pop_size=ga_config['pop_size'],
@@ -190,13 +361,24 @@ class VRPTWProject:
             crossover_rate=ga_config['crossover_rate'],
             mutation_rate=ga_config['mutation_rate'],
             local_search_rate=ga_config['local_search_rate'],
-            seed=ga_config['seed']
+            seed=ga_config['seed'],
+            executor=self.pool,
+            n_workers=n_workers,
+            comm=self.comm,
+            evaluator=evaluator
         )
         
         self.ga_solution = self.ga.run()
+        self._start_ga_save()
         
         print("="*80 + "\n")
     
+    def _start_ga_save(self):
+        """Grava o JSON do AG em segundo plano, sobrepondo análise e gráficos."""
+        io_executor = ThreadPoolExecutor(max_workers=1)
+        self._ga_save_future = io_executor.submit(self._save_ga_json)
+        io_executor.shutdown(wait=False)
+    
     def analyze_results(self):
         """Analisa e compara resultados."""
         print("PASSO 5: ANÁLISE DE RESULTADOS")
@@ -261,51 +443,88 @@ class VRPTWProject:
         print("PASSO 6: GERAÇÃO DE VISUALIZAÇÕES")
         print("-" * 80 + "\n")
         
-        visualizer = VRPTWVisualizer(self.instance)
         plots_dir = self.config['output']['plots_dir']
-        
-        # 1. Solução de Solomon
-        print("📊 Plotando solução inicial (Solomon)...")
-        visualizer.plot_solution(
-            self.solomon_solution,
-            save_path=f'{plots_dir}/solution_solomon.png',
-            title='Solução Inicial - Heurística de Solomon'
-        )
-        
-        # 2. Solução do AG
-        print("📊 Plotando solução otimizada (AG)...")
-        visualizer.plot_solution(
-            self.ga_solution,
-            save_path=f'{plots_dir}/solution_genetic_algorithm.png',
-            title='Solução Otimizada - Algoritmo Genético Híbrido'
-        )
-        
-        # 3. Convergência
-        print("📊 Plotando convergência do AG...")
-        visualizer.plot_convergence(
-            self.ga.best_fitness_history,
-            self.ga.avg_fitness_history,
-            save_path=f'{plots_dir}/convergence.png'
-        )
-        
-        # 4. Comparação
-        print("📊 Plotando comparação de soluções...")
-        visualizer.plot_comparison(
-            [self.solomon_solution, self.ga_solution],
-            ['Solomon', 'AG Híbrido'],
-            save_path=f'{plots_dir}/comparison.png'
-        )
-        
-        # 5. Janelas de tempo
-        print("📊 Plotando cumprimento de janelas de tempo...")
-        visualizer.plot_time_windows(
-            self.ga_solution,
-            save_path=f'{plots_dir}/time_windows.png'
-        )
+        dpi = self.config['output'].get('plot_dpi', 150)
+        
+        # As figuras são apenas salvas (sem plt.show: o visualizador só exibe
+        # gráficos sem save_path). Com parallel_plots (e mais de um núcleo),
+        # são renderizadas em processos paralelos: o backend Agg não libera o
+        # GIL, então threads não ajudariam
+        parallel = (self.config['output'].get('parallel_plots', True)
+                    and (os.cpu_count() or 1) > 1)
+        
+        plots = [
+            # 1. Solução de Solomon
+            ("📊 Plotando solução inicial (Solomon)...", 'plot_solution',
+             (self.solomon_solution,),
+             dict(save_path=f'{plots_dir}/solution_solomon.png', dpi=dpi,
+                  title='Solução Inicial - Heurística de Solomon')),
+            # 2. Solução do AG
+            ("📊 Plotando solução otimizada (AG)...", 'plot_solution',
+             (self.ga_solution,),
+             dict(save_path=f'{plots_dir}/solution_genetic_algorithm.png', dpi=dpi,
+                  title='Solução Otimizada - Algoritmo Genético Híbrido')),
+            # 3. Convergência
+            ("📊 Plotando convergência do AG...", 'plot_convergence',
+             (self.ga.best_fitness_history, self.ga.avg_fitness_history),
+             dict(save_path=f'{plots_dir}/convergence.png', dpi=dpi)),
+            # 4. Comparação
+            ("📊 Plotando comparação de soluções...", 'plot_comparison',
+             ([self.solomon_solution, self.ga_solution], ['Solomon', 'AG Híbrido']),
+             dict(save_path=f'{plots_dir}/comparison.png', dpi=dpi)),
+            # 5. Janelas de tempo
+            ("📊 Plotando cumprimento de janelas de tempo...", 'plot_time_windows',
+             (self.ga_solution,),
+             dict(save_path=f'{plots_dir}/time_windows.png', dpi=dpi)),
+        ]
+        
+        if parallel:
+            # Se um kernel prange (device='numba', parallel_seeds > 1) já
+            # iniciou as threads do Numba, um fork herdaria o pool TBB e o
+            # processo não terminaria: os trabalhadores são criados com spawn
+            context = (multiprocessing.get_context('spawn')
+                       if numba_threads_started() else None)
+            with ProcessPoolExecutor(max_workers=min(len(plots), os.cpu_count()),
+                                     mp_context=context) as executor:
+                futures = []
+                for message, method, args, kwargs in plots:
+                    print(message)
+                    futures.append(executor.submit(_render_plot, self.instance,
+                                                   method, args, kwargs))
+                for future in futures:
+                    print(future.result(), end='')
+        else:
+            visualizer = VRPTWVisualizer(self.instance)
+            for message, method, args, kwargs in plots:
+                print(message)
+                getattr(visualizer, method)(*args, **kwargs)
         
         print(f"\n✓ Todas as visualizações salvas em: {plots_dir}/")
         print("="*80 + "\n")
     
+    @staticmethod
+    def _serialize_routes(solution: Solution) -> list:
+        """
+        Rotas não vazias da solução em formato serializável (JSON).
+        
+        Carga, distância e tempo de todos os veículos são convertidos em lote
+        (array NumPy -> tolist) em vez de float() por atributo.
+        """
+        vehicles = [v for v in solution.vehicles if v.route]
+        metrics = np.array([(v.load, v.total_distance, v.total_time) for v in vehicles],
+                           dtype=np.float64).reshape(-1, 3).tolist()
+        
+        return [
+            {
+                'vehicle_id': v.id,
+                'customers': [c.id for c in v.route],
+                'load': load,
+                'distance': distance,
+                'time': time
+            }
+            for v, (load, distance, time) in zip(vehicles, metrics)
+        ]
+    
     def save_solutions(self):
         """Salva soluções em arquivos."""
         print("PASSO 7: SALVAMENTO DE SOLUÇÕES")
@@ -316,58 +535,50 @@ class VRPTWProject:
         # Salva solução de Solomon
         solomon_data = {
             'method': 'Solomon Insertion Heuristic',
-            'fitness': float(self.solomon_solution.fitness),
-            'total_distance': float(self.solomon_solution.total_distance),
-            'total_time': float(self.solomon_solution.total_time),
-            'num_vehicles': int(self.solomon_solution.num_vehicles),
-            'feasible': bool(self.solomon_solution.feasible),
-            'routes': [
-                {
-                    'vehicle_id': v.id,
-                    'customers': [c.id for c in v.route],
-                    'load': float(v.load),
-                    'distance': float(v.total_distance),
-                    'time': float(v.total_time)
-                }
-                for v in self.solomon_solution.vehicles if v.route
-            ]
+            'fitness': self.solomon_solution.fitness,
+            'total_distance': self.solomon_solution.total_distance,
+            'total_time': self.solomon_solution.total_time,
+            'num_vehicles': self.solomon_solution.num_vehicles,
+            'feasible': self.solomon_solution.feasible,
+            'routes': self._serialize_routes(self.solomon_solution)
         }
         
-        with open(f'{solutions_dir}/solution_solomon.json', 'w') as f:
-            json.dump(solomon_data, f, indent=2)
+        _dump_json(solomon_data, f'{solutions_dir}/solution_solomon.json')
         
         print(f"✓ Solução Solomon salva: {solutions_dir}/solution_solomon.json")
         
-        # Salva solução do AG
+        # Solução do AG: gravada em segundo plano desde o PASSO 4
+        if self._ga_save_future is not None:
+            ga_file = self._ga_save_future.result()
+            self._ga_save_future = None
+        else:
+            ga_file = self._save_ga_json()
+        
+        print(f"✓ Solução AG salva: {ga_file}")
+        print("="*80 + "\n")
+    
+    def _save_ga_json(self) -> str:
+        """Salva a solução do AG em JSON (executado em thread de E/S)."""
+        solutions_dir = self.config['output']['solutions_dir']
+        
         ga_data = {
             'method': 'Hybrid Genetic Algorithm',
-            'fitness': float(self.ga_solution.fitness),
-            'total_distance': float(self.ga_solution.total_distance),
-            'total_time': float(self.ga_solution.total_time),
-            'num_vehicles': int(self.ga_solution.num_vehicles),
-            'feasible': bool(self.ga_solution.feasible),
-            'routes': [
-                {
-                    'vehicle_id': v.id,
-                    'customers': [c.id for c in v.route],
-                    'load': float(v.load),
-                    'distance': float(v.total_distance),
-                    'time': float(v.total_time)
-                }
-                for v in self.ga_solution.vehicles if v.route
-            ],
+            'fitness': self.ga_solution.fitness,
+            'total_distance': self.ga_solution.total_distance,
+            'total_time': self.ga_solution.total_time,
+            'num_vehicles': self.ga_solution.num_vehicles,
+            'feasible': self.ga_solution.feasible,
+            'routes': self._serialize_routes(self.ga_solution),
             'algorithm_parameters': self.config['genetic_algorithm'],
             'convergence': {
-                'best_fitness_history': [float(f) for f in self.ga.best_fitness_history],
-                'avg_fitness_history': [float(f) for f in self.ga.avg_fitness_history]
+                'best_fitness_history': self.ga.best_fitness_history,
+                'avg_fitness_history': self.ga.avg_fitness_history
             }
         }
         
-        with open(f'{solutions_dir}/solution_genetic_algorithm.json', 'w') as f:
-            json.dump(ga_data, f, indent=2)
-        
-        print(f"✓ Solução AG salva: {solutions_dir}/solution_genetic_algorithm.json")
-        print("="*80 + "\n")
+        ga_file = f'{solutions_dir}/solution_genetic_algorithm.json'
+        _dump_json(ga_data, ga_file)
+        return ga_file
     
     def generate_report(self, analysis_results: dict):
         """Gera relatório técnico completo."""
@@ -376,224 +587,254 @@ class VRPTWProject:
         
         report_file = self.config['output']['report_file']
         
-        report_lines = []
-        
-        # Cabeçalho
-        report_lines.append("="*80)
-        report_lines.append("RELATÓRIO TÉCNICO - VRPTW COM ALGORITMO GENÉTICO HÍBRIDO")
-        report_lines.append("="*80)
-        report_lines.append(f"\nAutor: Rafael Lopes Pinheiro")
-        report_lines.append(f"Data: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report_lines.append(f"GitHub: @RafaelLopesPinheiro")
-        
-        # Referência
-        report_lines.append("\n" + "="*80)
-        report_lines.append("1. REFERÊNCIA DO ARTIGO")
-        report_lines.append("="*80)
-        report_lines.append("\nTítulo: Research on Vehicle Routing Problem with Time Windows")
-        report_lines.append("        Based on Improved Genetic Algorithm")
-        report_lines.append("Autores: Não especificado no prompt (artigo de 2025)")
-        report_lines.append("Fonte: MDPI Electronics, 2025")
-        report_lines.append("DOI: https://doi.org/10.3390/electronics14040647")
-        
-        # Descrição do problema
-        report_lines.append("\n" + "="*80)
-        report_lines.append("2. DESCRIÇÃO DO PROBLEMA")
-        report_lines.append("="*80)
-        report_lines.append("\nO Vehicle Routing Problem with Time Windows (VRPTW) é um problema")
-        report_lines.append("clássico de otimização combinatória classificado como NP-difícil.")
-        report_lines.append("\nObjetivo:")
-        report_lines.append("  Minimizar a distância total percorrida por uma frota de veículos")
-        report_lines.append("  para atender todos os clientes, respeitando:")
-        report_lines.append("    • Capacidade dos veículos")
-        report_lines.append("    • Janelas de tempo de cada cliente")
-        report_lines.append("    • Tempo máximo de rota")
-        
-        # Descrição do algoritmo
-        report_lines.append("\n" + "="*80)
-        report_lines.append("3. ALGORITMOS IMPLEMENTADOS")
-        report_lines.append("="*80)
-        
-        report_lines.append("\n3.1. Heurística de Inserção de Solomon (I1)")
-        report_lines.append("-" * 80)
-        report_lines.append("Heurística construtiva gulosa que:")
-        report_lines.append("  1. Seleciona cliente inicial (mais distante do depot)")
-        report_lines.append("  2. Insere clientes usando critério de custo c(i,u,j):")
-        report_lines.append("     c(i,u,j) = α·c1(i,u,j) + λ·c2(i,u,j)")
-        report_lines.append("     onde:")
-        report_lines.append("       c1 = custo de distância adicional")
-        report_lines.append("       c2 = custo temporal (urgência)")
-        report_lines.append("  3. Repete até não ser possível inserir mais clientes")
-        
-        report_lines.append("\n3.2. Algoritmo Genético Híbrido")
-        report_lines.append("-" * 80)
-        report_lines.append("Componentes principais:")
-        report_lines.append("\na) Representação:")
-        report_lines.append("   • Cromossomo = sequência de clientes agrupados em rotas")
-        report_lines.append("\nb) Inicialização:")
-        report_lines.append("   • 30% - Heurística de Solomon com parâmetros variados")
-        report_lines.append("   • 40% - Construção aleatória gulosa")
-        report_lines.append("   • 30% - Mutações da melhor solução")
-        report_lines.append("\nc) Operadores Genéticos:")
-        report_lines.append("   • Seleção: Torneio (tamanho 5)")
-        report_lines.append("   • Crossover: Order Crossover (OX)")
-        report_lines.append("   • Mutação: Swap, Insertion, Inversion")
-        report_lines.append("\nd) Busca Local:")
-        report_lines.append("   • 2-opt intra-rota")
-        report_lines.append("\ne) Estratégias Avançadas:")
-        report_lines.append("   • Elitismo")
-        report_lines.append("   • Reinicialização adaptativa (estagnação > 50 gerações)")
-        
-        # Análise de complexidade
-        report_lines.append("\n" + "="*80)
-        report_lines.append("4. ANÁLISE DE COMPLEXIDADE")
-        report_lines.append("="*80)
-        
-        report_lines.append("\n4.1. Heurística de Solomon")
-        report_lines.append("-" * 80)
-        report_lines.append("Complexidade de Tempo: O(n³)")
-        report_lines.append("  onde n = número de clientes")
-        report_lines.append("\nJustificativa:")
-        report_lines.append("  • Para cada veículo: O(n)")
-        report_lines.append("  • Para cada cliente não roteado: O(n)")
-        report_lines.append("  • Teste de inserção em cada posição: O(n)")
-        report_lines.append("  • Total: O(n) × O(n) × O(n) = O(n³)")
-        
-        report_lines.append("\n4.2. Algoritmo Genético")
-        report_lines.append("-" * 80)
-        report_lines.append("Complexidade de Tempo: O(G × P × n²)")
-        report_lines.append("  onde:")
-        report_lines.append("    G = número de gerações")
-        report_lines.append("    P = tamanho da população")
-        report_lines.append("    n = número de clientes")
-        report_lines.append("\nJustificativa:")
-        report_lines.append("  • Avaliação de fitness: O(n) por solução")
-        report_lines.append("  • Crossover (OX): O(n) por operação")
-        report_lines.append("  • Mutação: O(1) por operação")
-        report_lines.append("  • Busca local 2-opt: O(n²) por solução")
-        report_lines.append("  • Por geração: P × O(n²)")
-        report_lines.append("  • Total: G × P × O(n²)")
-        
-        # Instância do problema
-        report_lines.append("\n" + "="*80)
-        report_lines.append("5. INSTÂNCIA DO PROBLEMA")
-        report_lines.append("="*80)
-        report_lines.append(f"\nNome: {self.instance.name}")
-        report_lines.append(f"Número de Clientes: {len(self.instance.customers)}")
-        report_lines.append(f"Número de Veículos: {self.instance.num_vehicles}")
-        report_lines.append(f"Capacidade dos Veículos: {self.instance.vehicle_capacity:.2f}")
-        report_lines.append(f"\nDemanda Total: {sum(c.demand for c in self.instance.customers):.2f}")
-        report_lines.append(f"Janela de Tempo do Depot: [0.0, 480.0]")
-        
-        # Parâmetros
-        report_lines.append("\n" + "="*80)
-        report_lines.append("6. PARÂMETROS DOS ALGORITMOS")
-        report_lines.append("="*80)
-        
-        report_lines.append("\n6.1. Heurística de Solomon")
-        report_lines.append("-" * 80)
-        for key, value in self.config['solomon'].items():
-            report_lines.append(f"  {key}: {value}")
-        
-        report_lines.append("\n6.2. Algoritmo Genético")
-        report_lines.append("-" * 80)
-        for key, value in self.config['genetic_algorithm'].items():
-            report_lines.append(f"  {key}: {value}")
-        
-        # Resultados
-        report_lines.append("\n" + "="*80)
-        report_lines.append("7. RESULTADOS EXPERIMENTAIS")
-        report_lines.append("="*80)
-        
-        report_lines.append("\n7.1. Solução Inicial (Solomon)")
-        report_lines.append("-" * 80)
-        solomon = analysis_results['solomon']
-        report_lines.append(f"  Distância Total: {solomon['distance']:.2f}")
-        report_lines.append(f"  Tempo Total: {solomon['time']:.2f}")
-        report_lines.append(f"  Número de Veículos: {solomon['vehicles']}")
-        report_lines.append(f"  Fitness: {solomon['fitness']:.2f}")
-        report_lines.append(f"  Factível: {solomon['feasible']}")
-        
-        report_lines.append("\n7.2. Solução Otimizada (Algoritmo Genético)")
-        report_lines.append("-" * 80)
-        ga = analysis_results['genetic_algorithm']
-        report_lines.append(f"  Distância Total: {ga['distance']:.2f}")
-        report_lines.append(f"  Tempo Total: {ga['time']:.2f}")
-        report_lines.append(f"  Número de Veículos: {ga['vehicles']}")
-        report_lines.append(f"  Fitness: {ga['fitness']:.2f}")
-        report_lines.append(f"  Factível: {ga['feasible']}")
-        
-        report_lines.append("\n7.3. Melhorias Obtidas")
-        report_lines.append("-" * 80)
-        improvements = analysis_results['improvements']
-        report_lines.append(f"  Redução de Distância: {improvements['distance_percent']:.2f}%")
-        report_lines.append(f"  Redução de Veículos: {improvements['vehicles_absolute']}")
-        report_lines.append(f"  Melhoria de Fitness: {improvements['fitness_percent']:.2f}%")
-        
-        # Convergência
-        report_lines.append("\n7.4. Análise de Convergência")
-        report_lines.append("-" * 80)
-        report_lines.append(f"  Gerações executadas: {len(self.ga.best_fitness_history)}")
-        report_lines.append(f"  Fitness inicial: {self.ga.best_fitness_history[0]:.2f}")
-        report_lines.append(f"  Fitness final: {self.ga.best_fitness_history[-1]:.2f}")
-        report_lines.append(f"  Melhoria total: {((self.ga.best_fitness_history[0] - self.ga.best_fitness_history[-1]) / self.ga.best_fitness_history[0] * 100):.2f}%")
-        
-        # Conclusões
-        report_lines.append("\n" + "="*80)
-        report_lines.append("8. CONCLUSÕES")
-        report_lines.append("="*80)
-        report_lines.append("\n8.1. Resultados Alcançados")
-        report_lines.append("-" * 80)
-        report_lines.append("  ✓ Implementação bem-sucedida do algoritmo do artigo")
-        report_lines.append("  ✓ Heurística de Solomon gera soluções iniciais viáveis")
-        report_lines.append("  ✓ Algoritmo Genético melhora significativamente a solução")
-        report_lines.append(f"  ✓ Redução de {improvements['distance_percent']:.2f}% na distância total")
-        
-        report_lines.append("\n8.2. Contribuições da Implementação")
-        report_lines.append("-" * 80)
-        report_lines.append("  • Conversão de dados reais de vendas em problema VRPTW")
-        report_lines.append("  • Implementação completa em Python (sem dependências pesadas)")
-        report_lines.append("  • Operadores genéticos adaptados para VRPTW")
-        report_lines.append("  • Estratégia de reinicialização para evitar convergência prematura")
-        report_lines.append("  • Visualizações detalhadas para análise de resultados")
-        
-        report_lines.append("\n8.3. Trabalhos Futuros")
-        report_lines.append("-" * 80)
-        report_lines.append("  • Testar em instâncias benchmark (Solomon, Gehring & Homberger)")
-        report_lines.append("  • Implementar operadores de crossover adicionais (PMX, CX)")
-        report_lines.append("  • Adicionar busca local inter-rota (relocate, exchange)")
-        report_lines.append("  • Paralelização do algoritmo genético")
-        report_lines.append("  • Otimização multi-objetivo (distância vs. número de veículos)")
-        
-        # Referências
-        report_lines.append("\n" + "="*80)
-        report_lines.append("9. REFERÊNCIAS")
-        report_lines.append("="*80)
-        report_lines.append("\n[1] Electronics (2025). Research on Vehicle Routing Problem with")
-        report_lines.append("    Time Windows Based on Improved Genetic Algorithm.")
-        report_lines.append("    MDPI. https://doi.org/10.3390/electronics14040647")
-        report_lines.append("\n[2] Solomon, M. M. (1987). Algorithms for the vehicle routing and")
-        report_lines.append("    scheduling problems with time window constraints.")
-        report_lines.append("    Operations Research, 35(2), 254-265.")
-        report_lines.append("\n[3] Bräysy, O., & Gendreau, M. (2005). Vehicle routing problem")
-        report_lines.append("    with time windows, Part I: Route construction and local search")
-        report_lines.append("    algorithms. Transportation Science, 39(1), 104-118.")
-        
-        # Rodapé
-        report_lines.append("\n" + "="*80)
-        report_lines.append("FIM DO RELATÓRIO")
-        report_lines.append("="*80)
-        
-        # Salva relatório
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(report_lines))
+        # Escrita em fluxo (buffer de 64 KB), linha a linha
+        with open(report_file, 'w', encoding='utf-8', buffering=64 * 1024) as f:
+            n_lines = 0
+            
+            def write(line: str):
+                nonlocal n_lines
+                if n_lines:
+                    f.write('\n')
+                f.write(line)
+                n_lines += 1
+            
+            # Cabeçalho
+            write("="*80)
+            write("RELATÓRIO TÉCNICO - VRPTW COM ALGORITMO GENÉTICO HÍBRIDO")
+            write("="*80)
+            write(f"\nAutor: Rafael Lopes Pinheiro")
+            write(f"Data: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            write(f"GitHub: @RafaelLopesPinheiro")
+            
+            # Referência
+            write("\n" + "="*80)
+            write("1. REFERÊNCIA DO ARTIGO")
+            write("="*80)
+            write("\nTítulo: Research on Vehicle Routing Problem with Time Windows")
+            write("        Based on Improved Genetic Algorithm")
+            write("Autores: Não especificado no prompt (artigo de 2025)")
+            write("Fonte: MDPI Electronics, 2025")
+            write("DOI: https://doi.org/10.3390/electronics14040647")
+            
+            # Descrição do problema
+            write("\n" + "="*80)
+            write("2. DESCRIÇÃO DO PROBLEMA")
+            write("="*80)
+            write("\nO Vehicle Routing Problem with Time Windows (VRPTW) é um problema")
+            write("clássico de otimização combinatória classificado como NP-difícil.")
+            write("\nObjetivo:")
+            write("  Minimizar a distância total percorrida por uma frota de veículos")
+            write("  para atender todos os clientes, respeitando:")
+            write("    • Capacidade dos veículos")
+            write("    • Janelas de tempo de cada cliente")
+            write("    • Tempo máximo de rota")
+            
+            # Descrição do algoritmo
+            write("\n" + "="*80)
+            write("3. ALGORITMOS IMPLEMENTADOS")
+            write("="*80)
+            
+            write("\n3.1. Heurística de Inserção de Solomon (I1)")
+            write("-" * 80)
+            write("Heurística construtiva gulosa que:")
+            write("  1. Seleciona cliente inicial (mais distante do depot)")
+            write("  2. Insere clientes usando critério de custo c(i,u,j):")
+            write("     c(i,u,j) = α·c1(i,u,j) + λ·c2(i,u,j)")
+            write("     onde:")
+            write("       c1 = custo de distância adicional")
+            write("       c2 = custo temporal (urgência)")
+            write("  3. Repete até não ser possível inserir mais clientes")
+            
+            write("\n3.2. Algoritmo Genético Híbrido")
+            write("-" * 80)
+            write("Componentes principais:")
+            write("\na) Representação:")
+            write("   • Cromossomo = sequência de clientes agrupados em rotas")
+            write("\nb) Inicialização:")
+            write("   • 30% - Heurística de Solomon com parâmetros variados")
+            write("   • 40% - Construção aleatória gulosa")
+            write("   • 30% - Mutações da melhor solução")
+            write("\nc) Operadores Genéticos:")
+            write("   • Seleção: Torneio (tamanho 5)")
+            write("   • Crossover: Order Crossover (OX)")
+            write("   • Mutação: Swap, Insertion, Inversion")
+            write("\nd) Busca Local:")
+            write("   • 2-opt intra-rota")
+            write("\ne) Estratégias Avançadas:")
+            write("   • Elitismo")
+            write("   • Reinicialização adaptativa (estagnação > 50 gerações)")
+            
+            # Análise de complexidade
+            write("\n" + "="*80)
+            write("4. ANÁLISE DE COMPLEXIDADE")
+            write("="*80)
+            
+            write("\n4.1. Heurística de Solomon")
+            write("-" * 80)
+            write("Complexidade de Tempo: O(n³)")
+            write("  onde n = número de clientes")
+            write("\nJustificativa:")
+            write("  • Para cada veículo: O(n)")
+            write("  • Para cada cliente não roteado: O(n)")
+            write("  • Teste de inserção em cada posição: O(n)")
+            write("  • Total: O(n) × O(n) × O(n) = O(n³)")
+            
+            write("\n4.2. Algoritmo Genético")
+            write("-" * 80)
+            write("Complexidade de Tempo: O(G × P × n²)")
+            write("  onde:")
+            write("    G = número de gerações")
+            write("    P = tamanho da população")
+            write("    n = número de clientes")
+            write("\nJustificativa:")
+            write("  • Avaliação de fitness: O(n) por solução")
+            write("  • Crossover (OX): O(n) por operação")
+            write("  • Mutação: O(1) por operação")
+            write("  • Busca local 2-opt: O(n²) por solução")
+            write("  • Por geração: P × O(n²)")
+            write("  • Total: G × P × O(n²)")
+            
+            # Instância do problema
+            write("\n" + "="*80)
+            write("5. INSTÂNCIA DO PROBLEMA")
+            write("="*80)
+            write(f"\nNome: {self.instance.name}")
+            write(f"Número de Clientes: {len(self.instance.customers)}")
+            write(f"Número de Veículos: {self.instance.num_vehicles}")
+            write(f"Capacidade dos Veículos: {self.instance.vehicle_capacity:.2f}")
+            write(f"\nDemanda Total: {sum(c.demand for c in self.instance.customers):.2f}")
+            write(f"Janela de Tempo do Depot: [0.0, 480.0]")
+            
+            # Parâmetros
+            write("\n" + "="*80)
+            write("6. PARÂMETROS DOS ALGORITMOS")
+            write("="*80)
+            
+            write("\n6.1. Heurística de Solomon")
+            write("-" * 80)
+            for key, value in self.config['solomon'].items():
+                write(f"  {key}: {value}")
+            
+            write("\n6.2. Algoritmo Genético")
+            write("-" * 80)
+            for key, value in self.config['genetic_algorithm'].items():
+                write(f"  {key}: {value}")
+            
+            # Resultados
+            write("\n" + "="*80)
+            write("7. RESULTADOS EXPERIMENTAIS")
+            write("="*80)
+            
+            write("\n7.1. Solução Inicial (Solomon)")
+            write("-" * 80)
+            solomon = analysis_results['solomon']
+            write(f"  Distância Total: {solomon['distance']:.2f}")
+            write(f"  Tempo Total: {solomon['time']:.2f}")
+            write(f"  Número de Veículos: {solomon['vehicles']}")
+            write(f"  Fitness: {solomon['fitness']:.2f}")
+            write(f"  Factível: {solomon['feasible']}")
+            
+            write("\n7.2. Solução Otimizada (Algoritmo Genético)")
+            write("-" * 80)
+            ga = analysis_results['genetic_algorithm']
+            write(f"  Distância Total: {ga['distance']:.2f}")
+            write(f"  Tempo Total: {ga['time']:.2f}")
+            write(f"  Número de Veículos: {ga['vehicles']}")
+            write(f"  Fitness: {ga['fitness']:.2f}")
+            write(f"  Factível: {ga['feasible']}")
+            
+            write("\n7.3. Melhorias Obtidas")
+            write("-" * 80)
+            improvements = analysis_results['improvements']
+            write(f"  Redução de Distância: {improvements['distance_percent']:.2f}%")
+            write(f"  Redução de Veículos: {improvements['vehicles_absolute']}")
+            write(f"  Melhoria de Fitness: {improvements['fitness_percent']:.2f}%")
+            
+            # Convergência
+            write("\n7.4. Análise de Convergência")
+            write("-" * 80)
+            write(f"  Gerações executadas: {len(self.ga.best_fitness_history)}")
+            write(f"  Fitness inicial: {self.ga.best_fitness_history[0]:.2f}")
+            write(f"  Fitness final: {self.ga.best_fitness_history[-1]:.2f}")
+            write(f"  Melhoria total: {((self.ga.best_fitness_history[0] - self.ga.best_fitness_history[-1]) / self.ga.best_fitness_history[0] * 100):.2f}%")
+            
+            # Conclusões
+            write("\n" + "="*80)
+            write("8. CONCLUSÕES")
+            write("="*80)
+            write("\n8.1. Resultados Alcançados")
+            write("-" * 80)
+            write("  ✓ Implementação bem-sucedida do algoritmo do artigo")
+            write("  ✓ Heurística de Solomon gera soluções iniciais viáveis")
+            write("  ✓ Algoritmo Genético melhora significativamente a solução")
+            write(f"  ✓ Redução de {improvements['distance_percent']:.2f}% na distância total")
+            
+            write("\n8.2. Contribuições da Implementação")
+            write("-" * 80)
+            write("  • Conversão de dados reais de vendas em problema VRPTW")
+            write("  • Implementação completa em Python (sem dependências pesadas)")
+            write("  • Operadores genéticos adaptados para VRPTW")
+            write("  • Estratégia de reinicialização para evitar convergência prematura")
+            write("  • Visualizações detalhadas para análise de resultados")
+            
+            write("\n8.3. Trabalhos Futuros")
+            write("-" * 80)
+            write("  • Testar em instâncias benchmark (Solomon, Gehring & Homberger)")
+            write("  • Implementar operadores de crossover adicionais (PMX, CX)")
+            write("  • Adicionar busca local inter-rota (relocate, exchange)")
+            write("  • Paralelização do algoritmo genético")
+            write("  • Otimização multi-objetivo (distância vs. número de veículos)")
+            
+            # Referências
+            write("\n" + "="*80)
+            write("9. REFERÊNCIAS")
+            write("="*80)
+            write("\n[1] Electronics (2025). Research on Vehicle Routing Problem with")
+            write("    Time Windows Based on Improved Genetic Algorithm.")
+            write("    MDPI. https://doi.org/10.3390/electronics14040647")
+            write("\n[2] Solomon, M. M. (1987). Algorithms for the vehicle routing and")
+            write("    scheduling problems with time window constraints.")
+            write("    Operations Research, 35(2), 254-265.")
+            write("\n[3] Bräysy, O., & Gendreau, M. (2005). Vehicle routing problem")
+            write("    with time windows, Part I: Route construction and local search")
+            write("    algorithms. Transportation Science, 39(1), 104-118.")
+            
+            # Rodapé
+            write("\n" + "="*80)
+            write("FIM DO RELATÓRIO")
+            write("="*80)
         
         print(f"✓ Relatório técnico salvo: {report_file}")
-        print(f"  Páginas: ~{len(report_lines) // 50} (estimativa)")
+        print(f"  Páginas: ~{n_lines // 50} (estimativa)")
         print("="*80 + "\n")
     
+    def shutdown(self):
+        """Encerra o pool de processos (ou threads), se existir."""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+        
+        if self.comm is not None and self.rank == 0:
+            if self._instance_sent:
+                mpi_shutdown(self.comm)
+            else:
+                # Falha antes do envio: libera os ranks que aguardam a instância
+                self.comm.bcast(None, root=0)
+            self.comm = None
+    
+    def run_mpi_worker(self):
+        """Rank MPI trabalhador: recebe a instância do rank 0 e apenas avalia fitness."""
+        self.instance = self.comm.bcast(None, root=0)
+        if self.instance is None:
+            return
+        mpi_worker_loop(self.comm, self.instance)
+    
     def run(self):
         """Executa pipeline completo do projeto."""
+        if self.rank != 0:
+            self.run_mpi_worker()
+            return
+        
         try:
             self.setup()
             self.load_or_create_instance()
@@ -620,6 +861,9 @@ class VRPTWProject:
             import traceback
             traceback.print_exc()
             sys.exit(1)
+        
+        finally:
+            self.shutdown()
 
 
 def main():
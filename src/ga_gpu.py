@@ -0,0 +1,150 @@
+"""
+GPU Fitness Evaluation for the VRPTW Genetic Algorithm (Numba CUDA)
+Author: Rafael Lopes Pinheiro
+Date: 2025-11-18
+
+Avalia a população inteira do AG em GPU. A instância (matriz de distâncias
+e janelas de tempo) é enviada para a memória do dispositivo uma única vez; a
+cada geração apenas a população (tours (P, L) int32 e cargas (P, R) por
+veículo) e o vetor de resultados trafegam entre host e dispositivo.
+
+Codificação de cada cromossomo (encode_population, a mesma de _evaluate_tour):
+    ids dos clientes de cada rota separados por 0 (depot), completados com -1.
+
+Requer numba com suporte a CUDA (para testes sem GPU, use o simulador:
+NUMBA_ENABLE_CUDASIM=1).
+"""
+
+import math
+import numpy as np
+from typing import List
+
+from src.utils import VRPTWInstance
+from src.genetic_algorithm import (BatchFitnessEvaluator, evaluate_tour, population_shape,
+                                   encode_population, decode_results)
+
+try:
+    from numba import cuda
+except ImportError:
+    cuda = None
+
+
+THREADS_PER_BLOCK = 32
+
+
+if cuda is not None:
+
+    # Mesmo corpo de _evaluate_tour (genetic_algorithm.evaluate_tour),
+    # compilado como função de dispositivo: uma única fonte da fitness
+    _evaluate_tour_device = cuda.jit(device=True)(evaluate_tour)
+
+    @cuda.jit
+    def evaluate_population_kernel(tours, loads, dist, tt, tw_open, tw_close,
+                                   service, capacity, out):
+        """
+        Um thread por cromossomo (evaluate_tour sobre a linha i).
+
+        out[i] = (fitness, distância, tempo, nº de veículos, penalização)
+        """
+        i = cuda.grid(1)
+        if i < tours.shape[0]:
+            _evaluate_tour_device(tours[i], loads[i], dist, tt, tw_open,
+                                  tw_close, service, capacity, out[i])
+
+
+class GPUPopulationEvaluator:
+    """Avaliador de população em GPU (usado por ImprovedGeneticAlgorithm)."""
+
+    def __init__(self, instance: VRPTWInstance):
+        """
+        Envia os dados da instância para a GPU.
+
+        Parameters:
+        -----------
+        instance : VRPTWInstance
+            Instância do problema (ids dos clientes = índices na matriz)
+        """
+        if cuda is None:
+            raise ImportError("Avaliação em GPU requer numba com suporte a CUDA "
+                              "(pip install numba).")
+
+        self.capacity = float(instance.vehicle_capacity)
+        self.n_locations = len(instance.locations)
+
+        # Cópia única para o dispositivo (arrays SoA da instância)
+        self.d_dist = cuda.to_device(np.ascontiguousarray(instance.dist))
+        self.d_tt = (self.d_dist if instance.tt is instance.dist
+                     else cuda.to_device(np.ascontiguousarray(instance.tt)))
+        self.d_tw_open = cuda.to_device(instance.tw_open)
+        self.d_tw_close = cuda.to_device(instance.tw_close)
+        self.d_service = cuda.to_device(instance.service)
+
+    def evaluate(self, chromosomes: List[list]) -> List[tuple]:
+        """
+        Avalia a população na GPU.
+
+        Returns:
+        --------
+        List[tuple]
+            (fitness, distância, tempo, nº de veículos, factível) por cromossomo
+        """
+        n, length, n_routes = population_shape(chromosomes)
+        tours = np.empty((n, length), dtype=np.int32)
+        loads = np.zeros((n, n_routes), dtype=np.float64)
+        encode_population(chromosomes, tours, loads)
+
+        d_tours = cuda.to_device(tours)
+        d_loads = cuda.to_device(loads)
+        d_out = cuda.device_array((n, 5), dtype=np.float64)
+
+        blocks = math.ceil(n / THREADS_PER_BLOCK)
+        evaluate_population_kernel[blocks, THREADS_PER_BLOCK](
+            d_tours, d_loads, self.d_dist, self.d_tt, self.d_tw_open,
+            self.d_tw_close, self.d_service, self.capacity, d_out
+        )
+        return decode_results(d_out.copy_to_host())
+
+
+def check_equivalence(instance: VRPTWInstance, n_chromosomes: int = 64,
+                      seed: int = 0) -> bool:
+    """
+    Compara a avaliação na GPU com a da CPU (BatchFitnessEvaluator).
+
+    Cromossomos aleatórios com rotas vazias e sobrecarregadas, para exercitar
+    todas as penalizações. Roda com qualquer dispositivo CUDA (ou com
+    NUMBA_ENABLE_CUDASIM=1; o simulador executa em Python e, com arrays
+    float32, acumula em float32 pelas regras do NumPy: compare em float64).
+
+    Returns:
+    --------
+    bool
+        True se as avaliações forem idênticas
+    """
+    rng = np.random.default_rng(seed)
+    capacity = float(instance.vehicle_capacity)
+    n = len(instance.locations) - 1
+    chromosomes = []
+    for _ in range(n_chromosomes):
+        cuts = np.sort(rng.integers(0, n + 1, size=rng.integers(1, 6)))
+        chromosome = []
+        for route in np.split(rng.permutation(n) + 1, cuts):
+            load = (float(instance.demand[route].sum()) if route.size
+                    else float(rng.choice([0.0, 2 * capacity])))
+            chromosome.append((route.tolist(), load, capacity, 0.0, 0.0))
+        chromosomes.append(chromosome)
+
+    gpu = GPUPopulationEvaluator(instance).evaluate(chromosomes)
+    cpu = BatchFitnessEvaluator(instance).evaluate(chromosomes)
+    return gpu == cpu
+
+
+if __name__ == "__main__":
+    # Teste: GPU (ou simulador) x CPU em uma instância de Solomon
+    from src.solomon_loader import load_solomon_instance
+
+    if cuda is None or not cuda.is_available():
+        print("⚠️ Sem dispositivo CUDA (use NUMBA_ENABLE_CUDASIM=1)")
+    else:
+        instance = load_solomon_instance('C101', max_customers=25)
+        ok = check_equivalence(instance)
+        print("✓ GPU e CPU idênticas" if ok else "❌ GPU e CPU divergem")
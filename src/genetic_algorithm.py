@@ -15,18 +15,530 @@ Baseado em:
 - Bräysy, O., & Gendreau, M. (2005). Vehicle routing problem with time windows
 """
 
+import gc
+import io
+import os
+import sys
+import contextlib
+import multiprocessing
+import queue
 import numpy as np
 from typing import List, Tuple, Dict, Set
 import copy
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
 from tqdm import tqdm
-from src.utils import Customer, Vehicle, VRPTWInstance
-from src.heuristics import SolomonInsertion
+from src.utils import (Customer, Vehicle, VRPTWInstance, njit, prange,
+                       _distance_matrix_kernel, _route_metrics, _route_schedule)
+from src.heuristics import (SolomonInsertion, _best_insertion, _construct_route,
+                            _extend_route, _insertion_feasible)
+
+
+@njit(cache=True)
+def _route_feasible(route, tt, tw_open, tw_close, service, demand, capacity):
+    """
+    Viabilidade de uma rota (ids, sem o depot) - kernel compilado.
+    
+    Capacidade (soma das demandas) e janelas de tempo: a chegada em cada
+    cliente não pode passar do fim da janela.
+    """
+    load = 0.0
+    for k in range(route.shape[0]):
+        load += demand[route[k]]
+    if load > capacity:
+        return False
+    
+    current_time = 0.0
+    current_loc = 0
+    for k in range(route.shape[0]):
+        c = route[k]
+        arrival_time = current_time + tt[current_loc, c]
+        if arrival_time > tw_close[c]:
+            return False
+        current_time = max(arrival_time, tw_open[c]) + service[c]
+        current_loc = c
+    
+    return True
+
+
+@njit(cache=True)
+def _cheapest_insertion(route, u, best_cost, dist, tt, tw_open, tw_close, service,
+                        demand, capacity):
+    """
+    Posição mais barata (e viável) para inserir u na rota - kernel compilado.
+    
+    Mesma regra de _insert_remaining_customers: custo = d(prev,u) + d(u,next)
+    - d(prev,next), viabilidade como _route_feasible da rota com u inserido.
+    Só posições com custo < best_cost (melhor de outros veículos) são
+    testadas. As janelas de tempo usam os instantes de saída da rota
+    original: o trecho antes de pos é reaproveitado e, depois de u, os
+    horários são propagados só até coincidirem com os originais.
+    
+    Returns:
+    --------
+    Tuple[int, float]
+        (posição, custo) ou (-1, best_cost) se nenhuma posição melhora
+    """
+    n = route.shape[0]
+    
+    # Saídas da rota original, primeira violação e violações a partir de k
+    depart = np.empty(n)
+    late_from = np.zeros(n + 1, dtype=np.bool_)
+    first_late = n
+    time = 0.0
+    loc = 0
+    for k in range(n):
+        c = route[k]
+        arrival_time = time + tt[loc, c]
+        if arrival_time > tw_close[c]:
+            late_from[k] = True
+            first_late = min(first_late, k)
+        time = max(arrival_time, tw_open[c]) + service[c]
+        depart[k] = time
+        loc = c
+    for k in range(n - 1, -1, -1):
+        late_from[k] = late_from[k] or late_from[k + 1]
+    
+    best_pos = -1
+    for pos in range(n + 1):
+        prev_c = 0 if pos == 0 else route[pos - 1]
+        next_c = 0 if pos >= n else route[pos]
+        cost = (dist[prev_c, u] + dist[u, next_c]) - dist[prev_c, next_c]
+        if not cost < best_cost:
+            continue
+        
+        # Capacidade (mesma ordem de soma de _route_feasible)
+        load = 0.0
+        for k in range(pos):
+            load += demand[route[k]]
+        load += demand[u]
+        for k in range(pos, n):
+            load += demand[route[k]]
+        if load > capacity:
+            continue
+        
+        # Trecho route[:pos] inalterado
+        if first_late < pos:
+            continue
+        
+        time = 0.0 if pos == 0 else depart[pos - 1]
+        arrival_time = time + tt[prev_c, u]
+        if arrival_time > tw_close[u]:
+            continue
+        time = max(arrival_time, tw_open[u]) + service[u]
+        
+        # Propaga o atraso até os horários coincidirem com os originais
+        feasible = True
+        loc = u
+        for k in range(pos, n):
+            c = route[k]
+            arrival_time = time + tt[loc, c]
+            if arrival_time > tw_close[c]:
+                feasible = False
+                break
+            time = max(arrival_time, tw_open[c]) + service[c]
+            loc = c
+            if time == depart[k]:
+                feasible = not late_from[k + 1]
+                break
+        if not feasible:
+            continue
+        
+        best_pos = pos
+        best_cost = cost
+    
+    return best_pos, best_cost
+
+
+@njit(cache=True)
+def _insert_customers(routes, lengths, n_vehicles, loads, capacity, owner, customers,
+                      neighbors, vehicle_capacity, dist, tt, tw_open, tw_close,
+                      service, demand):
+    """
+    Melhor inserção de cada cliente, em ordem - kernel compilado.
+    
+    routes[i, :lengths[i]] são os ids do veículo i (linhas livres a partir de
+    n_vehicles, para os veículos novos); routes, lengths, loads, capacity e
+    owner (veículo de cada localização, -1 = não roteada) são atualizados no
+    lugar. Para cada cliente, testa primeiro os veículos que atendem um de
+    seus vizinhos (neighbors) e, se nenhum admitir a inserção, os demais,
+    sempre em ordem crescente de veículo; sem posição viável, abre um
+    veículo novo.
+    
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        (veículo, posição) de cada cliente; veículos >= n_vehicles são novos
+    """
+    m = customers.shape[0]
+    assigned = np.empty(m, dtype=np.int64)
+    positions = np.empty(m, dtype=np.int64)
+    is_near = np.zeros(routes.shape[0], dtype=np.bool_)
+    
+    for k in range(m):
+        u = customers[k]
+        for nb in neighbors[u]:
+            if owner[nb] >= 0:
+                is_near[owner[nb]] = True
+        
+        best_vehicle = -1
+        best_pos = -1
+        for near_pass in (True, False):
+            best_cost = np.inf
+            for i in range(n_vehicles):
+                if is_near[i] != near_pass or loads[i] + demand[u] > capacity[i]:
+                    continue
+                pos, cost = _cheapest_insertion(routes[i, :lengths[i]], u, best_cost,
+                                                dist, tt, tw_open, tw_close, service,
+                                                demand, capacity[i])
+                if pos >= 0:
+                    best_cost = cost
+                    best_vehicle = i
+                    best_pos = pos
+            if best_vehicle >= 0:
+                break
+        is_near[:n_vehicles] = False
+        
+        if best_vehicle >= 0:
+            n = lengths[best_vehicle]
+            for j in range(n, best_pos, -1):
+                routes[best_vehicle, j] = routes[best_vehicle, j - 1]
+            routes[best_vehicle, best_pos] = u
+            lengths[best_vehicle] = n + 1
+            loads[best_vehicle] += demand[u]
+        else:
+            best_vehicle = n_vehicles
+            best_pos = 0
+            routes[best_vehicle, 0] = u
+            lengths[best_vehicle] = 1
+            loads[best_vehicle] = demand[u]
+            capacity[best_vehicle] = vehicle_capacity
+            n_vehicles += 1
+        
+        owner[u] = best_vehicle
+        assigned[k] = best_vehicle
+        positions[k] = best_pos
+    
+    return assigned, positions
+
+
+@njit(cache=True)
+def _schedule(route, start, stop, step, time, loc, tt, tw_open, tw_close, service):
+    """
+    Percorre route[start:stop:step] a partir de (time, loc) - kernel compilado.
+    
+    Retorna o instante de saída do último cliente, ou -1.0 se alguma chegada
+    passar do fim da janela de tempo.
+    """
+    for k in range(start, stop, step):
+        c = route[k]
+        arrival_time = time + tt[loc, c]
+        if arrival_time > tw_close[c]:
+            return -1.0
+        time = max(arrival_time, tw_open[c]) + service[c]
+        loc = c
+    return time
+
+
+@njit(cache=True, nogil=True)
+def _two_opt(route, dist, dist_q, tt, tw_open, tw_close, service, demand,
+             capacity, neighbors, max_iterations):
+    """
+    2-opt intra-rota (melhor melhoria) - kernel compilado.
+    
+    A cada passagem avalia todas as reversões (i, j) e aplica a viável de
+    menor saldo de distância; repete até nenhuma reversão melhorar ou
+    max_iterations passagens.
+    
+    Cada reversão (i, j) é avaliada pelo saldo das 4 arestas trocadas,
+    delta = d(i0,j0) + d(i1,j1) - d(i0,i1) - d(j0,j1), em O(1) (a matriz é
+    simétrica, então o trecho invertido mantém sua distância). dist_q (int16,
+    ver quantize_matrix) descarta antes as reversões que certamente não
+    melhoram: o saldo quantizado tem erro de no máximo 2 unidades. Só as
+    reversões com delta menor que o melhor da passagem têm a viabilidade
+    verificada.
+    
+    A reversão não altera a carga, e o trecho route[:i+1] mantém seus
+    horários: as janelas de tempo são verificadas só a partir de i+1, com os
+    instantes de saída da rota corrente (depart), sem montar a candidata.
+    
+    Busca granular em rotas com mais de 4k clientes (k = vizinhos por
+    cliente): para cada i só são avaliados os j em que uma das arestas novas
+    liga vizinhos próximos (j0 em neighbors[i0] ou j1 em neighbors[i1]),
+    além de j = n-1 (arestas com o depot), em O(n·k) por passagem em vez de
+    O(n²). Rotas menores percorrem todos os j.
+    """
+    route = route.copy()
+    n = route.shape[0]
+    depart = np.empty(n)
+    
+    # Posição de cada cliente na rota corrente (-1 = fora da rota)
+    granular = n > 4 * neighbors.shape[1]
+    position = np.full(dist.shape[0] if granular else 0, -1, dtype=np.int64)
+    if granular:
+        for k in range(n):
+            position[route[k]] = k
+    candidates = np.empty(max(n, 2 * neighbors.shape[1] + 1), dtype=np.int64)
+    
+    load = 0.0
+    for k in range(n):
+        load += demand[route[k]]
+    if load > capacity:
+        return route
+    
+    for iteration in range(max_iterations):
+        # Instantes de saída da rota corrente e primeira janela violada
+        first_late = n
+        time = 0.0
+        loc = 0
+        for k in range(n):
+            c = route[k]
+            arrival_time = time + tt[loc, c]
+            if arrival_time > tw_close[c] and first_late == n:
+                first_late = k
+            time = max(arrival_time, tw_open[c]) + service[c]
+            depart[k] = time
+            loc = c
+        
+        best_delta = -1e-9
+        best_i = -1
+        best_j = -1
+        
+        for i in range(n - 1):
+            # route[:i+1] é mantido: se já viola uma janela, nenhuma
+            # candidata a partir daqui é viável
+            if first_late <= i:
+                break
+            
+            i0 = route[i]
+            i1 = route[i + 1]
+            
+            n_candidates = 0
+            if granular:
+                # j0 vizinho de i0, j1 vizinho de i1, ou j1 = depot
+                for nb in neighbors[i0]:
+                    candidates[n_candidates] = position[nb]
+                    n_candidates += 1
+                for nb in neighbors[i1]:
+                    candidates[n_candidates] = position[nb] - 1 if position[nb] > 0 else -1
+                    n_candidates += 1
+                candidates[n_candidates] = n - 1
+                n_candidates += 1
+            else:
+                for j in range(i + 2, n):
+                    candidates[n_candidates] = j
+                    n_candidates += 1
+            
+            for m in range(n_candidates):
+                j = candidates[m]
+                if j < i + 2:
+                    continue
+                
+                # (i0,i1),(j0,j1) -> (i0,j0),(i1,j1)
+                j0 = route[j]
+                j1 = route[j + 1] if j + 1 < n else 0
+                delta_q = (np.int32(dist_q[i0, j0]) + np.int32(dist_q[i1, j1])
+                           - np.int32(dist_q[i0, i1]) - np.int32(dist_q[j0, j1]))
+                if delta_q > 2:
+                    continue
+                
+                delta = (dist[i0, j0] + dist[i1, j1]) - (dist[i0, i1] + dist[j0, j1])
+                if not delta < best_delta:
+                    continue
+                
+                # Janelas de tempo: route[j..i+1] invertido, depois route[j+1:]
+                time = _schedule(route, j, i, -1, depart[i], i0,
+                                 tt, tw_open, tw_close, service)
+                if time < 0.0:
+                    continue
+                if _schedule(route, j + 1, n, 1, time, i1,
+                             tt, tw_open, tw_close, service) < 0.0:
+                    continue
+                
+                best_delta = delta
+                best_i = i
+                best_j = j
+        
+        if best_i < 0:
+            break
+        route[best_i + 1:best_j + 1] = route[best_i + 1:best_j + 1][::-1].copy()
+        if granular:
+            for k in range(best_i + 1, best_j + 1):
+                position[route[k]] = k
+    
+    return route
+
+
+def evaluate_tour(tour, loads, dist, tt, tw_open, tw_close, service, capacity,
+                  out):
+    """
+    Avalia um cromossomo codificado como tour gigante.
+    
+    tour: ids dos clientes de cada veículo separados por 0, completado com -1;
+    loads: carga de cada veículo (na mesma ordem). Reproduz
+    Solution.calculate_fitness, inclusive a ordem das somas (penalização
+    acumulada por veículo, como Vehicle.penalty, e então somada).
+    
+    Fonte única da fitness em arrays: compilada aqui com njit
+    (_evaluate_tour) e, em src/ga_gpu.py, como função de dispositivo CUDA.
+    Por isso usa apenas indexação e aritmética escalar.
+    
+    out = (fitness, distância, tempo, nº de veículos, penalização)
+    """
+    total_distance = 0.0
+    total_time = 0.0
+    penalty = 0.0
+    num_vehicles = 0
+    
+    # Estado do veículo corrente
+    r = 0
+    prev = 0
+    route_len = 0
+    distance = 0.0
+    time = 0.0
+    route_penalty = 0.0
+    
+    length = tour.shape[0]
+    for k in range(length + 1):
+        node = tour[k] if k < length else -1
+        
+        if node <= 0:
+            # Fecha o veículo r (separador 0 ou fim do cromossomo)
+            if node == 0 or route_len > 0:
+                if route_len > 0:
+                    distance += dist[prev, 0]
+                    time += tt[prev, 0]
+                    num_vehicles += 1
+                elif loads[r] > capacity:
+                    route_penalty += (loads[r] - capacity) * 1000
+                total_distance += distance
+                total_time += time
+                penalty += route_penalty
+                r += 1
+            
+            prev = 0
+            route_len = 0
+            distance = 0.0
+            time = 0.0
+            route_penalty = 0.0
+            
+            if node < 0:
+                break
+            continue
+        
+        if route_len == 0 and loads[r] > capacity:
+            route_penalty += (loads[r] - capacity) * 1000
+        
+        distance += dist[prev, node]
+        arrival = time + tt[prev, node]
+        
+        if arrival > tw_close[node]:
+            route_penalty += (arrival - tw_close[node]) * 1000
+        
+        time = max(arrival, tw_open[node]) + service[node]
+        route_len += 1
+        prev = node
+    
+    out[0] = 1.0 * total_distance + 1000.0 * num_vehicles + 100000.0 * penalty
+    out[1] = total_distance
+    out[2] = total_time
+    out[3] = num_vehicles
+    out[4] = penalty
+
+
+_evaluate_tour = njit(cache=True, nogil=True)(evaluate_tour)
+
+@njit(parallel=True, cache=True)
+def _evaluate_population(tours, loads, dist, tt, tw_open, tw_close, service,
+                         capacity, out):
+    """Avalia todas as linhas de tours em paralelo (prange sobre a população)."""
+    for i in prange(tours.shape[0]):
+        _evaluate_tour(tours[i], loads[i], dist, tt, tw_open, tw_close,
+                       service, capacity, out[i])
+
+
+def warmup_kernels(dtype=np.float64):
+    """
+    Compila os kernels Numba com uma instância fictícia de 4 clientes.
+    
+    Usa os mesmos tipos das chamadas reais (matrizes e janelas em `dtype`,
+    como VRPTWInstance.set_dtype; dist_q int16; tours e rotas dos veículos
+    int32; rotas da heurística int64), para nenhuma compilação cair nos
+    passos cronometrados. Os kernels paralelos (_evaluate_population,
+    _construct_routes_parallel) ficam de fora: iniciariam as threads do
+    Numba antes dos pools de processos (fork).
+    
+    Parameters:
+    -----------
+    dtype : np.dtype, optional
+        Precisão dos arrays da instância (config['data']['dtype'])
+    """
+    n = 5
+    xs = np.arange(n, dtype=np.float64)
+    dist = np.empty((n, n), dtype=dtype)
+    _distance_matrix_kernel(xs, xs, np.empty((n, n)))  # instância nasce em float64
+    _distance_matrix_kernel(xs, xs, dist)
+    dist_q = dist.astype(np.int16)
+    neighbors = np.zeros((n, 2), dtype=np.int32)
+    tw_open = np.zeros(n, dtype=dtype)
+    tw_close = np.full(n, 100.0, dtype=dtype)
+    service = np.ones(n, dtype=dtype)
+    demand = np.ones(n, dtype=dtype)
+    route = np.arange(1, n, dtype=np.int64)
+    
+    # Heurística de Solomon (ids int64)
+    _best_insertion(route[:2], route[2:], dist, dist, tw_open, tw_close, service,
+                    demand, 10.0, 2.0, 1.0, 1.0, 1.0, np.arange(2, dtype=np.int64))
+    _insertion_feasible(route[:2], 3, 2, dist, tw_open, tw_close, service)
+    _extend_route(route[:1].copy(), 1.0, route[1:].copy(), dist, dist, tw_open,
+                  tw_close, service, demand, 10.0, 1.0, 1.0, 2.0)
+    _construct_route(route.copy(), dist, dist, tw_open, tw_close, service, demand,
+                     10.0, 1.0, 1.0, 2.0)
+    
+    # Operadores do AG
+    _two_opt(route.copy(), dist, dist_q, dist, tw_open, tw_close,
+             service, demand, 10.0, neighbors, 50)
+    _route_feasible(route, dist, tw_open, tw_close, service, demand, 10.0)
+    _insert_customers(np.zeros((2, 4), dtype=np.int32), np.zeros(2, dtype=np.int64), 0,
+                      np.zeros(2), np.zeros(2), np.full(n, -1, dtype=np.int64),
+                      route[:2].astype(np.int32), neighbors, 10.0,
+                      dist, dist, tw_open, tw_close, service, demand)
+    
+    # Avaliação (tour gigante e rotas dos veículos em int32)
+    tour = np.array([1, 2, 0, 3, 4, 0, -1], dtype=np.int32)
+    _evaluate_tour(tour, np.full(2, 2.0), dist, dist, tw_open, tw_close,
+                   service, 10.0, np.empty(5))
+    _route_metrics(tour[:2], dist, dist, tw_open, tw_close, service, 0.0)
+    _route_schedule(tour[:2], dist, tw_open, tw_close, service)
+
+
+def roulette_index(weights: np.ndarray) -> int:
+    """
+    Sorteia um índice com probabilidade proporcional a weights (roleta).
+    
+    Mesmo sorteio de np.random.choice(len(weights), p=weights/weights.sum())
+    (CDF normalizada + searchsorted sobre um único np.random.random()), sem
+    a validação de p e a conversão de listas de objetos a cada chamada.
+    """
+    cdf = np.cumsum(weights / weights.sum())
+    cdf /= cdf[-1]
+    return int(cdf.searchsorted(np.random.random(), side='right'))
+
+
+# Separador de veículos no tour gigante (ver Solution.to_arrays)
+_DEPOT = np.zeros(1, dtype=np.int32)
+
+# Operadores de mutação e suas probabilidades (ver _apply_random_mutation)
+MUTATION_OPERATORS = ('relocate', 'exchange', 'intra_2opt')
+MUTATION_PROBS = np.array([0.5, 0.3, 0.2])
 
 
 class Solution:
     """Representa uma solução do VRPTW."""
     
-    def __init__(self, vehicles: List[Vehicle], instance: VRPTWInstance = None):
+    def __init__(self, vehicles: List[Vehicle], instance: VRPTWInstance = None,
+                 evaluate: bool = True):
         self.vehicles = vehicles
         self.instance = instance
         self.fitness = None
@@ -35,11 +547,76 @@ class Solution:
         self.num_vehicles = len([v for v in vehicles if v.route])
         self.feasible = True
         self.diversity_score = 0.0  # NOVO: Para controlar diversidade
+        self._arrays = None  # (tour, cargas), ver to_arrays
+        
+        # evaluate=False deixa o fitness pendente (avaliado em lote pelo AG)
+        if evaluate:
+            self.calculate_fitness()
+    
+    @property
+    def vehicles(self) -> List[Vehicle]:
+        """
+        Veículos da solução (materializados no primeiro acesso após copy()).
         
-        self.calculate_fitness()
+        Quem acessa pode modificar as rotas, então uma cópia ainda
+        compartilhada ganha aqui seus próprios objetos Vehicle.
+        """
+        if self._vehicles is None:
+            new_vehicles = []
+            for v in self._shared_vehicles:
+                new_v = Vehicle(v.id, v.capacity, v.max_route_time)
+                new_v.route = v.route.copy()
+                new_v.load = v.load
+                new_v.total_distance = v.total_distance
+                new_v.total_time = v.total_time
+                new_v.ids = v.ids  # imutável; calculate_metrics substitui
+                new_v.penalty = v.penalty
+                new_v.dirty = v.dirty
+                new_vehicles.append(new_v)
+            self._vehicles = new_vehicles
+            self._shared_vehicles = None
+        return self._vehicles
+    
+    @vehicles.setter
+    def vehicles(self, vehicles: List[Vehicle]):
+        self._vehicles = vehicles
+        self._shared_vehicles = None
+    
+    def _vehicle_view(self) -> List[Vehicle]:
+        """Veículos apenas para leitura (não materializa uma cópia compartilhada)."""
+        return self._vehicles if self._vehicles is not None else self._shared_vehicles
     
     def calculate_fitness(self):
         """Calcula fitness COM validação rigorosa."""
+        vehicles = self._vehicle_view()
+        if self.instance is not None and vehicles and not any(v.dirty for v in vehicles):
+            # Métricas em cache por veículo (Vehicle.calculate_metrics): só
+            # as rotas modificadas desde a última avaliação são percorridas
+            total_distance = 0.0
+            total_time = 0.0
+            penalty = 0.0
+            num_vehicles = 0
+            for v in vehicles:
+                total_distance += v.total_distance
+                total_time += v.total_time
+                penalty += v.penalty
+                num_vehicles += 1 if v.route else 0
+            fitness = 1.0 * total_distance + 1000.0 * num_vehicles + 100000.0 * penalty
+            self.set_evaluation((fitness, total_distance, total_time, num_vehicles,
+                                 penalty == 0))
+            return
+        
+        if self.instance is not None:
+            # Caminho em arrays: kernel compilado sobre o tour gigante
+            instance = self.instance
+            tour, loads = self.to_arrays()
+            out = np.empty(5)
+            _evaluate_tour(tour, loads, instance.dist, instance.tt,
+                           instance.tw_open, instance.tw_close, instance.service,
+                           float(instance.vehicle_capacity), out)
+            self.set_evaluation(decode_results(out[None, :])[0])
+            return
+        
         self.total_distance = sum(v.total_distance for v in self.vehicles)
         self.total_time = sum(v.total_time for v in self.vehicles)
         self.num_vehicles = len([v for v in self.vehicles if v.route])
@@ -49,50 +626,132 @@ class Solution:
         w2 = 1000.0   # Número de veículos
         w3 = 100000.0 # Penalização por violação
         
+        # Sem instância, apenas a capacidade é verificada
         penalty = 0.0
-        
         for v in self.vehicles:
-            # Capacidade
             if v.load > v.capacity:
                 penalty += (v.load - v.capacity) * 1000
-            
-            # Janelas de tempo (se instance disponível)
-            if self.instance is not None:
-                current_time = 0.0
-                current_loc = self.instance.depot
-                
-                for customer in v.route:
-                    travel_time = current_loc.distance_to(customer)
-                    arrival_time = current_time + travel_time
-                    
-                    if arrival_time > customer.due_time:
-                        lateness = arrival_time - customer.due_time
-                        penalty += lateness * 1000
-                    
-                    service_start = max(arrival_time, customer.ready_time)
-                    current_time = service_start + customer.service_time
-                    current_loc = customer
         
         self.feasible = (penalty == 0)
         self.fitness = w1 * self.total_distance + w2 * self.num_vehicles + w3 * penalty
     
-    def copy(self) -> 'Solution':
-        """Cópia profunda."""
-        new_vehicles = []
-        for v in self.vehicles:
-            new_v = Vehicle(v.id, v.capacity, v.max_route_time)
-            new_v.route = v.route.copy()
-            new_v.load = v.load
-            new_v.total_distance = v.total_distance
-            new_v.total_time = v.total_time
-            new_vehicles.append(new_v)
+    def invalidate(self):
+        """Marca o fitness (e os arrays) como pendentes após modificar as rotas."""
+        self.fitness = None
+        self._arrays = None
+    
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Representação em arrays, cacheada até invalidate().
         
-        return Solution(new_vehicles, self.instance)
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray]
+            tour int32 (ids de cada veículo seguidos de 0) e carga por veículo
+        """
+        if self._arrays is None:
+            vehicles = self._vehicle_view()
+            if vehicles and not any(v.dirty for v in vehicles):
+                # ids em cache por veículo (Vehicle.calculate_metrics)
+                parts = []
+                for v in vehicles:
+                    parts.append(v.ids)
+                    parts.append(_DEPOT)
+                self._arrays = (np.concatenate(parts),
+                                np.array([v.load for v in vehicles], dtype=np.float64))
+                return self._arrays
+            
+            tour = []
+            for v in vehicles:
+                tour.extend([c.id for c in v.route])
+                tour.append(0)
+            self._arrays = (np.array(tour, dtype=np.int32),
+                            np.array([v.load for v in vehicles], dtype=np.float64))
+        return self._arrays
+    
+    @classmethod
+    def from_arrays(cls, tour: np.ndarray, instance: VRPTWInstance,
+                    evaluate: bool = True) -> 'Solution':
+        """
+        Reconstrói os objetos Vehicle/Customer a partir do tour gigante.
+        
+        Usado apenas nas bordas (relatório, visualização); o AG trabalha
+        com os arrays.
+        
+        Parameters:
+        -----------
+        tour : np.ndarray
+            ids de cada veículo seguidos de 0 (-1 opcional como preenchimento)
+        instance : VRPTWInstance
+            Instância do problema (ids dos clientes = índices em locations)
+        """
+        tour = np.asarray(tour)
+        tour = tour[tour >= 0].astype(np.int32)
+        bounds = np.flatnonzero(tour == 0)
+        starts = np.concatenate(([0], bounds[:-1] + 1))
+        
+        # Os ids de cada veículo são fatias de um único array contíguo
+        vehicles = []
+        for vehicle_id, (a, b) in enumerate(zip(starts.tolist(), bounds.tolist())):
+            vehicle = Vehicle(vehicle_id, instance.vehicle_capacity)
+            vehicle.route = [instance.locations[cid] for cid in tour[a:b].tolist()]
+            vehicle.load = sum(c.demand for c in vehicle.route)
+            vehicle.calculate_metrics(instance.depot, instance, tour[a:b])
+            vehicles.append(vehicle)
+        return cls(vehicles, instance, evaluate=evaluate)
+    
+    def to_chromosome(self) -> list:
+        """
+        Representação compacta (serializável) usada na avaliação paralela.
+        
+        Cada veículo vira (ids da rota, carga, capacidade, distância, tempo).
+        """
+        return [([c.id for c in v.route], v.load, v.capacity,
+                 v.total_distance, v.total_time)
+                for v in self._vehicle_view()]
+    
+    def get_evaluation(self) -> tuple:
+        """Retorna os resultados da avaliação."""
+        return (self.fitness, self.total_distance, self.total_time,
+                self.num_vehicles, self.feasible)
+    
+    def set_evaluation(self, evaluation: tuple):
+        """Aplica resultados calculados em outro processo."""
+        (self.fitness, self.total_distance, self.total_time,
+         self.num_vehicles, self.feasible) = evaluation
+    
+    def copy(self) -> 'Solution':
+        """
+        Cópia (reaproveita o fitness já calculado).
+        
+        Copy-on-write: a cópia compartilha a lista de veículos da original e
+        só cria seus próprios Vehicle no primeiro acesso a `vehicles` (ver a
+        property). Cópias que nunca são modificadas (pais sem crossover,
+        melhor solução) não alocam rotas. As rotas da original não devem ser
+        modificadas no lugar depois de copiadas - os operadores sempre
+        modificam uma cópia nova.
+        """
+        new_solution = Solution.__new__(Solution)
+        new_solution._vehicles = None
+        new_solution._shared_vehicles = self._vehicle_view()
+        new_solution.instance = self.instance
+        new_solution.diversity_score = 0.0
+        new_solution._arrays = self._arrays  # imutáveis; invalidate() descarta
+        if self.fitness is not None:
+            new_solution.set_evaluation(self.get_evaluation())
+        else:
+            new_solution.fitness = None
+            new_solution.total_distance = 0.0
+            new_solution.total_time = 0.0
+            new_solution.num_vehicles = len([v for v in new_solution._shared_vehicles
+                                             if v.route])
+            new_solution.feasible = True
+        return new_solution
     
     def get_all_customers(self) -> List[Customer]:
         """Retorna todos os clientes roteados."""
         customers = []
-        for v in self.vehicles:
+        for v in self._vehicle_view():
             customers.extend(v.route)
         return customers
     
@@ -101,18 +760,440 @@ class Solution:
         Calcula diversidade entre duas soluções.
         Baseado em diferença de sequência de visitas.
         """
-        seq1 = [c.id for v in self.vehicles for c in v.route]
-        seq2 = [c.id for v in other.vehicles for c in v.route]
+        tour1 = self.to_arrays()[0]
+        tour2 = other.to_arrays()[0]
+        seq1 = tour1[tour1 > 0]
+        seq2 = tour2[tour2 > 0]
         
         if len(seq1) != len(seq2):
             return 1.0
         
-        differences = sum(1 for i in range(len(seq1)) if seq1[i] != seq2[i])
-        return differences / len(seq1) if seq1 else 0.0
+        differences = np.count_nonzero(seq1 != seq2)
+        return differences / len(seq1) if len(seq1) else 0.0
     
     def __repr__(self):
+        fitness = f"{self.fitness:.2f}" if self.fitness is not None else "pendente"
         return (f"Solution(vehicles={self.num_vehicles}, distance={self.total_distance:.2f}, "
-                f"fitness={self.fitness:.2f}, feasible={self.feasible})")
+                f"fitness={fitness}, feasible={self.feasible})")
+
+
+# ============================================================================
+# AVALIAÇÃO PARALELA DE FITNESS (ProcessPoolExecutor)
+# ============================================================================
+
+# Instância mantida em cada processo trabalhador. É enviada uma única vez
+# (initializer do pool), evitando serializá-la a cada geração.
+_WORKER_INSTANCE = None
+_WORKER_SHARED = None  # (nomes dos blocos, SharedMemory, arrays) em uso
+
+
+def visit_sequences(solutions: List[Solution]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sequências de visita (tour sem os depots) em uma matriz.
+    
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        Matriz (P, L) int32 completada com -1 e o comprimento de cada linha
+    """
+    tours = [s.to_arrays()[0] for s in solutions]
+    seqs = [tour[tour > 0] for tour in tours]
+    lengths = np.array([len(seq) for seq in seqs], dtype=np.int64)
+    
+    matrix = np.full((len(seqs), max(lengths.max(initial=0), 1)), -1, dtype=np.int32)
+    for i, seq in enumerate(seqs):
+        matrix[i, :len(seq)] = seq
+    return matrix, lengths
+
+
+def sequence_diversity(seqs: np.ndarray, lengths: np.ndarray,
+                       other: Solution) -> np.ndarray:
+    """
+    calculate_diversity de cada linha de seqs (ver visit_sequences) em
+    relação a `other`, vetorizado.
+    """
+    tour = other.to_arrays()[0]
+    seq = tour[tour > 0]
+    n = len(seq)
+    
+    diversity = np.ones(len(lengths))
+    if n > seqs.shape[1]:
+        return diversity
+    
+    same = lengths == n
+    if n == 0:
+        diversity[same] = 0.0
+    else:
+        diversity[same] = np.count_nonzero(seqs[same, :n] != seq, axis=1) / n
+    return diversity
+
+
+def _init_worker(instance: VRPTWInstance):
+    """Inicializa o processo trabalhador com a instância do problema."""
+    global _WORKER_INSTANCE
+    _WORKER_INSTANCE = instance
+
+
+def _eval_ind(chromosome: list) -> tuple:
+    """Avalia um cromossomo (ver Solution.to_chromosome) no trabalhador."""
+    instance = _WORKER_INSTANCE
+    tour = []
+    for route_ids, *_ in chromosome:
+        tour.extend(route_ids)
+        tour.append(0)
+    loads = np.array([load for _, load, *_ in chromosome], dtype=np.float64)
+    
+    out = np.empty(5)
+    _evaluate_tour(np.array(tour, dtype=np.int32), loads, instance.dist,
+                   instance.tt, instance.tw_open, instance.tw_close,
+                   instance.service, float(instance.vehicle_capacity), out)
+    return decode_results(out[None, :])[0]
+
+
+def _two_opt_tour(tour: np.ndarray, instance: VRPTWInstance,
+                  max_iterations: int = 50) -> np.ndarray:
+    """
+    Aplica _two_opt a cada rota (com 4+ clientes) do tour gigante.
+    
+    Returns:
+    --------
+    np.ndarray
+        Novo tour, com o mesmo layout (ids de cada veículo seguidos de 0)
+    """
+    tour = tour.copy()
+    bounds = np.flatnonzero(tour == 0)
+    starts = np.concatenate(([0], bounds[:-1] + 1))
+    
+    for a, b in zip(starts, bounds):
+        if b - a < 4:
+            continue
+        tour[a:b] = _two_opt(tour[a:b].astype(np.int64), instance.dist,
+                             instance.dist_q, instance.tt, instance.tw_open,
+                             instance.tw_close, instance.service, instance.demand,
+                             float(instance.vehicle_capacity), instance.neighbors,
+                             max_iterations)
+    return tour
+
+
+def _local_search_ind(tour: np.ndarray) -> np.ndarray:
+    """Busca local 2-opt de um tour (ver Solution.to_arrays) no trabalhador."""
+    return _two_opt_tour(tour, _WORKER_INSTANCE)
+
+
+def _local_search(ga: 'ImprovedGeneticAlgorithm', solutions: List[Solution]) -> List[Solution]:
+    """Aplica a busca local no próprio processo (tarefa do pool de threads)."""
+    return [ga.two_opt_intra_route(solution) for solution in solutions]
+
+
+def _calculate_fitness(solutions: List[Solution]):
+    """Avalia as soluções no próprio processo (tarefa do pool de threads)."""
+    for solution in solutions:
+        solution.calculate_fitness()
+
+
+def population_shape(chromosomes: List[list]) -> Tuple[int, int, int]:
+    """(nº de cromossomos, comprimento do tour, nº de veículos) máximos do lote."""
+    length = max(sum(len(route_ids) + 1 for route_ids, *_ in chromosome)
+                 for chromosome in chromosomes) + 1
+    n_routes = max(max(len(chromosome) for chromosome in chromosomes), 1)
+    return len(chromosomes), length, n_routes
+
+
+def encode_population(chromosomes: List[list], tours: np.ndarray, loads: np.ndarray):
+    """
+    Escreve cromossomos (Solution.to_chromosome) no formato de _evaluate_tour.
+    
+    tours recebe os ids de cada veículo separados por 0 (completado com -1)
+    e loads a carga de cada veículo.
+    """
+    tours[:len(chromosomes)] = -1
+    for i, chromosome in enumerate(chromosomes):
+        tour = []
+        for route_ids, *_ in chromosome:
+            tour.extend(route_ids)
+            tour.append(0)
+        tours[i, :len(tour)] = tour
+        loads[i, :len(chromosome)] = [load for _, load, *_ in chromosome]
+
+
+def decode_results(results: np.ndarray) -> List[tuple]:
+    """Converte linhas (fitness, dist, tempo, nv, penalização) em avaliações."""
+    return [(float(f), float(d), float(t), int(nv), bool(p == 0))
+            for f, d, t, nv, p in results]
+
+
+class BatchFitnessEvaluator:
+    """
+    Avaliador em lote na CPU (usado por ImprovedGeneticAlgorithm).
+    
+    A população é codificada em arrays e avaliada com uma única chamada ao
+    kernel _evaluate_population, que distribui os cromossomos entre os
+    núcleos (Numba prange) sem processos nem memória compartilhada.
+    """
+    
+    def __init__(self, instance: VRPTWInstance):
+        """
+        Parameters:
+        -----------
+        instance : VRPTWInstance
+            Instância do problema (ids dos clientes = índices na matriz)
+        """
+        self.instance = instance
+        self.capacity = float(instance.vehicle_capacity)
+        
+        # Compila (ou carrega do cache) antes da primeira geração
+        self.evaluate([[([], 0.0, self.capacity, 0.0, 0.0)]])
+    
+    def evaluate(self, chromosomes: List[list]) -> List[tuple]:
+        """
+        Avalia cromossomos (Solution.to_chromosome).
+        
+        Returns:
+        --------
+        List[tuple]
+            (fitness, distância, tempo, nº de veículos, factível) por cromossomo
+        """
+        n, length, n_routes = population_shape(chromosomes)
+        tours = np.empty((n, length), dtype=np.int32)
+        loads = np.zeros((n, n_routes), dtype=np.float64)
+        encode_population(chromosomes, tours, loads)
+        
+        instance = self.instance
+        out = np.empty((n, 5), dtype=np.float64)
+        _evaluate_population(tours, loads, instance.dist, instance.tt,
+                             instance.tw_open, instance.tw_close,
+                             instance.service, self.capacity, out)
+        return decode_results(out)
+
+
+def _attach_shared(names: tuple, shapes: tuple) -> tuple:
+    """Anexa (uma vez por alocação) os blocos de memória compartilhada."""
+    global _WORKER_SHARED
+    
+    if _WORKER_SHARED is None or _WORKER_SHARED[0] != names:
+        if _WORKER_SHARED is not None:
+            blocks = _WORKER_SHARED[1]
+            _WORKER_SHARED = None
+            for shm in blocks:
+                shm.close()
+        
+        blocks = [SharedMemory(name=name) for name in names]
+        arrays = tuple(np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+                       for shm, (shape, dtype) in zip(blocks, shapes))
+        _WORKER_SHARED = (names, blocks, arrays)
+    
+    return _WORKER_SHARED[2]
+
+
+def _eval_shared(names: tuple, shapes: tuple, start: int, stop: int):
+    """Avalia as linhas [start, stop) da população compartilhada."""
+    tours, loads, results = _attach_shared(names, shapes)
+    instance = _WORKER_INSTANCE
+    capacity = float(instance.vehicle_capacity)
+    
+    for i in range(start, stop):
+        _evaluate_tour(tours[i], loads[i], instance.dist, instance.tt,
+                       instance.tw_open, instance.tw_close, instance.service,
+                       capacity, results[i])
+
+
+class SharedPopulationPool:
+    """
+    Pool persistente de processos com a população em memória compartilhada.
+    
+    A instância é enviada uma única vez (initializer). A cada lote, o processo
+    principal escreve a população em arrays compartilhados (tours int32 e
+    cargas por veículo) e envia a cada trabalhador apenas o intervalo de
+    linhas a avaliar; os resultados voltam pelo array compartilhado de
+    fitness, sem serializar cromossomos.
+    """
+    
+    def __init__(self, instance: VRPTWInstance, n_workers: int = None):
+        """
+        Parameters:
+        -----------
+        instance : VRPTWInstance
+            Instância enviada uma única vez para cada trabalhador
+        n_workers : int, optional
+            Número de processos (padrão: os.cpu_count())
+        """
+        self.n_workers = n_workers or os.cpu_count()
+        self.executor = ProcessPoolExecutor(max_workers=self.n_workers,
+                                            initializer=_init_worker,
+                                            initargs=(instance,))
+        self._blocks = []
+        self.tours = None    # (P, L) int32: rotas separadas por 0, -1 no fim
+        self.loads = None    # (P, R) float64: carga de cada veículo
+        self.results = None  # (P, 5) float64: ver _evaluate_tour
+    
+    def _allocate(self, n: int, length: int, n_routes: int):
+        """Garante capacidade nos arrays compartilhados (realoca se preciso)."""
+        if (self.tours is not None and n <= self.tours.shape[0]
+                and length <= self.tours.shape[1]
+                and n_routes <= self.loads.shape[1]):
+            return
+        
+        if self.tours is not None:
+            n = max(n, self.tours.shape[0])
+            length = max(length, self.tours.shape[1])
+            n_routes = max(n_routes, self.loads.shape[1])
+        self._release()
+        
+        arrays = []
+        for shape, dtype in self._shapes(n, length, n_routes):
+            shm = SharedMemory(create=True,
+                               size=int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            self._blocks.append(shm)
+            arrays.append(np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+        self.tours, self.loads, self.results = arrays
+    
+    @staticmethod
+    def _shapes(n: int, length: int, n_routes: int) -> tuple:
+        return (((n, length), 'int32'), ((n, n_routes), 'float64'),
+                ((n, 5), 'float64'))
+    
+    def evaluate(self, chromosomes: List[list]) -> List[tuple]:
+        """
+        Avalia cromossomos (Solution.to_chromosome) nos trabalhadores.
+        
+        Returns:
+        --------
+        List[tuple]
+            (fitness, distância, tempo, nº de veículos, factível) por cromossomo
+        """
+        n, length, n_routes = population_shape(chromosomes)
+        self._allocate(n, length, n_routes)
+        
+        # Escreve a população nos arrays compartilhados
+        tours, loads = self.tours, self.loads
+        encode_population(chromosomes, tours, loads)
+        
+        # Cada trabalhador recebe apenas um intervalo de linhas
+        names = tuple(shm.name for shm in self._blocks)
+        shapes = self._shapes(*tours.shape, loads.shape[1])
+        bounds = np.linspace(0, n, min(self.n_workers, n) + 1, dtype=int)
+        futures = [self.executor.submit(_eval_shared, names, shapes, int(a), int(b))
+                   for a, b in zip(bounds[:-1], bounds[1:])]
+        for future in futures:
+            future.result()
+        
+        return decode_results(self.results[:n])
+    
+    def _release(self):
+        """Libera os blocos de memória compartilhada."""
+        self.tours = self.loads = self.results = None
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+    
+    def shutdown(self):
+        """Encerra os trabalhadores e libera a memória compartilhada."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        self._release()
+    
+    def __del__(self):
+        self.shutdown()
+
+
+# ============================================================================
+# AVALIAÇÃO DISTRIBUÍDA (MPI / mpi4py)
+# ============================================================================
+#
+# Modelo mestre-escravo: o rank 0 executa o AG completo (seleção, crossover,
+# mutação) e, a cada lote de avaliação, distribui os cromossomos entre os
+# ranks com `scatter`; os resultados voltam só para o rank 0 com `gather`.
+# Os demais ranks ficam em `mpi_worker_loop` até receberem o sinal de parada.
+
+def _mpi_evaluate(comm, local_solutions: List[Solution], chromosomes: list) -> list:
+    """
+    Distribui a avaliação entre os ranks (executado no rank 0).
+    
+    O rank 0 avalia `local_solutions` diretamente; `chromosomes` é dividido
+    entre os demais ranks. Retorna as avaliações na ordem original.
+    """
+    bounds = np.linspace(0, len(chromosomes), comm.Get_size(), dtype=int)
+    chunks = [[]] + [chromosomes[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+    
+    comm.scatter(chunks, root=0)
+    for solution in local_solutions:
+        solution.calculate_fitness()
+    gathered = comm.gather([s.get_evaluation() for s in local_solutions], root=0)
+    
+    return [evaluation for rank_results in gathered[1:] for evaluation in rank_results]
+
+
+def mpi_worker_loop(comm, instance: VRPTWInstance):
+    """
+    Laço dos ranks trabalhadores: avalia cromossomos até receber None.
+    
+    Parameters:
+    -----------
+    comm : mpi4py.MPI.Comm
+        Comunicador (tipicamente MPI.COMM_WORLD)
+    instance : VRPTWInstance
+        Instância do problema (recebida do rank 0 com `bcast`)
+    """
+    _init_worker(instance)
+    
+    while True:
+        local = comm.scatter(None, root=0)
+        if local is None:
+            break
+        comm.gather([_eval_ind(chromosome) for chromosome in local], root=0)
+
+
+def mpi_shutdown(comm):
+    """Envia o sinal de parada para os ranks trabalhadores (rank 0)."""
+    comm.scatter([None] * comm.Get_size(), root=0)
+
+
+def create_process_pool(instance: VRPTWInstance, n_workers: int = None) -> SharedPopulationPool:
+    """
+    Cria pool persistente de processos para avaliação de fitness.
+    
+    Parameters:
+    -----------
+    instance : VRPTWInstance
+        Instância enviada uma única vez para cada trabalhador
+    n_workers : int, optional
+        Número de processos (padrão: os.cpu_count())
+        
+    Returns:
+    --------
+    SharedPopulationPool
+        Executor a ser passado para ImprovedGeneticAlgorithm
+    """
+    return SharedPopulationPool(instance, n_workers)
+
+
+def free_threading() -> bool:
+    """True se o interpretador roda sem GIL (build free-threaded, 3.13+)."""
+    return not getattr(sys, '_is_gil_enabled', lambda: True)()
+
+
+def create_thread_pool(n_workers: int = None) -> ThreadPoolExecutor:
+    """
+    Cria pool de threads para avaliação de fitness.
+    
+    Útil no Python free-threaded: as threads compartilham a instância (arrays
+    NumPy somente leitura) e as próprias soluções, sem serialização nem
+    memória compartilhada. Com GIL, apenas o kernel compilado (nogil) roda
+    em paralelo.
+    
+    Parameters:
+    -----------
+    n_workers : int, optional
+        Número de threads (padrão: os.cpu_count())
+        
+    Returns:
+    --------
+    ThreadPoolExecutor
+        Executor a ser passado para ImprovedGeneticAlgorithm
+    """
+    return ThreadPoolExecutor(max_workers=n_workers or os.cpu_count())
 
 
 class ImprovedGeneticAlgorithm:
@@ -124,6 +1205,7 @@ class ImprovedGeneticAlgorithm:
     - Operadores inter-rota (relocate, exchange)
     - Busca local 2-opt inter e intra-rota
     - Controle de diversidade populacional
+    - Avaliação de fitness em lote (opcionalmente paralela via executor)
     """
     
     def __init__(self, instance: VRPTWInstance, 
@@ -133,7 +1215,11 @@ class ImprovedGeneticAlgorithm:
                  crossover_rate: float = 0.8,
                  mutation_rate: float = 0.3,
                  local_search_rate: float = 0.5,
-                 seed: int = 42):
+                 seed: int = 42,
+                 executor: Executor = None,
+                 n_workers: int = 1,
+                 comm=None,
+                 evaluator=None):
         
         self.instance = instance
         self.pop_size = pop_size
@@ -143,14 +1229,46 @@ class ImprovedGeneticAlgorithm:
         self.mutation_rate = mutation_rate
         self.local_search_rate = local_search_rate
         
-        np.random.seed(seed)
+        # Avaliação paralela (None = serial no processo principal)
+        self.executor = executor
+        self.n_workers = max(1, n_workers)
+        
+        # Avaliador em lote alternativo (ex.: GPUPopulationEvaluator)
+        self.evaluator = evaluator
+        
+        # Avaliação distribuída via MPI (apenas com mais de um rank)
+        self.comm = comm if comm is not None and comm.Get_size() > 1 else None
+        rank = 0
+        if self.comm is not None:
+            rank = self.comm.Get_rank()
+            size = self.comm.Get_size()
+            if pop_size % size != 0:
+                rounded = int(np.ceil(pop_size / size)) * size
+                print(f"⚠ pop_size={pop_size} não é múltiplo de {size} ranks MPI. "
+                      f"Usando pop_size={rounded}.")
+                self.pop_size = rounded
+        
+        np.random.seed(seed + rank)
         
         self.population = []
         self.elite_population = []
         
         self.best_solution = None
-        self.best_fitness_history = []
-        self.avg_fitness_history = []
+        
+        # Históricos pré-alocados (uma posição por geração)
+        self._best_history = np.empty(generations, dtype=np.float64)
+        self._avg_history = np.empty(generations, dtype=np.float64)
+        self._n_history = 0
+        
+        # Memoização do fitness: (tour, cargas) -> avaliação, LRU
+        self._fit_cache = OrderedDict()
+        self._fit_cache_size = 10 * self.pop_size
+        
+        # Fitness da população atual (ver _refresh_fitness)
+        self._fitness_arr = None
+        
+        # ids na ordem de instance.customers (máscaras do crossover)
+        self._customer_ids = np.array([c.id for c in instance.customers], dtype=np.intp)
         
         self.generation = 0
         self.stagnation_counter = 0
@@ -201,6 +1319,7 @@ class ImprovedGeneticAlgorithm:
                     mutated = self._apply_random_mutation(mutated)
                 solutions.append(mutated)
         
+        self.evaluate_population(solutions)
         self.population = solutions
         self._update_best_solution()
         
@@ -210,44 +1329,143 @@ class ImprovedGeneticAlgorithm:
         print("="*70 + "\n")
     
     def _random_greedy_construction(self) -> List[Vehicle]:
-        """Construção aleatória gulosa."""
-        unrouted = self.instance.customers.copy()
+        """
+        Construção aleatória gulosa.
+        
+        Opera sobre ids: demandas e distâncias vêm dos arrays da instância
+        (filtro de capacidade em lote), e os Customer só são consultados
+        para montar a rota.
+        """
+        locations = self.instance.locations
+        depot = self.instance.depot
+        demand = self.instance.demand.astype(np.float64, copy=False)
+        dist = self.instance.dist
+        
+        unrouted = np.array([c.id for c in self.instance.customers], dtype=np.int64)
         np.random.shuffle(unrouted)
         
         vehicles = []
         vehicle_id = 0
         
-        while unrouted and vehicle_id < self.instance.num_vehicles:
+        while unrouted.size and vehicle_id < self.instance.num_vehicles:
             vehicle = Vehicle(vehicle_id, self.instance.vehicle_capacity)
+            last = 0  # depot
             
-            while unrouted:
-                candidates = [c for c in unrouted 
-                             if vehicle.load + c.demand <= vehicle.capacity]
+            while unrouted.size:
+                fits = np.flatnonzero(vehicle.load + demand[unrouted] <= vehicle.capacity)
                 
-                if not candidates:
+                if not fits.size:
                     break
                 
-                if vehicle.route:
-                    last = vehicle.route[-1]
-                else:
-                    last = self.instance.depot
-                
-                distances = [1.0 / (last.distance_to(c) + 0.1) for c in candidates]
-                probs = np.array(distances) / sum(distances)
-                chosen = np.random.choice(candidates, p=probs)
+                # Pesos 1/distância calculados em lote (linha da matriz por ids)
+                weights = 1.0 / (dist[last, unrouted[fits]] + 0.1)
+                k = fits[roulette_index(weights)]
+                last = int(unrouted[k])
                 
-                vehicle.add_customer(chosen, self.instance.depot)
-                unrouted.remove(chosen)
+                vehicle.add_customer(locations[last], depot)
+                unrouted = np.delete(unrouted, k)
             
-            vehicle.calculate_metrics(self.instance.depot)
+            vehicle.calculate_metrics(depot, self.instance)
             vehicles.append(vehicle)
             vehicle_id += 1
         
         return vehicles
     
+    def evaluate_population(self, solutions: List[Solution]):
+        """
+        Avalia em lote as soluções com fitness pendente.
+        
+        Os operadores genéticos apenas marcam as soluções como pendentes;
+        o cálculo é feito aqui: no avaliador em lote (GPU), no executor
+        (processos ou threads), via MPI ou, por padrão, de forma serial.
+        """
+        pending = [s for s in solutions if s.fitness is None]
+        if not pending:
+            return
+        
+        # Soluções já vistas (duplicatas do crossover/mutação) saem do cache
+        misses = {}
+        for solution in pending:
+            tour, loads = solution.to_arrays()
+            key = tour.tobytes() + loads.tobytes()
+            evaluation = self._fit_cache.get(key)
+            if evaluation is not None:
+                self._fit_cache.move_to_end(key)
+                solution.set_evaluation(evaluation)
+            else:
+                misses.setdefault(key, []).append(solution)
+        
+        if not misses:
+            return
+        
+        # Avalia um representante por chave e propaga para as duplicatas
+        self._evaluate_pending([group[0] for group in misses.values()])
+        for key, group in misses.items():
+            evaluation = group[0].get_evaluation()
+            for solution in group[1:]:
+                solution.set_evaluation(evaluation)
+            self._fit_cache[key] = evaluation
+        
+        while len(self._fit_cache) > self._fit_cache_size:
+            self._fit_cache.popitem(last=False)
+    
+    def _evaluate_pending(self, pending: List[Solution]):
+        """Calcula o fitness das soluções (no backend configurado)."""
+        if self.evaluator is not None:
+            results = self.evaluator.evaluate([s.to_chromosome() for s in pending])
+            for solution, evaluation in zip(pending, results):
+                solution.set_evaluation(evaluation)
+            return
+        
+        if self.executor is None and self.comm is None:
+            for solution in pending:
+                solution.calculate_fitness()
+            return
+        
+        if self.executor is None:
+            # MPI: o rank 0 fica com uma fatia e distribui o restante
+            n_local = len(pending) // self.comm.Get_size()
+            remote = pending[n_local:]
+            results = _mpi_evaluate(self.comm, pending[:n_local],
+                                    [s.to_chromosome() for s in remote])
+            for solution, evaluation in zip(remote, results):
+                solution.set_evaluation(evaluation)
+            return
+        
+        if isinstance(self.executor, ThreadPoolExecutor):
+            # Threads: cada uma avalia uma fatia das próprias soluções
+            bounds = np.linspace(0, len(pending), min(self.n_workers, len(pending)) + 1,
+                                 dtype=int)
+            futures = [self.executor.submit(_calculate_fitness, pending[a:b])
+                       for a, b in zip(bounds[:-1], bounds[1:])]
+            for future in futures:
+                future.result()
+            return
+        
+        chromosomes = [s.to_chromosome() for s in pending]
+        if isinstance(self.executor, SharedPopulationPool):
+            results = self.executor.evaluate(chromosomes)
+        else:
+            chunksize = max(1, len(pending) // self.n_workers)
+            results = self.executor.map(_eval_ind, chromosomes, chunksize=chunksize)
+        
+        for solution, evaluation in zip(pending, results):
+            solution.set_evaluation(evaluation)
+    
+    def _refresh_fitness(self):
+        """
+        Atualiza o array de fitness da população (uma vez por geração).
+        
+        Lido pelos torneios (select_parents), pela melhor solução e pelo
+        fitness médio do histórico, sem reler s.fitness de cada solução.
+        """
+        self._fitness_arr = np.fromiter((s.fitness for s in self.population),
+                                        dtype=np.float64, count=len(self.population))
+    
     def _update_best_solution(self):
         """Atualiza melhor solução."""
-        best_in_pop = min(self.population, key=lambda s: s.fitness)
+        self._refresh_fitness()
+        best_in_pop = self.population[int(self._fitness_arr.argmin())]
         
         if self.best_solution is None or best_in_pop.fitness < self.best_solution.fitness:
             self.best_solution = best_in_pop.copy()
@@ -257,8 +1475,21 @@ class ImprovedGeneticAlgorithm:
     
     def tournament_selection(self, tournament_size: int = 5) -> Solution:
         """Seleção por torneio."""
-        tournament = np.random.choice(self.population, tournament_size, replace=False)
-        return min(tournament, key=lambda s: s.fitness)
+        return self.select_parents(1, tournament_size)[0]
+    
+    def select_parents(self, n: int, tournament_size: int = 5) -> List[Solution]:
+        """
+        n torneios de uma vez (vetorizado).
+        
+        Sorteia uma matriz (n, tournament_size) de índices da população e
+        escolhe o vencedor de cada linha com argmin sobre o fitness.
+        """
+        if self._fitness_arr is None or len(self._fitness_arr) != len(self.population):
+            self._refresh_fitness()
+        fitness = self._fitness_arr
+        idx = np.random.randint(0, len(self.population), size=(n, tournament_size))
+        winners = idx[np.arange(n), fitness[idx].argmin(axis=1)]
+        return [self.population[i] for i in winners]
     
     def best_route_crossover(self, parent1: Solution, parent2: Solution) -> Tuple[Solution, Solution]:
         """
@@ -275,115 +1506,122 @@ class ImprovedGeneticAlgorithm:
         offspring1_vehicles = []
         offspring2_vehicles = []
         
-        # Clientes já inseridos
-        used1 = set()
-        used2 = set()
+        # Clientes já inseridos (máscaras indexadas pelo id)
+        n_locations = len(self.instance.locations)
+        used1 = np.zeros(n_locations, dtype=bool)
+        used2 = np.zeros(n_locations, dtype=bool)
+        
+        # Pais só são lidos (não materializa cópias compartilhadas)
+        vehicles_p1 = parent1._vehicle_view()
+        vehicles_p2 = parent2._vehicle_view()
         
         # FASE 1: Copia rotas aleatórias de cada pai
-        num_routes_to_copy = max(1, len(parent1.vehicles) // 3)
+        num_routes_to_copy = max(1, len(vehicles_p1) // 3)
         
         # Offspring 1: copia rotas do parent1
-        routes_p1 = [v for v in parent1.vehicles if v.route]
-        selected_routes1 = np.random.choice(routes_p1, 
-                                           min(num_routes_to_copy, len(routes_p1)),
-                                           replace=False)
+        routes_p1 = [v for v in vehicles_p1 if v.route]
+        picks = np.random.permutation(len(routes_p1))[:num_routes_to_copy]
+        selected_routes1 = [routes_p1[i] for i in picks]
         
         for v_orig in selected_routes1:
             v_new = Vehicle(len(offspring1_vehicles), v_orig.capacity, v_orig.max_route_time)
             v_new.route = v_orig.route.copy()
             v_new.load = v_orig.load
             offspring1_vehicles.append(v_new)
-            used1.update(c.id for c in v_orig.route)
+            used1[v_orig.route_ids()] = True
         
         # Offspring 2: copia rotas do parent2
-        routes_p2 = [v for v in parent2.vehicles if v.route]
-        selected_routes2 = np.random.choice(routes_p2,
-                                           min(num_routes_to_copy, len(routes_p2)),
-                                           replace=False)
+        routes_p2 = [v for v in vehicles_p2 if v.route]
+        picks = np.random.permutation(len(routes_p2))[:num_routes_to_copy]
+        selected_routes2 = [routes_p2[i] for i in picks]
         
         for v_orig in selected_routes2:
             v_new = Vehicle(len(offspring2_vehicles), v_orig.capacity, v_orig.max_route_time)
             v_new.route = v_orig.route.copy()
             v_new.load = v_orig.load
             offspring2_vehicles.append(v_new)
-            used2.update(c.id for c in v_orig.route)
+            used2[v_orig.route_ids()] = True
         
         # FASE 2: Insere clientes restantes
         all_customers = self.instance.customers
         
-        remaining1 = [c for c in all_customers if c.id not in used1]
-        remaining2 = [c for c in all_customers if c.id not in used2]
+        remaining1 = [all_customers[i] for i in np.flatnonzero(~used1[self._customer_ids])]
+        remaining2 = [all_customers[i] for i in np.flatnonzero(~used2[self._customer_ids])]
         
         offspring1_vehicles = self._insert_remaining_customers(offspring1_vehicles, remaining1)
         offspring2_vehicles = self._insert_remaining_customers(offspring2_vehicles, remaining2)
         
-        # Recalcula métricas
-        for v in offspring1_vehicles:
-            v.calculate_metrics(self.instance.depot)
-        for v in offspring2_vehicles:
-            v.calculate_metrics(self.instance.depot)
-        
-        return Solution(offspring1_vehicles, self.instance), Solution(offspring2_vehicles, self.instance)
+        return (Solution(offspring1_vehicles, self.instance, evaluate=False),
+                Solution(offspring2_vehicles, self.instance, evaluate=False))
     
     def _insert_remaining_customers(self, vehicles: List[Vehicle], 
                                     remaining: List[Customer]) -> List[Vehicle]:
-        """Insere clientes restantes usando melhor inserção."""
-        for customer in remaining:
-            best_vehicle = None
-            best_position = -1
-            best_cost = float('inf')
-            
-            # Tenta inserir em veículos existentes
+        """
+        Insere clientes restantes usando melhor inserção.
+        
+        A busca roda inteira no kernel _insert_customers, sobre as rotas em
+        uma matriz de ids; cada cliente testa primeiro só os veículos que
+        já atendem um de seus vizinhos mais próximos (instance.neighbors).
+        As inserções escolhidas são então repetidas, na mesma ordem, nas
+        listas de clientes dos veículos, e as métricas de cada veículo são
+        recalculadas a partir das linhas da matriz.
+        """
+        instance = self.instance
+        if not remaining:
             for vehicle in vehicles:
-                if vehicle.load + customer.demand > vehicle.capacity:
-                    continue
-                
-                for pos in range(len(vehicle.route) + 1):
-                    # Calcula custo de inserção
-                    test_route = vehicle.route[:pos] + [customer] + vehicle.route[pos:]
-                    
-                    if self._is_route_feasible(test_route, vehicle.capacity):
-                        cost = self._calculate_insertion_cost(vehicle.route, customer, pos)
-                        
-                        if cost < best_cost:
-                            best_cost = cost
-                            best_vehicle = vehicle
-                            best_position = pos
-            
-            # Insere na melhor posição
-            if best_vehicle is not None:
-                best_vehicle.route.insert(best_position, customer)
-                best_vehicle.load += customer.demand
+                vehicle.calculate_metrics(instance.depot, instance)
+            return vehicles
+        
+        m = len(remaining)
+        n_vehicles = len(vehicles)
+        route_ids = [v.route_ids() for v in vehicles]
+        
+        # Uma linha por veículo (existente ou novo) com espaço para todos
+        # os clientes restantes
+        width = max((len(ids) for ids in route_ids), default=0) + m
+        routes = np.empty((n_vehicles + m, width), dtype=np.int32)
+        lengths = np.zeros(n_vehicles + m, dtype=np.int64)
+        loads = np.zeros(n_vehicles + m, dtype=np.float64)
+        capacity = np.zeros(n_vehicles + m, dtype=np.float64)
+        owner = np.full(len(instance.locations), -1, dtype=np.int64)
+        for i, (vehicle, ids) in enumerate(zip(vehicles, route_ids)):
+            routes[i, :len(ids)] = ids
+            lengths[i] = len(ids)
+            loads[i] = vehicle.load
+            capacity[i] = vehicle.capacity
+            owner[ids] = i
+        
+        customers = np.fromiter((c.id for c in remaining), dtype=np.int32, count=m)
+        assigned, positions = _insert_customers(
+            routes, lengths, n_vehicles, loads, capacity, owner, customers,
+            instance.neighbors, float(instance.vehicle_capacity), instance.dist,
+            instance.tt, instance.tw_open, instance.tw_close, instance.service,
+            instance.demand
+        )
+        
+        for customer, i, pos in zip(remaining, assigned.tolist(), positions.tolist()):
+            if i < len(vehicles):
+                vehicle = vehicles[i]
+                vehicle.route.insert(pos, customer)
+                vehicle.load += customer.demand
             else:
                 # Cria novo veículo se necessário
-                new_vehicle = Vehicle(len(vehicles), self.instance.vehicle_capacity)
+                new_vehicle = Vehicle(i, instance.vehicle_capacity)
                 new_vehicle.route = [customer]
                 new_vehicle.load = customer.demand
                 vehicles.append(new_vehicle)
         
+        for i, vehicle in enumerate(vehicles):
+            vehicle.calculate_metrics(instance.depot, instance, routes[i, :lengths[i]].copy())
+        
         return vehicles
     
     def _is_route_feasible(self, route: List[Customer], capacity: float) -> bool:
-        """Verifica se rota é viável."""
-        load = sum(c.demand for c in route)
-        if load > capacity:
-            return False
-        
-        current_time = 0.0
-        current_loc = self.instance.depot
-        
-        for customer in route:
-            travel_time = current_loc.distance_to(customer)
-            arrival_time = current_time + travel_time
-            
-            if arrival_time > customer.due_time:
-                return False
-            
-            service_start = max(arrival_time, customer.ready_time)
-            current_time = service_start + customer.service_time
-            current_loc = customer
-        
-        return True
+        """Verifica se rota é viável (kernel _route_feasible sobre os ids)."""
+        instance = self.instance
+        ids = np.fromiter((c.id for c in route), dtype=np.int64, count=len(route))
+        return _route_feasible(ids, instance.tt, instance.tw_open, instance.tw_close,
+                               instance.service, instance.demand, float(capacity))
     
     def _calculate_insertion_cost(self, route: List[Customer], 
                                   customer: Customer, position: int) -> float:
@@ -398,8 +1636,9 @@ class ImprovedGeneticAlgorithm:
         else:
             next_c = route[position]
         
-        cost_before = prev.distance_to(next_c)
-        cost_after = prev.distance_to(customer) + customer.distance_to(next_c)
+        dist = self.instance.dist
+        cost_before = dist[prev.id, next_c.id]
+        cost_after = dist[prev.id, customer.id] + dist[customer.id, next_c.id]
         
         return cost_after - cost_before
     
@@ -416,8 +1655,9 @@ class ImprovedGeneticAlgorithm:
             return mutated
         
         # Escolhe veículo origem e destino
-        v_from = np.random.choice(vehicles_with_routes)
-        v_to = np.random.choice([v for v in mutated.vehicles if v != v_from])
+        v_from = vehicles_with_routes[np.random.randint(len(vehicles_with_routes))]
+        targets = [v for v in mutated.vehicles if v != v_from]
+        v_to = targets[np.random.randint(len(targets))]
         
         if not v_from.route:
             return mutated
@@ -427,24 +1667,24 @@ class ImprovedGeneticAlgorithm:
         customer = v_from.route.pop(remove_idx)
         v_from.load -= customer.demand
         
-        # Insere no melhor lugar do veículo destino
+        # Insere no melhor lugar do veículo destino (custos de todas as
+        # posições em lote; argmin mantém a primeira posição em empates)
         best_pos = 0
-        best_cost = float('inf')
-        
-        for pos in range(len(v_to.route) + 1):
-            if v_to.load + customer.demand <= v_to.capacity:
-                cost = self._calculate_insertion_cost(v_to.route, customer, pos)
-                if cost < best_cost:
-                    best_cost = cost
-                    best_pos = pos
+        if v_to.load + customer.demand <= v_to.capacity:
+            ids = v_to.route_ids()
+            prev = np.concatenate((_DEPOT, ids))
+            next_c = np.concatenate((ids, _DEPOT))
+            dist = self.instance.dist
+            costs = (dist[prev, customer.id] + dist[customer.id, next_c]) - dist[prev, next_c]
+            best_pos = int(costs.argmin())
         
         v_to.route.insert(best_pos, customer)
         v_to.load += customer.demand
         
-        v_from.calculate_metrics(self.instance.depot)
-        v_to.calculate_metrics(self.instance.depot)
+        v_from.calculate_metrics(self.instance.depot, self.instance)
+        v_to.calculate_metrics(self.instance.depot, self.instance)
         
-        mutated.calculate_fitness()
+        mutated.invalidate()
         return mutated
     
     def exchange_mutation(self, solution: Solution) -> Solution:
@@ -458,7 +1698,8 @@ class ImprovedGeneticAlgorithm:
         if len(vehicles_with_routes) < 2:
             return mutated
         
-        v1, v2 = np.random.choice(vehicles_with_routes, 2, replace=False)
+        i1, i2 = np.random.permutation(len(vehicles_with_routes))[:2]
+        v1, v2 = vehicles_with_routes[i1], vehicles_with_routes[i2]
         
         if not v1.route or not v2.route:
             return mutated
@@ -479,51 +1720,89 @@ class ImprovedGeneticAlgorithm:
             v1.load = v1.load - c1.demand + c2.demand
             v2.load = v2.load - c2.demand + c1.demand
             
-            v1.calculate_metrics(self.instance.depot)
-            v2.calculate_metrics(self.instance.depot)
+            v1.calculate_metrics(self.instance.depot, self.instance)
+            v2.calculate_metrics(self.instance.depot, self.instance)
             
-            mutated.calculate_fitness()
+            mutated.invalidate()
         
         return mutated
     
     def two_opt_intra_route(self, solution: Solution) -> Solution:
-        """2-opt INTRA-rota (dentro de cada rota)."""
+        """2-opt INTRA-rota (dentro de cada rota, melhor melhoria)."""
         improved = solution.copy()
+        locations = self.instance.locations
         
         for vehicle in improved.vehicles:
             if len(vehicle.route) < 4:
                 continue
             
-            route = vehicle.route
-            n = len(route)
-            improved_any = True
-            max_iterations = 50
-            iteration = 0
+            route = _two_opt(
+                vehicle.route_ids().astype(np.int64),
+                self.instance.dist,
+                self.instance.dist_q,
+                self.instance.tt,
+                self.instance.tw_open,
+                self.instance.tw_close,
+                self.instance.service,
+                self.instance.demand,
+                vehicle.capacity,
+                self.instance.neighbors,
+                50
+            )
             
-            while improved_any and iteration < max_iterations:
-                improved_any = False
-                iteration += 1
-                
-                for i in range(n - 1):
-                    for j in range(i + 2, n):
-                        new_route = route[:i+1] + route[i+1:j+1][::-1] + route[j+1:]
-                        
-                        if self._is_route_feasible(new_route, vehicle.capacity):
-                            new_distance = self._calculate_route_distance(new_route)
-                            old_distance = self._calculate_route_distance(route)
-                            
-                            if new_distance < old_distance:
-                                route = new_route
-                                improved_any = True
-                                break
-                    
-                    if improved_any:
-                        break
-            
-            vehicle.route = route
-            vehicle.calculate_metrics(self.instance.depot)
+            vehicle.route = [locations[i] for i in route.tolist()]
+            vehicle.calculate_metrics(self.instance.depot, self.instance,
+                                      route.astype(np.int32))
         
-        improved.calculate_fitness()
+        improved.invalidate()
+        return improved
+    
+    def local_search_population(self, solutions: List[Solution]) -> List[Solution]:
+        """
+        2-opt intra-rota em lote (modelo mestre-escravo).
+        
+        Os operadores genéticos (e todos os sorteios) ficam no processo
+        principal; apenas a busca local, determinística, vai para o executor.
+        Com processos, cada trabalhador recebe o tour gigante (int32) e
+        devolve o tour otimizado, reconstruído aqui nas rotas dos veículos.
+        Lotes pequenos (menos de 2 soluções por trabalhador), MPI e o caso
+        sem executor rodam em série.
+        
+        Returns:
+        --------
+        List[Solution]
+            Novas soluções (mesmo resultado de two_opt_intra_route)
+        """
+        if self.executor is None or len(solutions) < 2 * self.n_workers:
+            return [self.two_opt_intra_route(s) for s in solutions]
+        
+        if isinstance(self.executor, ThreadPoolExecutor):
+            # Threads: _two_opt libera o GIL (nogil)
+            bounds = np.linspace(0, len(solutions), self.n_workers + 1, dtype=int)
+            futures = [self.executor.submit(_local_search, self, solutions[a:b])
+                       for a, b in zip(bounds[:-1], bounds[1:])]
+            return [s for future in futures for s in future.result()]
+        
+        executor = self.executor
+        if isinstance(executor, SharedPopulationPool):
+            executor = executor.executor
+        chunksize = max(1, len(solutions) // (4 * self.n_workers))
+        tours = executor.map(_local_search_ind, [s.to_arrays()[0] for s in solutions],
+                             chunksize=chunksize)
+        
+        improved = []
+        locations = self.instance.locations
+        for solution, tour in zip(solutions, tours):
+            new_solution = solution.copy()
+            bounds = np.flatnonzero(tour == 0)
+            starts = np.concatenate(([0], bounds[:-1] + 1))
+            for vehicle, a, b in zip(new_solution.vehicles, starts, bounds):
+                if b - a < 4:
+                    continue
+                vehicle.route = [locations[i] for i in tour[a:b].tolist()]
+                vehicle.calculate_metrics(self.instance.depot, self.instance, tour[a:b])
+            new_solution.invalidate()
+            improved.append(new_solution)
         return improved
     
     def _calculate_route_distance(self, route: List[Customer]) -> float:
@@ -531,17 +1810,14 @@ class ImprovedGeneticAlgorithm:
         if not route:
             return 0.0
         
-        distance = self.instance.depot.distance_to(route[0])
-        for i in range(len(route) - 1):
-            distance += route[i].distance_to(route[i + 1])
-        distance += route[-1].distance_to(self.instance.depot)
-        
-        return distance
+        # depot -> clientes -> depot, somando as arestas por indexação
+        ids = np.fromiter((c.id for c in route), dtype=np.intp, count=len(route))
+        ids = np.concatenate(([0], ids, [0]))
+        return float(self.instance.dist[ids[:-1], ids[1:]].sum())
     
     def _apply_random_mutation(self, solution: Solution) -> Solution:
         """Aplica mutação aleatória (com operadores melhorados)."""
-        mutation_type = np.random.choice(['relocate', 'exchange', 'intra_2opt'], 
-                                        p=[0.5, 0.3, 0.2])
+        mutation_type = MUTATION_OPERATORS[roulette_index(MUTATION_PROBS)]
         
         if mutation_type == 'relocate':
             return self.relocate_mutation(solution)
@@ -553,7 +1829,7 @@ class ImprovedGeneticAlgorithm:
     def evolve(self):
         """Executa uma geração."""
         # Seleção
-        parents = [self.tournament_selection() for _ in range(self.pop_size)]
+        parents = self.select_parents(self.pop_size)
         
         # Crossover
         offspring = []
@@ -570,10 +1846,15 @@ class ImprovedGeneticAlgorithm:
             if np.random.random() < self.mutation_rate:
                 offspring[i] = self._apply_random_mutation(offspring[i])
         
-        # Busca local
-        for i in range(len(offspring)):
-            if np.random.random() < self.local_search_rate:
-                offspring[i] = self.two_opt_intra_route(offspring[i])
+        # Busca local (sorteio no mestre, 2-opt em lote no executor)
+        selected = [i for i in range(len(offspring))
+                    if np.random.random() < self.local_search_rate]
+        improved = self.local_search_population([offspring[i] for i in selected])
+        for i, solution in zip(selected, improved):
+            offspring[i] = solution
+        
+        # Avaliação (serial ou paralela)
+        self.evaluate_population(offspring)
         
         # Elitismo + controle de diversidade
         combined = self.population + offspring
@@ -584,33 +1865,82 @@ class ImprovedGeneticAlgorithm:
         
         # Preenche resto priorizando diversidade
         remaining = combined[self.elite_size:]
-        while len(new_population) < self.pop_size and remaining:
-            # Calcula diversidade média em relação aos já selecionados
-            for sol in remaining:
-                sol.diversity_score = np.mean([sol.calculate_diversity(s) for s in new_population])
-            
-            # Seleciona com peso em fitness + diversidade
-            weights = []
-            for sol in remaining:
-                fitness_score = 1.0 / (sol.fitness + 1)
-                diversity_bonus = sol.diversity_score
-                weights.append(fitness_score + diversity_bonus * 0.3)
-            
-            if sum(weights) == 0:
-                break
-            
-            probs = np.array(weights) / sum(weights)
-            selected = np.random.choice(remaining, p=probs)
-            new_population.append(selected)
-            remaining.remove(selected)
+        if len(new_population) < self.pop_size and remaining:
+            new_population.extend(self._select_diverse(
+                remaining, new_population, self.pop_size - len(new_population)))
         
         self.population = new_population[:self.pop_size]
         
         # Atualiza estatísticas
         self._update_best_solution()
-        self.best_fitness_history.append(self.best_solution.fitness)
-        avg_fitness = np.mean([s.fitness for s in self.population])
-        self.avg_fitness_history.append(avg_fitness)
+        avg_fitness = self._fitness_arr.mean()
+        self._record_history(self.best_solution.fitness, avg_fitness)
+    
+    def _select_diverse(self, remaining: List[Solution], selected: List[Solution],
+                        n: int) -> List[Solution]:
+        """
+        Sorteia até n soluções com peso em fitness + diversidade.
+        
+        A diversidade de um candidato é a média de calculate_diversity em
+        relação aos já selecionados. Em vez de recalcular todos os pares a
+        cada sorteio, mantém a soma por candidato e a atualiza, em lote
+        (sequence_diversity), apenas com a solução recém-selecionada.
+        Os candidatos ainda disponíveis são os `size` primeiros índices de
+        `candidates`; o sorteado é removido trocando-o pelo último (O(1)).
+        """
+        seqs, lengths = visit_sequences(remaining)
+        fitness_score = 1.0 / (np.array([s.fitness for s in remaining]) + 1)
+        
+        diversity_sum = np.zeros(len(remaining))
+        for solution in selected:
+            diversity_sum += sequence_diversity(seqs, lengths, solution)
+        
+        chosen = []
+        n_selected = len(selected)
+        candidates = np.arange(len(remaining))
+        size = len(remaining)
+        while len(chosen) < n and size:
+            available = candidates[:size]
+            diversity = diversity_sum[available] / n_selected
+            weights = fitness_score[available] + diversity * 0.3
+            
+            total = weights.sum()
+            if total == 0:
+                break
+            
+            k = roulette_index(weights)
+            solution = remaining[available[k]]
+            solution.diversity_score = diversity[k]
+            chosen.append(solution)
+            n_selected += 1
+            
+            size -= 1
+            candidates[k] = candidates[size]
+            diversity_sum += sequence_diversity(seqs, lengths, solution)
+        
+        return chosen
+    
+    def _record_history(self, best_fitness: float, avg_fitness: float):
+        """Registra as estatísticas da geração nos arrays pré-alocados."""
+        if self._n_history == len(self._best_history):
+            # Mais gerações que o previsto (evolve chamado externamente)
+            size = max(1, 2 * self._n_history)
+            self._best_history = np.resize(self._best_history, size)
+            self._avg_history = np.resize(self._avg_history, size)
+        
+        self._best_history[self._n_history] = best_fitness
+        self._avg_history[self._n_history] = avg_fitness
+        self._n_history += 1
+    
+    @property
+    def best_fitness_history(self) -> np.ndarray:
+        """Melhor fitness por geração (view dos registros até agora)."""
+        return self._best_history[:self._n_history]
+    
+    @property
+    def avg_fitness_history(self) -> np.ndarray:
+        """Fitness médio por geração (view dos registros até agora)."""
+        return self._avg_history[:self._n_history]
     
     def run(self) -> Solution:
         """Executa AG completo."""
@@ -627,24 +1957,32 @@ class ImprovedGeneticAlgorithm:
         
         self.initialize_population()
         
+        # Instância, clientes e kernels vivem o AG inteiro: congelados, as
+        # coletas completas do GC (disparadas pelas Solution/Vehicle de cada
+        # geração) deixam de percorrê-los a cada vez
+        gc.freeze()
+        
         print("Evoluindo população...")
         progress_bar = tqdm(range(self.generations), desc="Gerações")
         
-        for gen in progress_bar:
-            self.generation = gen
-            self.evolve()
-            
-            progress_bar.set_postfix({
-                'Melhor': f'{self.best_solution.fitness:.2f}',
-                'Dist': f'{self.best_solution.total_distance:.2f}',
-                'Veículos': self.best_solution.num_vehicles
-            })
-            
-            # Reinicialização se estagnado
-            if self.stagnation_counter >= self.max_stagnation:
-                print(f"\n⚠ Estagnação (gen {gen}). Reinicializando 50%...")
-                self._reinitialize_population()
-                self.stagnation_counter = 0
+        try:
+            for gen in progress_bar:
+                self.generation = gen
+                self.evolve()
+                
+                progress_bar.set_postfix({
+                    'Melhor': f'{self.best_solution.fitness:.2f}',
+                    'Dist': f'{self.best_solution.total_distance:.2f}',
+                    'Veículos': self.best_solution.num_vehicles
+                })
+                
+                # Reinicialização se estagnado
+                if self.stagnation_counter >= self.max_stagnation:
+                    print(f"\n⚠ Estagnação (gen {gen}). Reinicializando 50%...")
+                    self._reinitialize_population()
+                    self.stagnation_counter = 0
+        finally:
+            gc.unfreeze()
         
         print(f"\n{'='*70}")
         print("OTIMIZAÇÃO CONCLUÍDA")
@@ -662,10 +2000,11 @@ class ImprovedGeneticAlgorithm:
         """Reinicializa mantendo diversidade."""
         self.population.sort(key=lambda s: s.fitness)
         keep = self.pop_size // 2
+        self._fit_cache.clear()
         
         for i in range(self.pop_size - keep):
             if np.random.random() < 0.7:
-                base = np.random.choice(self.population[:keep])
+                base = self.population[np.random.randint(keep)]
                 new_solution = base.copy()
                 for _ in range(np.random.randint(2, 5)):
                     new_solution = self._apply_random_mutation(new_solution)
@@ -674,6 +2013,177 @@ class ImprovedGeneticAlgorithm:
                 new_solution = Solution(vehicles, self.instance)
             
             self.population.append(new_solution)
+        
+        self.evaluate_population(self.population)
+        self._refresh_fitness()
+    
+    def migrate(self, outbox, inbox, n_migrants: int):
+        """
+        Migração do modelo de ilhas (ver IslandGeneticAlgorithm).
+        
+        Envia os tours das n_migrants melhores soluções para a próxima ilha
+        e substitui as piores pelos migrantes recebidos da ilha anterior.
+        
+        Parameters:
+        -----------
+        outbox : multiprocessing.Queue
+            Fila de entrada da próxima ilha do anel
+        inbox : multiprocessing.Queue
+            Fila de entrada desta ilha
+        n_migrants : int
+            Número de soluções enviadas (e substituídas)
+        """
+        order = np.argsort(self._fitness_arr, kind='stable')
+        outbox.put([self.population[i].to_arrays()[0] for i in order[:n_migrants]])
+        
+        migrants = [Solution.from_arrays(tour, self.instance, evaluate=False)
+                    for tour in inbox.get()]
+        self.evaluate_population(migrants)
+        for i, migrant in zip(order[::-1], migrants):
+            self.population[i] = migrant
+        self._refresh_fitness()
+        
+        best_migrant = min(migrants, key=lambda s: s.fitness)
+        if best_migrant.fitness < self.best_solution.fitness:
+            self.best_solution = best_migrant.copy()
+            self.stagnation_counter = 0
+
+
+def _run_island(index: int, instance: VRPTWInstance, ga_kwargs: dict,
+                migration_interval: int, n_migrants: int,
+                inbox, outbox, results):
+    """
+    Evolui uma ilha (processo filho) e envia ao mestre o melhor tour e os
+    históricos. A saída do AG (prints e barras) é descartada.
+    """
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        ga = ImprovedGeneticAlgorithm(instance, **ga_kwargs)
+        ga.initialize_population()
+        gc.freeze()
+        
+        for gen in range(ga.generations):
+            ga.generation = gen
+            ga.evolve()
+            
+            if ga.stagnation_counter >= ga.max_stagnation:
+                ga._reinitialize_population()
+                ga.stagnation_counter = 0
+            
+            # Todas as ilhas migram nas mesmas gerações (anel síncrono)
+            if (gen + 1) % migration_interval == 0 and gen + 1 < ga.generations:
+                ga.migrate(outbox, inbox, n_migrants)
+    
+    results.put((index, ga.best_solution.to_arrays()[0],
+                 ga.best_fitness_history.copy(), ga.avg_fitness_history.copy()))
+
+
+class IslandGeneticAlgorithm:
+    """
+    AG paralelo multi-população (modelo de ilhas).
+    
+    Cada uma das n_islands ilhas roda em seu próprio processo um
+    ImprovedGeneticAlgorithm com pop_size / n_islands soluções. A cada
+    migration_interval gerações, cada ilha envia suas n_migrants melhores
+    soluções (tours) para a próxima do anel, que as coloca no lugar das
+    piores. Além de paralelizar os operadores genéticos (gargalo do modelo
+    mestre-escravo), o isolamento entre ilhas preserva diversidade.
+    
+    Expõe a mesma interface usada pelo pipeline: run(), best_solution e os
+    históricos (melhor fitness entre as ilhas e média dos fitness médios).
+    """
+    
+    def __init__(self, instance: VRPTWInstance,
+                 n_islands: int = 4,
+                 migration_interval: int = 10,
+                 n_migrants: int = 3,
+                 pop_size: int = 100,
+                 elite_size: int = 20,
+                 seed: int = 42,
+                 **ga_kwargs):
+        
+        self.instance = instance
+        self.n_islands = max(2, n_islands)
+        self.migration_interval = max(1, migration_interval)
+        
+        island_size = max(2, pop_size // self.n_islands)
+        self.n_migrants = max(1, min(n_migrants, island_size // 2))
+        self.seed = seed
+        self.ga_kwargs = dict(ga_kwargs,
+                              pop_size=island_size,
+                              elite_size=max(1, min(elite_size // self.n_islands,
+                                                    island_size - 1)))
+        
+        self.best_solution = None
+        self.island_fitness = []
+        self.best_fitness_history = np.empty(0)
+        self.avg_fitness_history = np.empty(0)
+    
+    def run(self) -> Solution:
+        """Executa as ilhas em paralelo e retorna a melhor solução global."""
+        print("\n" + "="*70)
+        print("ALGORITMO GENÉTICO - MODELO DE ILHAS")
+        print("="*70 + "\n")
+        
+        print(f"Configuração:")
+        print(f"  - Ilhas: {self.n_islands} x {self.ga_kwargs['pop_size']} soluções")
+        print(f"  - Migração: {self.n_migrants} melhores a cada "
+              f"{self.migration_interval} gerações (anel)\n")
+        
+        inboxes = [multiprocessing.Queue() for _ in range(self.n_islands)]
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(
+                target=_run_island,
+                args=(k, self.instance, dict(self.ga_kwargs, seed=self.seed + k),
+                      self.migration_interval, self.n_migrants,
+                      inboxes[k], inboxes[(k + 1) % self.n_islands], results),
+                daemon=True
+            )
+            for k in range(self.n_islands)
+        ]
+        for p in processes:
+            p.start()
+        
+        # Coleta antes do join (filhos só terminam após a fila ser consumida)
+        collected = {}
+        with tqdm(total=self.n_islands, desc="Ilhas") as progress_bar:
+            while len(collected) < self.n_islands:
+                try:
+                    index, tour, best_hist, avg_hist = results.get(timeout=1.0)
+                except queue.Empty:
+                    if any(p.exitcode not in (None, 0) for p in processes):
+                        for p in processes:
+                            p.terminate()
+                        raise RuntimeError("Uma ilha do AG terminou com erro")
+                    continue
+                collected[index] = (tour, best_hist, avg_hist)
+                progress_bar.update(1)
+        
+        for p in processes:
+            p.join()
+        
+        # Melhor solução global (reconstruída a partir do tour)
+        solutions = [Solution.from_arrays(collected[k][0], self.instance)
+                     for k in range(self.n_islands)]
+        self.island_fitness = [s.fitness for s in solutions]
+        self.best_solution = min(solutions, key=lambda s: s.fitness)
+        
+        self.best_fitness_history = np.min([collected[k][1] for k in range(self.n_islands)], axis=0)
+        self.avg_fitness_history = np.mean([collected[k][2] for k in range(self.n_islands)], axis=0)
+        
+        print(f"\n{'='*70}")
+        print("OTIMIZAÇÃO CONCLUÍDA")
+        print(f"{'='*70}\n")
+        print(f"✓ Melhor fitness por ilha: "
+              f"{', '.join(f'{f:.2f}' for f in self.island_fitness)}")
+        print(f"✓ Melhor solução:")
+        print(f"  - Fitness: {self.best_solution.fitness:.2f}")
+        print(f"  - Distância: {self.best_solution.total_distance:.2f}")
+        print(f"  - Veículos: {self.best_solution.num_vehicles}")
+        print(f"  - Factível: {self.best_solution.feasible}")
+        print(f"{'='*70}\n")
+        
+        return self.best_solution
 
 
 # Alias para compatibilidade
@@ -8,7 +8,305 @@ Implementa a heurística de inserção de Solomon para inicialização de soluç
 
 import numpy as np
 from typing import List, Tuple
-from src.utils import Customer, Vehicle, VRPTWInstance
+from src.utils import Customer, Vehicle, VRPTWInstance, njit, prange
+
+
+@njit(cache=True)
+def _insertion_feasible(route, u, pos, tt, tw_open, tw_close, service):
+    """
+    Viabilidade temporal da rota com u inserido em pos - kernel compilado.
+    
+    Percorre a rota (ids, 0 = depot) sobre os arrays da instância: nenhuma
+    chegada pode passar do fim da janela, inclusive o retorno ao depot.
+    """
+    n = route.shape[0]
+    current_time = 0.0
+    current_loc = 0
+    for idx in range(n + 1):
+        if idx < pos:
+            c = route[idx]
+        elif idx == pos:
+            c = u
+        else:
+            c = route[idx - 1]
+        
+        arrival_time = current_time + tt[current_loc, c]
+        if arrival_time > tw_close[c]:
+            return False
+        current_time = max(arrival_time, tw_open[c]) + service[c]
+        current_loc = c
+    
+    return current_time + tt[current_loc, 0] <= tw_close[0]
+
+
+@njit(cache=True)
+def _best_insertion(route, candidates, dist, tt, tw_open, tw_close, service,
+                    demand, capacity, load, alpha, mu, lambda_param, rank):
+    """
+    Melhor inserção (cliente, posição) em uma rota - kernel compilado.
+    
+    Equivalente a chamar find_best_insertion para cada candidato, operando
+    sobre arrays indexados como a matriz de distâncias (0 = depot); tt é a
+    matriz de tempos de viagem. `candidates` vem em ordem não crescente de
+    tw_close e custos iguais são desempatados pelo menor (rank, posição).
+    
+    Returns:
+    --------
+    Tuple[int, int, float]
+        (índice em candidates, posição, custo) ou (-1, -1, inf)
+    """
+    n = route.shape[0]
+    
+    # Agenda original, calculada uma vez: arrive[i]/depart[i] = chegada em
+    # route[i] e saída do ponto anterior (depart[0] = depot; arrive[n] =
+    # retorno ao depot) e first_late = primeira chegada atrasada; inserções
+    # depois dela nunca são viáveis
+    arrive = np.empty(n + 1)
+    depart = np.empty(n + 1)
+    depart[0] = 0.0
+    current_loc = 0
+    first_late = n
+    for i in range(n):
+        c = route[i]
+        arrive[i] = depart[i] + tt[current_loc, c]
+        if arrive[i] > tw_close[c] and first_late == n:
+            first_late = i
+        depart[i + 1] = max(arrive[i], tw_open[c]) + service[c]
+        current_loc = c
+    arrive[n] = depart[n] + tt[current_loc, 0]
+    
+    # tail_ok[i]: route[i:] e o retorno ao depot no horário (agenda original)
+    # max_delay[i]: maior atraso na chegada em route[i] que o resto da rota
+    # absorve (folga de Solomon: espera + janela, passada de trás para frente)
+    tail_ok = np.empty(n + 1, dtype=np.bool_)
+    max_delay = np.empty(n + 1)
+    tail_ok[n] = arrive[n] <= tw_close[0]
+    max_delay[n] = tw_close[0] - arrive[n]
+    for i in range(n - 1, -1, -1):
+        c = route[i]
+        tail_ok[i] = tail_ok[i + 1] and arrive[i] <= tw_close[c]
+        slack = max_delay[i + 1]
+        if slack >= 0.0:
+            slack += max(tw_open[c] - arrive[i], 0.0)
+        max_delay[i] = min(tw_close[c] - arrive[i], slack)
+    
+    # Perto da fronteira o teste O(1) pode arredondar diferente da
+    # simulação; nesses casos (e atrasos negativos) simula exatamente
+    tol = 1e-9 * (1.0 + abs(arrive[n]))
+    
+    # Termos por posição (colunas da grade cliente x posição), comuns a
+    # todos os candidatos: vizinhos de cada aresta e mu * d(prev, next)
+    prev_ids = np.empty(n + 1, dtype=np.int64)
+    next_ids = np.empty(n + 1, dtype=np.int64)
+    saved = np.empty(n + 1)
+    for pos in range(n + 1):
+        prev_ids[pos] = 0 if pos == 0 else route[pos - 1]
+        next_ids[pos] = 0 if pos >= n else route[pos]
+        saved[pos] = mu * dist[prev_ids[pos], next_ids[pos]]
+    
+    # A chegada em u na posição pos é pelo menos depart[pos] (não
+    # decrescente): só os candidatos com tw_close >= depart[pos], um prefixo
+    # de candidates, podem ser viáveis ali
+    neg_close = np.empty(candidates.shape[0])
+    for k in range(candidates.shape[0]):
+        neg_close[k] = -tw_close[candidates[k]]
+    
+    best_k = -1
+    best_pos = -1
+    best_cost = np.inf
+    
+    for pos in range(first_late + 1):
+        prev_c = prev_ids[pos]
+        next_c = next_ids[pos]
+        depart_prev = depart[pos]
+        
+        active = np.searchsorted(neg_close, -depart_prev, side='right')
+        for k in range(active):
+            u = candidates[k]
+            
+            # Verifica capacidade
+            if load + demand[u] > capacity:
+                continue
+            
+            arrival_u = depart_prev + tt[prev_c, u]
+            if arrival_u > tw_close[u]:
+                continue
+            
+            current_time = max(arrival_u, tw_open[u]) + service[u]
+            
+            # Push-forward (Solomon): atraso na chegada em route[pos]
+            delta = current_time + tt[u, next_c] - arrive[pos]
+            if delta >= tol and abs(delta - max_delay[pos]) > tol:
+                if delta > max_delay[pos]:
+                    continue
+            else:
+                # Propaga o atraso até a agenda reencontrar a original;
+                # daí em diante vale tail_ok
+                current_loc = u
+                j = pos
+                feasible = True
+                while True:
+                    if j == n:
+                        feasible = current_time + tt[current_loc, 0] <= tw_close[0]
+                        break
+                    c = route[j]
+                    arrival_time = current_time + tt[current_loc, c]
+                    if arrival_time > tw_close[c]:
+                        feasible = False
+                        break
+                    current_time = max(arrival_time, tw_open[c]) + service[c]
+                    current_loc = c
+                    j += 1
+                    if current_time == depart[j]:
+                        feasible = tail_ok[j]
+                        break
+                if not feasible:
+                    continue
+            
+            # c1: distância adicional
+            c1 = dist[prev_c, u] + dist[u, next_c] - saved[pos]
+            
+            # c2: urgência temporal (chegada em u)
+            c2 = tw_open[u] - arrival_u
+            
+            # Desempate igual ao da varredura por cliente: menor (rank, pos)
+            cost = alpha * c1 + lambda_param * c2
+            if cost < best_cost or (cost == best_cost and best_k >= 0
+                                     and rank[k] < rank[best_k]):
+                best_k = k
+                best_pos = pos
+                best_cost = cost
+    
+    return best_k, best_pos, best_cost
+
+
+@njit(cache=True)
+def _extend_route(route, load, unrouted, dist, tt, tw_open, tw_close, service,
+                  demand, capacity, alpha, mu, lambda_param):
+    """
+    Insere clientes de `unrouted` em uma rota já iniciada - kernel compilado.
+    
+    Insere, um por vez, o cliente/posição de menor custo (_best_insertion)
+    até nenhuma inserção ser viável. `unrouted` (ids) mantém a ordem
+    original, que desempata os custos iguais.
+    
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray, float, np.ndarray]
+        (ids da rota, ids ainda não roteados, carga, custo de inserção de
+        cada cliente da rota; -inf para os que já estavam nela)
+    """
+    m = unrouted.shape[0]
+    n = route.shape[0]
+    buffer = np.empty(n + m, dtype=np.int64)
+    costs = np.empty(n + m)
+    buffer[:n] = route
+    costs[:n] = -np.inf
+    
+    # Candidatos em ordem não crescente de tw_close (exigida por
+    # _best_insertion), com rank = posição original em unrouted para o
+    # desempate; remoções por deslocamento preservam as duas ordens
+    closes = np.empty(m)
+    for i in range(m):
+        closes[i] = -tw_close[unrouted[i]]
+    rank = np.argsort(closes, kind='mergesort')
+    remaining = unrouted[rank]
+    
+    while m > 0:
+        best_k, best_pos, best_cost = _best_insertion(
+            buffer[:n], remaining[:m], dist, tt, tw_open, tw_close, service,
+            demand, capacity, load, alpha, mu, lambda_param, rank[:m]
+        )
+        if best_k == -1:
+            break  # Não consegue inserir mais ninguém
+        
+        # Deslocamentos no próprio buffer (sem cópias temporárias)
+        u = remaining[best_k]
+        for i in range(n, best_pos, -1):
+            buffer[i] = buffer[i - 1]
+            costs[i] = costs[i - 1]
+        buffer[best_pos] = u
+        costs[best_pos] = best_cost
+        n += 1
+        load += demand[u]
+        for i in range(best_k, m - 1):
+            remaining[i] = remaining[i + 1]
+            rank[i] = rank[i + 1]
+        m -= 1
+    
+    # Não roteados de volta à ordem original
+    order = np.argsort(rank[:m])
+    return buffer[:n].copy(), remaining[:m][order], load, costs[:n].copy()
+
+
+@njit(cache=True)
+def _construct_route(unrouted, dist, tt, tw_open, tw_close, service, demand,
+                     capacity, alpha, mu, lambda_param):
+    """
+    Monta a rota de um veículo (I1 de Solomon) - kernel compilado.
+    
+    Semente = cliente não roteado mais distante do depot (o primeiro, em
+    caso de empate); depois a rota é estendida por _extend_route.
+    
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray, float]
+        (ids da rota, ids ainda não roteados, carga)
+    """
+    m = unrouted.shape[0]
+    seed = 0
+    seed_dist = dist[0, unrouted[0]]
+    for i in range(1, m):
+        d = dist[0, unrouted[i]]
+        if d > seed_dist:
+            seed = i
+            seed_dist = d
+    
+    others = np.empty(m - 1, dtype=np.int64)
+    others[:seed] = unrouted[:seed]
+    others[seed:] = unrouted[seed + 1:]
+    
+    route, remaining, load, _ = _extend_route(
+        unrouted[seed:seed + 1].copy(), 0.0 + demand[unrouted[seed]], others,
+        dist, tt, tw_open, tw_close, service, demand, capacity, alpha, mu,
+        lambda_param
+    )
+    return route, remaining, load
+
+
+@njit(parallel=True, cache=True)
+def _construct_routes_parallel(seeds, others, dist, tt, tw_open, tw_close,
+                               service, demand, capacity, alpha, mu,
+                               lambda_param):
+    """
+    Constrói uma rota por semente, em paralelo (prange) - kernel compilado.
+    
+    Cada rota parte da sua semente e disputa todos os clientes de `others`
+    (cópia privada por rota); os conflitos são resolvidos por quem chama.
+    
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        (rotas (K, len(others) + 1) em ids, custos de inserção no mesmo
+        formato, comprimentos das rotas)
+    """
+    n_routes = seeds.shape[0]
+    width = others.shape[0] + 1
+    routes = np.zeros((n_routes, width), dtype=np.int64)
+    costs = np.zeros((n_routes, width))
+    lengths = np.zeros(n_routes, dtype=np.int64)
+    
+    for r in prange(n_routes):
+        route, _, _, route_costs = _extend_route(
+            seeds[r:r + 1].copy(), 0.0 + demand[seeds[r]], others, dist, tt,
+            tw_open, tw_close, service, demand, capacity, alpha, mu,
+            lambda_param
+        )
+        lengths[r] = route.shape[0]
+        routes[r, :lengths[r]] = route
+        costs[r, :lengths[r]] = route_costs
+    
+    return routes, costs, lengths
 
 
 class SolomonInsertion:
@@ -20,7 +318,8 @@ class SolomonInsertion:
     """
     
     def __init__(self, instance: VRPTWInstance, alpha: float = 1.0, 
-                 mu: float = 1.0, lambda_param: float = 1.0):
+                 mu: float = 1.0, lambda_param: float = 1.0,
+                 parallel_seeds: int = 0):
         """
         Inicializa heurística de Solomon.
         
@@ -34,11 +333,16 @@ class SolomonInsertion:
             Peso para urgência temporal
         lambda_param : float
             Peso para penalização de tempo de espera
+        parallel_seeds : int
+            >1: as primeiras rotas (até esse número, uma por setor angular
+            em torno do depot) são construídas em paralelo (Numba prange);
+            0 = I1 sequencial
         """
         self.instance = instance
         self.alpha = alpha
         self.mu = mu
         self.lambda_param = lambda_param
+        self.parallel_seeds = parallel_seeds
     
     def calculate_c1(self, route: List[Customer], customer: Customer,
                      position: int, depot: Customer) -> float:
@@ -57,9 +361,10 @@ class SolomonInsertion:
         else:
             next_customer = route[position]
         
-        d_iu = prev_customer.distance_to(customer)
-        d_uj = customer.distance_to(next_customer)
-        d_ij = prev_customer.distance_to(next_customer)
+        dist = self.instance.dist
+        d_iu = dist[prev_customer.id, customer.id]
+        d_uj = dist[customer.id, next_customer.id]
+        d_ij = dist[prev_customer.id, next_customer.id]
         
         c1 = d_iu + d_uj - self.mu * d_ij
         return c1
@@ -73,11 +378,12 @@ class SolomonInsertion:
         onde b_u é o início da janela e t_i é o tempo de chegada.
         """
         # Calcula tempo de chegada no cliente u
+        tt = self.instance.tt
         current_time = 0.0
         current_loc = depot
         
         for idx in range(position):
-            travel_time = current_loc.distance_to(route[idx])
+            travel_time = tt[current_loc.id, route[idx].id]
             current_time += travel_time
             
             # Espera se necessário
@@ -88,7 +394,7 @@ class SolomonInsertion:
             current_loc = route[idx]
         
         # Tempo até o novo cliente
-        travel_time = current_loc.distance_to(customer)
+        travel_time = tt[current_loc.id, customer.id]
         arrival_time = current_time + travel_time
         
         c2 = customer.ready_time - arrival_time
@@ -113,63 +419,50 @@ class SolomonInsertion:
         """
         Encontra melhor posição para inserir cliente na rota.
         
+        Usa o kernel _best_insertion com um único candidato (depot = id 0
+        das matrizes da instância).
+        
         Returns:
         --------
         Tuple[int, float]
             (posição, custo) ou (-1, inf) se não for viável
         """
-        best_position = -1
-        best_cost = float('inf')
-        
-        # Tenta cada posição
-        for pos in range(len(route) + 1):
-            # Verifica capacidade
-            if current_load + customer.demand > vehicle_capacity:
-                continue
-            
-            # Verifica viabilidade temporal
-            if not self._is_feasible_insertion(route, customer, pos, depot):
-                continue
-            
-            # Calcula custo
-            cost = self.calculate_insertion_cost(route, customer, pos, depot)
-            
-            if cost < best_cost:
-                best_cost = cost
-                best_position = pos
-        
+        instance = self.instance
+        _, best_position, best_cost = _best_insertion(
+            self._route_ids(route),
+            np.array([customer.id], dtype=np.int64),
+            instance.dist,
+            instance.tt,
+            instance.tw_open,
+            instance.tw_close,
+            instance.service,
+            instance.demand,
+            vehicle_capacity,
+            current_load,
+            self.alpha,
+            self.mu,
+            self.lambda_param,
+            np.zeros(1, dtype=np.int64)
+        )
         return best_position, best_cost
     
     def _is_feasible_insertion(self, route: List[Customer], customer: Customer,
                             position: int, depot: Customer) -> bool:
         """
         Verifica se inserção é viável temporalmente COM VALIDAÇÃO RIGOROSA.
-        """
-        # Simula inserção e verifica restrições
-        test_route = route[:position] + [customer] + route[position:]
         
-        current_time = 0.0
-        current_loc = depot
-        
-        for c in test_route:
-            travel_time = current_loc.distance_to(c)
-            arrival_time = current_time + travel_time
-            
-            # VALIDAÇÃO RIGOROSA: Chegou tarde demais?
-            if arrival_time > c.due_time:
-                return False
-            
-            # Atualiza tempo (espera se necessário)
-            service_start = max(arrival_time, c.ready_time)
-            current_time = service_start + c.service_time
-            current_loc = c
-        
-        # Verifica retorno ao depot
-        return_time = current_time + current_loc.distance_to(depot)
-        if return_time > depot.due_time:
-            return False
-        
-        return True
+        Kernel _insertion_feasible sobre os arrays da instância (tt e
+        janelas de tempo indexadas pelo id; 0 = depot).
+        """
+        instance = self.instance
+        return _insertion_feasible(self._route_ids(route), customer.id, position,
+                                   instance.tt, instance.tw_open, instance.tw_close,
+                                   instance.service)
+    
+    @staticmethod
+    def _route_ids(route: List[Customer]) -> np.ndarray:
+        """ids da rota (int64), como os kernels esperam."""
+        return np.fromiter((c.id for c in route), dtype=np.int64, count=len(route))
     
     def construct_solution(self) -> List[Vehicle]:
         """
@@ -184,68 +477,37 @@ class SolomonInsertion:
         print("HEURÍSTICA DE SOLOMON - CONSTRUÇÃO DE SOLUÇÃO INICIAL")
         print("="*70 + "\n")
         
-        unrouted = self.instance.customers.copy()
+        # Rotas e clientes não roteados como arrays de ids (índices das
+        # matrizes); os Customer são montados só na rota final de cada veículo
+        unrouted = np.array([c.id for c in self.instance.customers], dtype=np.int64)
         vehicles = []
-        vehicle_id = 0
         
-        while unrouted and vehicle_id < self.instance.num_vehicles:
-            # Cria novo veículo
-            vehicle = Vehicle(
-                id=vehicle_id,
-                capacity=self.instance.vehicle_capacity
+        if self.parallel_seeds > 1 and unrouted.size:
+            routes, unrouted = self._parallel_routes(unrouted)
+            for route, load in routes:
+                vehicles.append(self._make_vehicle(len(vehicles), route, load))
+        
+        while unrouted.size and len(vehicles) < self.instance.num_vehicles:
+            # Semente + inserções sucessivas (kernel compilado)
+            route, unrouted, load = _construct_route(
+                unrouted,
+                self.instance.dist,
+                self.instance.tt,
+                self.instance.tw_open,
+                self.instance.tw_close,
+                self.instance.service,
+                self.instance.demand,
+                float(self.instance.vehicle_capacity),
+                self.alpha,
+                self.mu,
+                self.lambda_param
             )
-            
-            # Seleciona cliente inicial (mais distante do depot)
-            if unrouted:
-                seed_customer = max(unrouted, 
-                                   key=lambda c: self.instance.depot.distance_to(c))
-                vehicle.route.append(seed_customer)
-                vehicle.load += seed_customer.demand
-                unrouted.remove(seed_customer)
-            
-            # Insere clientes até não ser mais possível
-            while unrouted:
-                best_customer = None
-                best_position = -1
-                best_cost = float('inf')
-                
-                # Tenta inserir cada cliente não roteado
-                for customer in unrouted:
-                    position, cost = self.find_best_insertion(
-                        vehicle.route,
-                        customer,
-                        self.instance.depot,
-                        vehicle.capacity,
-                        vehicle.load
-                    )
-                    
-                    if position != -1 and cost < best_cost:
-                        best_customer = customer
-                        best_position = position
-                        best_cost = cost
-                
-                # Se encontrou inserção viável, adiciona
-                if best_customer is not None:
-                    vehicle.route.insert(best_position, best_customer)
-                    vehicle.load += best_customer.demand
-                    unrouted.remove(best_customer)
-                else:
-                    break  # Não consegue inserir mais ninguém
-            
-            # Calcula métricas do veículo
-            vehicle.calculate_metrics(self.instance.depot)
-            vehicles.append(vehicle)
-            
-            print(f"Veículo {vehicle_id}: {len(vehicle.route)} clientes, "
-                  f"carga={vehicle.load:.1f}/{vehicle.capacity:.1f}, "
-                  f"distância={vehicle.total_distance:.2f}")
-            
-            vehicle_id += 1
+            vehicles.append(self._make_vehicle(len(vehicles), route, load))
         
         # Verifica se todos foram roteados
-        if unrouted:
+        if unrouted.size:
             print(f"\n⚠ AVISO: {len(unrouted)} clientes não foram roteados!")
-            print(f"  Clientes não atendidos: {[c.id for c in unrouted]}")
+            print(f"  Clientes não atendidos: {unrouted.tolist()}")
         else:
             print(f"\n✓ Todos os {len(self.instance.customers)} clientes foram roteados!")
         
@@ -253,6 +515,110 @@ class SolomonInsertion:
         print("="*70 + "\n")
         
         return vehicles
+    
+    def _make_vehicle(self, vehicle_id: int, route: np.ndarray,
+                      load: float) -> Vehicle:
+        """Cria o veículo de uma rota (ids) e calcula suas métricas."""
+        vehicle = Vehicle(
+            id=vehicle_id,
+            capacity=self.instance.vehicle_capacity
+        )
+        vehicle.load = load
+        
+        # Calcula métricas do veículo
+        locations = self.instance.locations
+        vehicle.route = [locations[i] for i in route.tolist()]
+        vehicle.calculate_metrics(self.instance.depot, self.instance,
+                                  route.astype(np.int32))
+        
+        print(f"Veículo {vehicle_id}: {len(vehicle.route)} clientes, "
+              f"carga={vehicle.load:.1f}/{vehicle.capacity:.1f}, "
+              f"distância={vehicle.total_distance:.2f}")
+        return vehicle
+    
+    def _parallel_routes(self, unrouted: np.ndarray):
+        """
+        Fase paralela: uma rota por setor angular em torno do depot.
+        
+        A semente de cada setor é seu cliente mais distante do depot; as
+        rotas são construídas ao mesmo tempo (_construct_routes_parallel),
+        cada uma disputando todos os demais clientes. Um cliente inserido em
+        mais de uma rota fica com a de menor custo de inserção (empate: a
+        primeira) e sai das outras; em seguida, em série, cada rota é
+        completada com os clientes ainda livres.
+        
+        O kernel usa o pool de threads do Numba no processo atual; como em
+        device='numba', não deve rodar antes de um pool de processos criado
+        por fork (n_workers / n_islands). Os gráficos paralelos do PASSO 6
+        detectam isso (utils.numba_threads_started) e usam spawn.
+        
+        Returns:
+        --------
+        Tuple[List[Tuple[np.ndarray, float]], np.ndarray]
+            ([(ids da rota, carga)], ids ainda não roteados)
+        """
+        inst = self.instance
+        n_seeds = min(self.parallel_seeds, inst.num_vehicles, unrouted.size)
+        
+        # Setores angulares de mesma abertura; semente = mais distante
+        angles = np.arctan2(inst.ys[unrouted] - inst.ys[0],
+                            inst.xs[unrouted] - inst.xs[0])
+        sectors = np.minimum(((angles + np.pi) / (2 * np.pi) * n_seeds).astype(np.int64),
+                             n_seeds - 1)
+        far = inst.dist[0, unrouted]
+        seeds = []
+        for sector in range(n_seeds):
+            members = np.flatnonzero(sectors == sector)
+            if members.size:
+                seeds.append(members[np.argmax(far[members])])
+        
+        is_seed = np.zeros(unrouted.size, dtype=bool)
+        is_seed[seeds] = True
+        routes, costs, lengths = _construct_routes_parallel(
+            unrouted[seeds], unrouted[~is_seed], inst.dist, inst.tt,
+            inst.tw_open, inst.tw_close, inst.service, inst.demand,
+            float(inst.vehicle_capacity), self.alpha, self.mu, self.lambda_param
+        )
+        
+        # Conflitos: cada cliente fica com a rota de menor custo de inserção
+        owner = {}
+        for r in range(len(seeds)):
+            for u, cost in zip(routes[r, :lengths[r]].tolist(),
+                               costs[r, :lengths[r]].tolist()):
+                if u not in owner or cost < owner[u][0]:
+                    owner[u] = (cost, r)
+        
+        # Rotas sem os clientes perdidos; remover clientes só adianta as
+        # chegadas, mas a viabilidade é conferida (arredondamentos)
+        kept = []
+        for r in range(len(seeds)):
+            route = np.array([u for u in routes[r, :lengths[r]].tolist()
+                              if owner[u][1] == r], dtype=np.int64)
+            if _insertion_feasible(route[:-1], route[-1], len(route) - 1,
+                                   inst.tt, inst.tw_open, inst.tw_close,
+                                   inst.service):
+                kept.append(route)
+        
+        routed = np.concatenate(kept) if kept else np.empty(0, dtype=np.int64)
+        remaining = unrouted[~np.isin(unrouted, routed)]
+        
+        # Completa as rotas (em série) com os clientes ainda livres
+        result = []
+        for route in kept:
+            load = 0.0
+            for u in route.tolist():
+                load += inst.demand[u]
+            route, remaining, load, _ = _extend_route(
+                route, load, remaining, inst.dist, inst.tt, inst.tw_open,
+                inst.tw_close, inst.service, inst.demand,
+                float(inst.vehicle_capacity), self.alpha, self.mu,
+                self.lambda_param
+            )
+            result.append((route, load))
+        
+        print(f"⚙️ {len(result)} rotas construídas em paralelo "
+              f"({len(seeds)} setores)")
+        return result, remaining
 
 
 if __name__ == "__main__":
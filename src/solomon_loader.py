@@ -3,8 +3,8 @@ Solomon Benchmark Loader
 Author: Rafael Lopes Pinheiro
 """
 
-import requests
 import os
+import numpy as np
 from src.utils import Customer, VRPTWInstance
 
 
@@ -44,10 +44,14 @@ class SolomonBenchmarkLoader:
         os.makedirs(save_dir, exist_ok=True)
         filepath = os.path.join(save_dir, f'{name}.txt')
         
-        if os.path.exists(filepath):
+        if os.path.exists(filepath) or os.path.exists(SolomonBenchmarkLoader.cache_path(filepath)):
             print(f"✓ Instância {name} já existe: {filepath}")
             return filepath
         
+        # requests só é necessário para baixar (execuções seguintes usam o
+        # arquivo local ou o cache)
+        import requests
+        
         print(f"⬇ Baixando instância {name}...")
         url = SolomonBenchmarkLoader.INSTANCES[name]
         
@@ -61,7 +65,66 @@ class SolomonBenchmarkLoader:
         return filepath
     
     @staticmethod
-    def load_instance(filepath: str, max_customers: int = None) -> VRPTWInstance:
+    def cache_path(filepath: str) -> str:
+        """Caminho do cache binário (.npz) ao lado do arquivo texto."""
+        return os.path.splitext(filepath)[0] + '.npz'
+    
+    @staticmethod
+    def parse_file(filepath: str):
+        """
+        Lê o arquivo texto da instância, usando o cache .npz quando ele é
+        mais novo que o texto (ou o texto não existe mais).
+        
+        Na primeira leitura o texto é processado e o resultado gravado no
+        cache (np.savez sem compressão: carregar é só copiar os bytes).
+        
+        Returns:
+        --------
+        Tuple[str, int, float, np.ndarray]
+            (nome, número de veículos, capacidade, matriz (N, 7) com
+            id x y demand ready due service)
+        """
+        cache_file = SolomonBenchmarkLoader.cache_path(filepath)
+        if os.path.exists(cache_file) and (
+                not os.path.exists(filepath)
+                or os.path.getmtime(cache_file) >= os.path.getmtime(filepath)):
+            with np.load(cache_file) as cached:
+                print(f"✓ Instância carregada do cache: {cache_file}")
+                return (str(cached['name']), int(cached['num_vehicles']),
+                        float(cached['vehicle_capacity']), cached['data'])
+        
+        with open(filepath, 'r') as f:
+            lines = f.readlines()
+        
+        # Extrai nome da instância
+        instance_name = lines[0].strip()
+        
+        # Linha 5: NUMBER     CAPACITY
+        vehicle_info = lines[4].strip().split()
+        num_vehicles = int(vehicle_info[0])
+        vehicle_capacity = float(vehicle_info[1])
+        
+        # Clientes (linha 9 em diante) em um único parse: matriz (N, 7) com
+        # id x y demand ready due service (linhas em branco são ignoradas)
+        data = np.loadtxt(lines[9:], usecols=range(7), ndmin=2)
+        
+        try:
+            np.savez(cache_file, name=np.array(instance_name),
+                     num_vehicles=np.array(num_vehicles),
+                     vehicle_capacity=np.array(vehicle_capacity), data=data)
+        except OSError:
+            # Sem permissão de escrita, disco cheio...: segue sem cache e
+            # descarta um arquivo parcial (seria lido como cache válido)
+            try:
+                os.remove(cache_file)
+            except OSError:
+                pass
+        
+        return instance_name, num_vehicles, vehicle_capacity, data
+    
+    @staticmethod
+    def load_instance(filepath: str, max_customers: int = None,
+                      dtype=np.float64) -> VRPTWInstance:
         """
         Carrega instância Solomon de arquivo.
         
@@ -76,6 +139,13 @@ class SolomonBenchmarkLoader:
             Caminho do arquivo
         max_customers : int, optional
             Limitar número de clientes
+        dtype : numpy dtype, optional
+            Precisão dos arrays dos kernels; float32 monta a matriz já com
+            metade da memória. As distâncias são raízes quadradas
+            (Euclidianas), não valores de uma casa decimal: float32 guarda
+            ~7 dígitos significativos (erro relativo ~6e-8, cerca de 1e-5
+            em distâncias na casa das centenas); os kernels continuam
+            acumulando em float64
             
         Returns:
         --------
@@ -86,53 +156,29 @@ class SolomonBenchmarkLoader:
         print(f"CARREGANDO INSTÂNCIA SOLOMON: {os.path.basename(filepath)}")
         print(f"{'='*70}\n")
         
-        with open(filepath, 'r') as f:
-            lines = f.readlines()
-        
-        # Extrai nome da instância
-        instance_name = lines[0].strip()
+        instance_name, num_vehicles, vehicle_capacity, data = \
+            SolomonBenchmarkLoader.parse_file(filepath)
+        ids = data[:, 0].astype(np.int64)
         
-        # Linha 5: NUMBER     CAPACITY
-        vehicle_info = lines[4].strip().split()
-        num_vehicles = int(vehicle_info[0])
-        vehicle_capacity = float(vehicle_info[1])
+        # Limita número de clientes (o depot deve vir antes do corte)
+        customer_rows = np.flatnonzero(ids != 0)
+        if max_customers:
+            customer_rows = customer_rows[:max_customers]
+            if len(customer_rows) == max_customers:
+                data = data[:customer_rows[-1] + 1]
+                ids = ids[:customer_rows[-1] + 1]
         
-        # Clientes (linha 9 em diante)
-        customers = []
+        # Primeiro é o depot (id=0)
+        depot_rows = np.flatnonzero(ids == 0)
         depot_data = None
+        if len(depot_rows):
+            depot_data = Customer(0, *data[depot_rows[-1], 1:].tolist())
         
-        for i, line in enumerate(lines[9:], start=9):
-            parts = line.strip().split()
-            if len(parts) < 7:
-                continue
-            
-            cust_id = int(parts[0])
-            x = float(parts[1])
-            y = float(parts[2])
-            demand = float(parts[3])
-            ready_time = float(parts[4])
-            due_time = float(parts[5])
-            service_time = float(parts[6])
-            
-            customer = Customer(
-                id=cust_id,
-                x=x,
-                y=y,
-                demand=demand,
-                ready_time=ready_time,
-                due_time=due_time,
-                service_time=service_time
-            )
-            
-            # Primeiro é o depot (id=0)
-            if cust_id == 0:
-                depot_data = customer
-            else:
-                customers.append(customer)
-            
-            # Limita número de clientes
-            if max_customers and len(customers) >= max_customers:
-                break
+        customers = [
+            Customer(cust_id, *row)
+            for cust_id, row in zip(ids[customer_rows].tolist(),
+                                    data[customer_rows, 1:].tolist())
+        ]
         
         if depot_data is None:
             raise ValueError("Depot (customer 0) não encontrado no arquivo!")
@@ -148,14 +194,16 @@ class SolomonBenchmarkLoader:
             customers=customers,
             depot=depot_data,
             num_vehicles=num_vehicles,
-            vehicle_capacity=vehicle_capacity
+            vehicle_capacity=vehicle_capacity,
+            dtype=dtype
         )
         
         return instance
 
 
 # Função helper para main.py
-def load_solomon_instance(name: str = 'C101', max_customers: int = None) -> VRPTWInstance:
+def load_solomon_instance(name: str = 'C101', max_customers: int = None,
+                          dtype=np.float64) -> VRPTWInstance:
     """
     Baixa e carrega instância Solomon.
     
@@ -165,6 +213,8 @@ def load_solomon_instance(name: str = 'C101', max_customers: int = None) -> VRPT
         Nome da instância (C101, R101, RC101, etc.)
     max_customers : int, optional
         Limitar clientes (ex: 25, 50)
+    dtype : numpy dtype, optional
+        Precisão dos arrays dos kernels (float64 ou float32)
         
     Returns:
     --------
@@ -172,7 +222,7 @@ def load_solomon_instance(name: str = 'C101', max_customers: int = None) -> VRPT
     """
     loader = SolomonBenchmarkLoader()
     filepath = loader.download_instance(name)
-    instance = loader.load_instance(filepath, max_customers)
+    instance = loader.load_instance(filepath, max_customers, dtype)
     return instance
 
 
@@ -6,6 +6,7 @@ Based on: "Research on Vehicle Routing Problem with Time Windows Based on
           Improved Genetic Algorithm" (MDPI Electronics, 2025)
 """
 
+import math
 import numpy as np
 import pandas as pd
 import json
@@ -13,10 +14,147 @@ from typing import List, Dict, Tuple
 from datetime import datetime, timedelta
 import os
 
+# Numba é opcional: sem ele, os kernels rodam como Python puro
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """Substituto de numba.njit que apenas retorna a função original."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+def numba_threads_started() -> bool:
+    """
+    True se algum kernel paralelo (prange) já iniciou as threads do Numba.
+
+    Depois disso, um fork (ProcessPoolExecutor padrão no Linux) herda o
+    estado do pool de threads (TBB/OpenMP) e o processo pode não terminar:
+    novos pools de processos devem usar o contexto 'spawn'.
+    """
+    if not NUMBA_AVAILABLE:
+        return False
+    try:
+        from numba import threading_layer
+        threading_layer()
+    except ValueError:
+        return False
+    return True
+
+# SciPy é opcional: sem ele, a matriz de distâncias é calculada em NumPy
+try:
+    from scipy.spatial.distance import cdist
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+# Acima deste tamanho a matriz de distâncias gera um aviso
+MATRIX_WARNING_MB = 200
+
+# Vizinhos mais próximos por cliente (listas de vizinhança)
+NEIGHBORS_K = 20
+
+# Elementos por bloco da matriz de distâncias (~512 KB por temporário
+# float64, dentro da cache L2)
+DISTANCE_BLOCK_ELEMENTS = 65536
+
+
+@njit(cache=True)
+def _distance_matrix_kernel(xs, ys, out):
+    """
+    Matriz de distâncias Euclidianas em out (n x n) - kernel compilado.
+    
+    Linha a linha, sem temporários: o laço interno é contíguo e vetorizável
+    (escrever também out[j, i], aproveitando a simetria, é mais lento pelo
+    acesso por colunas). Mesma expressão e precisão (float64, sem fastmath)
+    de Customer.distance_to; serial de propósito, pois roda antes de o AG
+    criar o pool de processos (fork).
+    """
+    n = xs.shape[0]
+    for i in range(n):
+        xi = xs[i]
+        yi = ys[i]
+        for j in range(n):
+            dx = xi - xs[j]
+            dy = yi - ys[j]
+            out[i, j] = math.sqrt(dx * dx + dy * dy)
+
+
+@njit(cache=True)
+def _route_metrics(route, dist, tt, tw_open, tw_close, service, penalty):
+    """
+    Distância, tempo e penalização de uma rota (ids) - kernel compilado.
+    
+    Mesmas operações (e ordem das somas) de _evaluate_tour para um veículo;
+    `penalty` chega com a penalização de capacidade e recebe os atrasos.
+    """
+    n = route.shape[0]
+    if n == 0:
+        return 0.0, 0.0, penalty
+    
+    distance = 0.0
+    time = 0.0
+    prev = 0
+    for k in range(n):
+        c = route[k]
+        distance += dist[prev, c]
+        arrival = time + tt[prev, c]
+        if arrival > tw_close[c]:
+            penalty += (arrival - tw_close[c]) * 1000
+        time = max(arrival, tw_open[c]) + service[c]
+        prev = c
+    
+    distance += dist[prev, 0]
+    time += tt[prev, 0]
+    return distance, time, penalty
+
+
+@njit(cache=True)
+def _route_schedule(route, tt, tw_open, tw_close, service):
+    """
+    Cronograma de uma rota (ids) partindo do depot no instante 0 - kernel
+    compilado.
+    
+    Mesma recorrência de _route_metrics (chegada, max com a abertura da
+    janela, + serviço), em float64 e na mesma ordem das operações; devolve
+    por cliente a chegada, o início e o fim do atendimento, o atraso
+    (chegada após o fechamento da janela) e a espera.
+    """
+    n = route.shape[0]
+    arrival = np.empty(n)
+    start = np.empty(n)
+    end = np.empty(n)
+    late = np.empty(n, dtype=np.bool_)
+    wait = np.empty(n)
+    
+    time = 0.0
+    prev = 0
+    for k in range(n):
+        c = route[k]
+        a = time + tt[prev, c]
+        s = max(a, tw_open[c])
+        arrival[k] = a
+        start[k] = s
+        late[k] = a > tw_close[c]
+        wait[k] = s - a
+        time = s + service[c]
+        end[k] = time
+        prev = c
+    return arrival, start, end, late, wait
+
 
 class Customer:
     """Representa um cliente no problema VRPTW."""
     
+    __slots__ = ('id', 'x', 'y', 'demand', 'ready_time', 'due_time',
+                 'service_time')
+    
     def __init__(self, id: int, x: float, y: float, demand: float,
                  ready_time: float, due_time: float, service_time: float):
         self.id = id
@@ -28,8 +166,16 @@ class Customer:
         self.service_time = service_time
     
     def distance_to(self, other: 'Customer') -> float:
-        """Calcula distância Euclidiana para outro cliente."""
-        return np.sqrt((self.x - other.x)**2 + (self.y - other.y)**2)
+        """
+        Calcula distância Euclidiana para outro cliente.
+        
+        Usa math.sqrt (sem o despacho do np.sqrt para escalares) sobre a
+        mesma expressão da matriz de distâncias; math.hypot arredondaria
+        diferente. No caminho quente prefira instance.dist.
+        """
+        dx = self.x - other.x
+        dy = self.y - other.y
+        return math.sqrt(dx * dx + dy * dy)
     
     def __repr__(self):
         return f"Customer(id={self.id}, pos=({self.x:.2f},{self.y:.2f}), demand={self.demand})"
@@ -38,6 +184,9 @@ class Customer:
 class Vehicle:
     """Representa um veículo no problema VRPTW."""
     
+    __slots__ = ('id', 'capacity', 'max_route_time', 'route', 'load',
+                 'total_distance', 'total_time', 'ids', 'penalty', 'dirty')
+    
     def __init__(self, id: int, capacity: float, max_route_time: float = 480.0):
         self.id = id
         self.capacity = capacity
@@ -46,6 +195,12 @@ class Vehicle:
         self.load = 0.0
         self.total_distance = 0.0
         self.total_time = 0.0
+        
+        # Cache de calculate_metrics com instância (ids, penalização); dirty
+        # indica rota modificada desde o último cálculo
+        self.ids = None
+        self.penalty = 0.0
+        self.dirty = True
     
     def can_add_customer(self, customer: Customer, depot: Customer,
                         current_time: float) -> bool:
@@ -68,9 +223,46 @@ class Vehicle:
         """Adiciona cliente à rota."""
         self.route.append(customer)
         self.load += customer.demand
-    
-    def calculate_metrics(self, depot: Customer):
-        """Calcula métricas totais da rota."""
+        self.dirty = True
+    
+    def route_ids(self) -> np.ndarray:
+        """ids da rota (int32), do cache de calculate_metrics quando atualizado."""
+        if not self.dirty:
+            return self.ids
+        return np.fromiter((c.id for c in self.route), dtype=np.int32,
+                           count=len(self.route))
+    
+    def calculate_metrics(self, depot: Customer, instance: 'VRPTWInstance' = None,
+                          ids: np.ndarray = None):
+        """
+        Calcula métricas totais da rota.
+        
+        Com `instance`, distâncias e tempos vêm das matrizes pré-calculadas
+        (instance.dist / instance.tt) em vez de Customer.distance_to, e o
+        kernel _route_metrics também calcula a penalização (capacidade e
+        janelas de tempo). Os ids e a penalização ficam em cache para
+        Solution.calculate_fitness e Solution.to_arrays, até a próxima
+        modificação da rota (dirty).
+        
+        `ids` (int32, mesma sequência de self.route) evita reconstruí-los a
+        partir dos clientes quando quem chama já tem a rota em array (ex.:
+        uma fatia do tour gigante); o array não deve ser modificado depois.
+        """
+        if instance is not None:
+            if ids is None:
+                ids = np.fromiter((c.id for c in self.route), dtype=np.int32,
+                                  count=len(self.route))
+            self.ids = ids
+            capacity = instance.vehicle_capacity
+            penalty = (self.load - capacity) * 1000 if self.load > capacity else 0.0
+            self.total_distance, self.total_time, self.penalty = _route_metrics(
+                self.ids, instance.dist, instance.tt, instance.tw_open,
+                instance.tw_close, instance.service, penalty
+            )
+            self.dirty = False
+            return
+        
+        self.dirty = True
         if not self.route:
             self.total_distance = 0.0
             self.total_time = 0.0
@@ -79,11 +271,13 @@ class Vehicle:
         distance = 0.0
         time = 0.0
         
-        # Depot -> primeiro cliente
+        # Depot -> primeiro cliente (cada trecho calculado uma única vez,
+        # para distância e tempo)
         current = depot
         for customer in self.route:
-            distance += current.distance_to(customer)
-            time += current.distance_to(customer)
+            hop = current.distance_to(customer)
+            distance += hop
+            time += hop
             
             # Espera se chegar antes da janela
             if time < customer.ready_time:
@@ -94,8 +288,9 @@ class Vehicle:
             current = customer
         
         # Último cliente -> depot
-        distance += current.distance_to(depot)
-        time += current.distance_to(depot)
+        hop = current.distance_to(depot)
+        distance += hop
+        time += hop
         
         self.total_distance = distance
         self.total_time = time
@@ -105,34 +300,197 @@ class Vehicle:
         return f"Vehicle(id={self.id}, route={route_ids}, load={self.load:.1f}/{self.capacity})"
 
 
+def quantize_matrix(matrix: np.ndarray, resolution: float = 0.01) -> Tuple[np.ndarray, float]:
+    """
+    Quantiza uma matriz não negativa em int16.
+    
+    A escala é `resolution` (0.01 = 10 m para distâncias em km) ou maior, se
+    necessário para caber em int16. Cada entrada difere do valor original em
+    no máximo escala / 2.
+    
+    Returns:
+    --------
+    Tuple[np.ndarray, float]
+        (matriz int16, escala)
+    """
+    limit = np.iinfo(np.int16).max
+    scale = max(resolution, float(matrix.max(initial=0.0)) / limit)
+    return np.round(matrix / scale).astype(np.int16), scale
+
+
+def nearest_neighbors(matrix: np.ndarray, k: int = NEIGHBORS_K) -> np.ndarray:
+    """
+    Os k clientes mais próximos de cada localização (sem o depot e sem ela
+    mesma), do mais próximo ao mais distante.
+    
+    Returns:
+    --------
+    np.ndarray
+        Matriz (n, min(k, n - 2)) int32; a linha i lista os vizinhos do id i
+    """
+    n = len(matrix)
+    k = max(0, min(k, n - 2))
+    # Cópia no dtype da própria matriz (float32 ordena igual ao float64 dos
+    # mesmos valores, com metade da memória)
+    masked = matrix.copy()
+    masked[:, 0] = np.inf
+    np.fill_diagonal(masked, np.inf)
+    if k == 0:
+        return np.empty((n, 0), dtype=np.int32)
+    
+    # Seleção parcial (O(n²) em vez de ordenar as linhas inteiras): os
+    # candidatos são as entradas <= k-ésima menor distância da linha. Com
+    # empates nesse limite (mais de k candidatos), a linha é ordenada toda;
+    # o resultado é sempre o de argsort estável (empates pelo menor id).
+    kth = np.partition(masked, k - 1, axis=1)[:, k - 1:k]
+    selected = masked <= kth
+    counts = np.count_nonzero(selected, axis=1)
+    
+    neighbors = np.empty((n, k), dtype=np.int32)
+    exact = counts == k
+    if exact.any():
+        cols = np.nonzero(selected[exact])[1].reshape(-1, k)
+        order = np.argsort(np.take_along_axis(masked[exact], cols, axis=1),
+                           axis=1, kind='stable')
+        neighbors[exact] = np.take_along_axis(cols, order, axis=1)
+    for i in np.flatnonzero(~exact):
+        neighbors[i] = np.argsort(masked[i], kind='stable')[:k]
+    return neighbors
+
+
 class VRPTWInstance:
     """Instância do problema VRPTW."""
     
     def __init__(self, name: str, customers: List[Customer], 
-                 depot: Customer, num_vehicles: int, vehicle_capacity: float):
+                 depot: Customer, num_vehicles: int, vehicle_capacity: float,
+                 dtype=np.float64, speed: float = 1.0):
         self.name = name
         self.customers = customers
         self.depot = depot
         self.num_vehicles = num_vehicles
         self.vehicle_capacity = vehicle_capacity
+        self.dtype = np.dtype(dtype)
         
-        # Calcula matriz de distâncias
+        # Localizações indexadas como na matriz (0 = depot, i = cliente de id i)
+        self.locations = [depot] + customers
+        
+        # Atributos em arrays contíguos (SoA), usados pelos kernels
+        self.update_arrays()
+        
+        # Matriz de distâncias e derivadas (dist_q, neighbors)
+        self.update_distance_matrix()
+        
+        # Matriz de tempos de viagem (tt = dist / velocidade)
+        self.set_speed(speed)
+    
+    def update_arrays(self):
+        """(Re)constrói os arrays de coordenadas, demandas e janelas de tempo."""
+        locations = self.locations
+        self.coords = np.array([(c.x, c.y) for c in locations], dtype=np.float64).reshape(-1, 2)
+        self.xs = np.ascontiguousarray(self.coords[:, 0])
+        self.ys = np.ascontiguousarray(self.coords[:, 1])
+        self.demand = np.array([c.demand for c in locations], dtype=self.dtype)
+        self.tw_open = np.array([c.ready_time for c in locations], dtype=self.dtype)
+        self.tw_close = np.array([c.due_time for c in locations], dtype=self.dtype)
+        self.service = np.array([c.service_time for c in locations], dtype=self.dtype)
+    
+    def update_distance_matrix(self):
+        """
+        (Re)calcula a matriz de distâncias (em self.dtype) e as estruturas
+        derivadas dela, para que todas venham da mesma matriz que os kernels
+        leem.
+        """
         self.distance_matrix = self._calculate_distance_matrix()
+        self.dist = self.distance_matrix
+        
+        # Cópia quantizada (int16) para filtros rápidos nos kernels
+        self.dist_q, self.dist_scale = quantize_matrix(self.dist)
+        
+        # Listas de vizinhança (poda das buscas de inserção)
+        self.neighbors = nearest_neighbors(self.dist)
     
-    def _calculate_distance_matrix(self) -> np.ndarray:
-        """Calcula matriz de distâncias entre todos os pontos."""
-        n = len(self.customers) + 1  # +1 para depot
-        matrix = np.zeros((n, n))
+    def _calculate_distance_matrix(self, block_size: int = None) -> np.ndarray:
+        """
+        Calcula matriz de distâncias entre todos os pontos.
         
-        all_locations = [self.depot] + self.customers
+        Com Numba, usa o kernel _distance_matrix_kernel (escreve direto na
+        matriz, em qualquer dtype); sem Numba, cdist do SciPy (laço em C; em
+        float64 escreve direto na matriz) e, sem SciPy, NumPy vetorizado por
+        blocos de linhas (block_size x n; por padrão DISTANCE_BLOCK_ELEMENTS
+        / n linhas, para os temporários caberem na cache L2). Todos calculam
+        em float64, como Customer.distance_to, com resultados idênticos; o
+        resultado é simétrico e convertido para self.dtype.
+        """
+        xs, ys = self.xs, self.ys
+        n = len(xs)
+        if block_size is None:
+            block_size = max(1, DISTANCE_BLOCK_ELEMENTS // max(n, 1))
+        matrix = np.empty((n, n), dtype=self.dtype)
         
-        for i in range(n):
-            for j in range(n):
-                if i != j:
-                    matrix[i][j] = all_locations[i].distance_to(all_locations[j])
+        if NUMBA_AVAILABLE:
+            _distance_matrix_kernel(xs, ys, matrix)
+        elif SCIPY_AVAILABLE:
+            coords = np.column_stack((xs, ys))
+            if matrix.dtype == np.float64:
+                cdist(coords, coords, out=matrix)
+            else:
+                for start in range(0, n, block_size):
+                    stop = min(start + block_size, n)
+                    matrix[start:stop] = cdist(coords[start:stop], coords)
+        else:
+            for start in range(0, n, block_size):
+                stop = min(start + block_size, n)
+                dx = xs[start:stop, None] - xs[None, :]
+                dy = ys[start:stop, None] - ys[None, :]
+                dx *= dx
+                dy *= dy
+                dx += dy
+                matrix[start:stop] = np.sqrt(dx, out=dx)
+        
+        np.fill_diagonal(matrix, 0.0)
+        
+        size_mb = matrix.nbytes / 2**20
+        if size_mb > MATRIX_WARNING_MB:
+            print(f"⚠️  Matriz de distâncias ocupa {size_mb:.0f} MB ({n}x{n})")
         
         return matrix
     
+    def set_speed(self, speed: float):
+        """
+        Define a velocidade média e pré-calcula a matriz de tempos de viagem.
+        
+        Com velocidade 1.0 (padrão), tempo = distância e self.tt compartilha
+        a própria matriz de distâncias.
+        """
+        self.speed = float(speed)
+        if self.speed == 1.0:
+            self.tt = self.dist
+        else:
+            self.tt = (self.dist / self.speed).astype(self.dtype)
+    
+    def set_dtype(self, dtype):
+        """
+        Define a precisão dos arrays lidos pelos kernels (distâncias, tempos,
+        demandas e janelas de tempo).
+        
+        float32 reduz à metade a memória da matriz (relevante quando ela deixa
+        de caber na cache, a partir de algumas centenas de clientes); os
+        kernels continuam acumulando em float64. A matriz é recalculada a
+        partir das coordenadas, então voltar para float64 é exato.
+        """
+        dtype = np.dtype(dtype)
+        if dtype == self.dtype:
+            return
+        
+        self.dtype = dtype
+        self.update_arrays()
+        self.update_distance_matrix()
+        self.set_speed(self.speed)
+    
+    def get_travel_time(self, i: int, j: int) -> float:
+        """Retorna tempo de viagem entre dois pontos (0 = depot)."""
+        return self.tt[i][j]
+    
     def get_distance(self, i: int, j: int) -> float:
         """Retorna distância entre dois pontos (0 = depot)."""
         return self.distance_matrix[i][j]
@@ -250,6 +608,7 @@ def save_instance(instance: VRPTWInstance, filepath: str):
         'name': instance.name,
         'num_vehicles': instance.num_vehicles,
         'vehicle_capacity': instance.vehicle_capacity,
+        'speed': instance.speed,
         'depot': {
             'id': instance.depot.id,
             'x': instance.depot.x,
@@ -293,13 +652,65 @@ def load_instance(filepath: str) -> VRPTWInstance:
         customers=customers,
         depot=depot,
         num_vehicles=data['num_vehicles'],
-        vehicle_capacity=data['vehicle_capacity']
+        vehicle_capacity=data['vehicle_capacity'],
+        speed=data.get('speed', 1.0)
     )
     
     print(f"✓ Instância carregada: {instance}")
     return instance
 
 
+def save_instance_npz(instance: VRPTWInstance, filepath: str):
+    """
+    Salva instância VRPTW em formato binário (.npz) para cache.
+    
+    Os atributos dos clientes são gravados como arrays (linha 0 = depot),
+    evitando reprocessar o CSV original em execuções seguintes.
+    """
+    locations = instance.locations
+    
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    np.savez_compressed(
+        filepath,
+        name=np.array(instance.name),
+        num_vehicles=np.array(instance.num_vehicles),
+        vehicle_capacity=np.array(instance.vehicle_capacity),
+        speed=np.array(instance.speed),
+        ids=np.array([c.id for c in locations]),
+        x=np.array([c.x for c in locations], dtype=np.float64),
+        y=np.array([c.y for c in locations], dtype=np.float64),
+        demand=np.array([c.demand for c in locations], dtype=np.float64),
+        ready_time=np.array([c.ready_time for c in locations], dtype=np.float64),
+        due_time=np.array([c.due_time for c in locations], dtype=np.float64),
+        service_time=np.array([c.service_time for c in locations], dtype=np.float64)
+    )
+    
+    print(f"✓ Instância salva em cache: {filepath}")
+
+
+def load_instance_npz(filepath: str) -> VRPTWInstance:
+    """Carrega instância VRPTW salva por save_instance_npz."""
+    with np.load(filepath) as data:
+        locations = [
+            Customer(int(i), float(x), float(y), float(q), float(a), float(b), float(s))
+            for i, x, y, q, a, b, s in zip(data['ids'], data['x'], data['y'],
+                                           data['demand'], data['ready_time'],
+                                           data['due_time'], data['service_time'])
+        ]
+        
+        instance = VRPTWInstance(
+            name=str(data['name']),
+            customers=locations[1:],
+            depot=locations[0],
+            num_vehicles=int(data['num_vehicles']),
+            vehicle_capacity=float(data['vehicle_capacity']),
+            speed=float(data['speed'])
+        )
+    
+    print(f"✓ Instância carregada do cache: {instance}")
+    return instance
+
+
 def create_directories():
     """Cria estrutura de diretórios do projeto."""
     dirs = [
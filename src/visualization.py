@@ -4,25 +4,170 @@ Author: Rafael Lopes Pinheiro
 Date: 2025-11-18
 """
 
-import matplotlib.pyplot as plt
-import seaborn as sns
+# matplotlib e seaborn (~1.5 s de importação) são importados nos métodos:
+# importar este módulo (main.py, workers MPI) não os carrega sem plotar
 import numpy as np
 from typing import List
 import os
 
 # Importa apenas o necessário de utils
-from src.utils import VRPTWInstance
+from src.utils import VRPTWInstance, NUMBA_AVAILABLE, _route_schedule
+
+
+# Pontos máximos por série do gráfico de convergência (a figura tem ~2400
+# pixels de largura por eixo a 300 dpi; acima disso, reduz por blocos)
+CONVERGENCE_MAX_POINTS = 2000
+
+# Resolução padrão dos gráficos salvos (a exibição na tela não é afetada);
+# o custo do Agg cresce com o número de pixels, então 300 dpi (publicação)
+# custa ~4x mais que 150
+SAVE_DPI = 150
+
+# Acima deste número de esperas, o gráfico de janelas de tempo não rotula
+# cada uma (a contagem vai para a legenda)
+WAIT_LABELS_MAX = 20
+
+
+def _downsample(values: np.ndarray, max_points: int = CONVERGENCE_MAX_POINTS):
+    """
+    Reduz uma série longa preservando os extremos.
+    
+    Divide a série em max_points // 2 blocos consecutivos e mantém, de cada
+    um, o mínimo e o máximo (na ordem em que ocorrem), além do primeiro e
+    do último ponto; picos e os valores inicial e final continuam visíveis.
+    
+    Parameters:
+    -----------
+    values : np.ndarray
+        Série indexada pela geração
+    max_points : int
+        Número máximo de pontos mantidos
+    
+    Returns:
+    --------
+    tuple
+        (gerações, valores) dos pontos mantidos
+    """
+    n = values.size
+    if n <= max_points:
+        return np.arange(n), values
+    
+    edges = np.linspace(0, n, max_points // 2 + 1).astype(np.intp)
+    keep = [0, n - 1]
+    for start, stop in zip(edges[:-1].tolist(), edges[1:].tolist()):
+        block = values[start:stop]
+        keep += [start + int(block.argmin()), start + int(block.argmax())]
+    
+    keep = np.unique(keep)
+    return keep, values[keep]
 
 
 class VRPTWVisualizer:
     """Classe para visualização de soluções VRPTW."""
     
-    def __init__(self, instance: VRPTWInstance):
+    def __init__(self, instance: VRPTWInstance, show: bool = None):
+        """
+        Parameters:
+        -----------
+        instance : VRPTWInstance
+            Instância do problema
+        show : bool, optional
+            Exibe as figuras (plt.show). Por padrão (None), exibe apenas as
+            que não são salvas (sem save_path). Figuras não exibidas são
+            criadas fora do pyplot (matplotlib.figure.Figure) e apenas salvas,
+            sem backend gráfico nem estado compartilhado entre chamadas. Isso
+            não as torna paralelas: o Agg e o kernel _route_schedule (serial,
+            sem nogil) mantêm o GIL, por isso main.py renderiza em processos.
+        """
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
         self.instance = instance
+        self.show = show
         sns.set_style("whitegrid")
         self.colors = plt.cm.tab20.colors
+        self._palettes = {'tab20': np.asarray(self.colors),
+                          'tab10': np.asarray(plt.cm.tab10.colors)}
+        self._id_labels = [str(c.id) for c in instance.customers]
+    
+    def _vehicle_colors(self, n: int, palette: str = 'tab20') -> np.ndarray:
+        """Cores RGB (n x 3) dos veículos 0..n-1, ciclando a paleta."""
+        base = self._palettes[palette]
+        return base[np.arange(n) % len(base)]
+    
+    def _shows(self, save_path: str) -> bool:
+        """Indica se a figura de um gráfico será exibida."""
+        return not save_path if self.show is None else self.show
+    
+    def _subplots(self, show: bool, *args, **kwargs):
+        """Cria figura e eixos (registrada no pyplot apenas se for exibida)."""
+        if show:
+            import matplotlib.pyplot as plt
+            return plt.subplots(*args, **kwargs)
+        
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=kwargs.pop('figsize', None))
+        return fig, fig.subplots(*args, **kwargs)
+    
+    def _finish(self, fig, show: bool):
+        """
+        Exibe a figura do pyplot e a fecha em seguida (sem exibição, nada a
+        fazer: a Figure fora do pyplot é liberada junto com a referência).
+        
+        Sem fechar, o pyplot mantém todas as figuras (com seus artistas)
+        vivas; com backend não interativo (Agg), plt.show() retorna sem
+        fechar nada. No modo interativo (plt.ion) a janela continua aberta.
+        """
+        if show:
+            import matplotlib.pyplot as plt
+            plt.show()
+            if not plt.isinteractive():
+                plt.close(fig)
+    
+    def _route_times(self, ids: np.ndarray):
+        """
+        Cronograma de uma rota partindo do depot no instante 0, sem laço Python.
+        
+        O início de atendimento segue s_i = max(ready_i, s_{i-1} + serviço_{i-1}
+        + viagem_i). Com Numba, a recorrência roda no kernel _route_schedule
+        (exata, na ordem sequencial; kernel serial, sem parallel/prange, que
+        não inicia as threads do Numba e pode rodar antes de um fork). Sem Numba, é resolvida em NumPy: com
+        c_i = chegada acumulada sem esperas (soma prefixada de viagens e
+        serviços), s_i = c_i + W_i, onde W_i = max(0, máx_{j<=i} ready_j - c_j)
+        é a espera acumulada (np.maximum.accumulate).
+        
+        Parameters:
+        -----------
+        ids : np.ndarray
+            ids dos clientes da rota (índices dos arrays da instância)
+        
+        Returns:
+        --------
+        tuple
+            (chegada, início, fim do atendimento, atrasado, espera), arrays
+            float64 (atrasado: bool) na ordem da rota
+        """
+        instance = self.instance
+        if NUMBA_AVAILABLE:
+            return _route_schedule(ids, instance.tt, instance.tw_open,
+                                   instance.tw_close, instance.service)
+        
+        ids = np.asarray(ids, dtype=np.intp)
+        prev = np.concatenate(([0], ids[:-1]))
+        travel = instance.tt[prev, ids].astype(np.float64)
+        ready = instance.tw_open[ids].astype(np.float64)
+        due = instance.tw_close[ids].astype(np.float64)
+        service = instance.service[ids].astype(np.float64)
+        
+        offset = np.cumsum(travel + np.concatenate(([0.0], service[:-1])))
+        waited = np.maximum.accumulate(np.maximum(ready - offset, 0.0))
+        arrival = offset + np.concatenate(([0.0], waited[:-1]))
+        start = offset + waited
+        
+        return arrival, start, start + service, arrival > due, start - arrival
     
-    def plot_solution(self, solution, save_path: str = None, title: str = "Solução VRPTW"):
+    def plot_solution(self, solution, save_path: str = None, title: str = "Solução VRPTW",
+                      dpi: int = SAVE_DPI):
         """
         Plota solução do VRPTW.
         
@@ -34,42 +179,64 @@ class VRPTWVisualizer:
             Caminho para salvar figura
         title : str
             Título do gráfico
+        dpi : int
+            Resolução da figura salva
         """
-        fig, ax = plt.subplots(figsize=(14, 10))
+        from matplotlib.collections import LineCollection
+        from matplotlib.lines import Line2D
+        
+        show = self._shows(save_path)
+        fig, ax = self._subplots(show, figsize=(14, 10))
+        
+        # Coordenadas SoA da instância (linha 0 = depot)
+        coords = self.instance.coords
         
         # Plota depot
-        ax.scatter(self.instance.depot.x, self.instance.depot.y, 
+        ax.scatter(coords[0, 0], coords[0, 1], 
                   c='red', s=400, marker='s', label='Depot', 
                   zorder=10, edgecolors='black', linewidth=2)
         
         # Plota clientes
-        customer_x = [c.x for c in self.instance.customers]
-        customer_y = [c.y for c in self.instance.customers]
-        ax.scatter(customer_x, customer_y, c='lightblue', s=200, 
+        ax.scatter(coords[1:, 0], coords[1:, 1], c='lightblue', s=200, 
                   marker='o', label='Clientes', zorder=5,
                   edgecolors='black', linewidth=1)
         
-        # Anota IDs dos clientes
-        for customer in self.instance.customers:
-            ax.annotate(str(customer.id), (customer.x, customer.y),
-                       ha='center', va='center', fontsize=8, fontweight='bold')
-        
-        # Plota rotas de cada veículo
+        # Anota IDs dos clientes (Text simples: sem a seta/coordenadas extras
+        # de annotate; rótulos formatados uma única vez)
+        for x, y, label in zip(coords[1:, 0].tolist(), coords[1:, 1].tolist(),
+                               self._id_labels):
+            ax.text(x, y, label, ha='center', va='center',
+                    fontsize=8, fontweight='bold')
+        
+        # Plota rotas de cada veículo: uma LineCollection (linhas) e um
+        # scatter (marcadores) para todos; a legenda usa handles sem dados
+        vehicle_colors = self._vehicle_colors(len(solution.vehicles))
+        routes, drawn, vehicle_handles = [], [], []
         for idx, vehicle in enumerate(solution.vehicles):
             if not vehicle.route:
                 continue
             
-            color = self.colors[idx % len(self.colors)]
-            
-            # Depot -> primeiro cliente
-            route = [self.instance.depot] + vehicle.route + [self.instance.depot]
+            color = vehicle_colors[idx]
             
-            x_coords = [loc.x for loc in route]
-            y_coords = [loc.y for loc in route]
-            
-            ax.plot(x_coords, y_coords, c=color, linewidth=2, 
-                   alpha=0.7, marker='o', markersize=4,
-                   label=f'Veículo {vehicle.id} (dist={vehicle.total_distance:.1f})')
+            # Depot -> clientes -> depot (ids = linhas de coords)
+            routes.append(coords[np.concatenate(([0], vehicle.route_ids(), [0]))])
+            drawn.append(idx)
+            vehicle_handles.append(Line2D(
+                [], [], color=color, linewidth=2, alpha=0.7, marker='o',
+                markersize=4,
+                label=f'Veículo {vehicle.id} (dist={vehicle.total_distance:.1f})'))
+        
+        if routes:
+            route_colors = vehicle_colors[drawn]
+            ax.add_collection(LineCollection(routes, colors=route_colors,
+                                             linewidths=2, alpha=0.7,
+                                             capstyle='projecting',
+                                             joinstyle='round'))
+            points = np.concatenate(routes)
+            point_colors = np.repeat(route_colors,
+                                     [len(route) for route in routes], axis=0)
+            ax.scatter(points[:, 0], points[:, 1], s=16, c=point_colors,
+                       alpha=0.7, zorder=2)
         
         ax.set_xlabel('Coordenada X', fontsize=12)
         ax.set_ylabel('Coordenada Y', fontsize=12)
@@ -79,21 +246,27 @@ class VRPTWVisualizer:
                     f'Fitness: {solution.fitness:.2f}',
                     fontsize=14, fontweight='bold')
         
-        ax.legend(loc='upper left', bbox_to_anchor=(1, 1), fontsize=9)
+        handles, _ = ax.get_legend_handles_labels()
+        ax.legend(handles=handles + vehicle_handles,
+                  loc='upper left', bbox_to_anchor=(1, 1), fontsize=9)
         ax.grid(True, alpha=0.3)
         
-        plt.tight_layout()
+        # Eixo único: ao salvar, bbox_inches='tight' já enquadra todos os
+        # artistas (inclusive a legenda externa); tight_layout, que mede
+        # todos eles em uma passada extra, só é necessário para exibir
+        if show:
+            fig.tight_layout()
         
         if save_path:
             os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
             print(f"✓ Gráfico salvo em: {save_path}")
         
-        plt.show()
+        self._finish(fig, show)
     
     def plot_convergence(self, best_fitness_history: List[float],
                         avg_fitness_history: List[float],
-                        save_path: str = None):
+                        save_path: str = None, dpi: int = SAVE_DPI):
         """
         Plota convergência do algoritmo genético.
         
@@ -105,15 +278,23 @@ class VRPTWVisualizer:
             Histórico do fitness médio
         save_path : str, optional
             Caminho para salvar figura
+        dpi : int
+            Resolução da figura salva
         """
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+        show = self._shows(save_path)
+        fig, (ax1, ax2) = self._subplots(show, 1, 2, figsize=(16, 6))
         
-        generations = range(len(best_fitness_history))
+        # Históricos como arrays; séries longas reduzidas a
+        # CONVERGENCE_MAX_POINTS pontos (mínimos e máximos por bloco)
+        best = np.asarray(best_fitness_history, dtype=np.float64)
+        avg = np.asarray(avg_fitness_history, dtype=np.float64)
+        generations, best = _downsample(best)
+        avg_generations, avg = _downsample(avg)
         
         # Gráfico 1: Fitness
-        ax1.plot(generations, best_fitness_history, 'b-', linewidth=2, 
+        ax1.plot(generations, best, 'b-', linewidth=2, 
                 label='Melhor Fitness')
-        ax1.plot(generations, avg_fitness_history, 'r--', linewidth=2, 
+        ax1.plot(avg_generations, avg, 'r--', linewidth=2, 
                 label='Fitness Médio', alpha=0.7)
         ax1.set_xlabel('Geração', fontsize=12)
         ax1.set_ylabel('Fitness', fontsize=12)
@@ -122,9 +303,8 @@ class VRPTWVisualizer:
         ax1.grid(True, alpha=0.3)
         
         # Gráfico 2: Melhoria percentual
-        if len(best_fitness_history) > 1:
-            initial = best_fitness_history[0]
-            improvement = [(initial - f) / initial * 100 for f in best_fitness_history]
+        if best.size > 1:
+            improvement = (best[0] - best) / best[0] * 100
             
             ax2.plot(generations, improvement, 'g-', linewidth=2)
             ax2.set_xlabel('Geração', fontsize=12)
@@ -134,17 +314,17 @@ class VRPTWVisualizer:
             ax2.grid(True, alpha=0.3)
             ax2.axhline(y=0, color='black', linestyle='--', linewidth=1, alpha=0.5)
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         if save_path:
             os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
             print(f"✓ Gráfico de convergência salvo em: {save_path}")
         
-        plt.show()
+        self._finish(fig, show)
     
     def plot_comparison(self, solutions: List, labels: List[str],
-                       save_path: str = None):
+                       save_path: str = None, dpi: int = SAVE_DPI):
         """
         Compara múltiplas soluções.
         
@@ -156,8 +336,11 @@ class VRPTWVisualizer:
             Rótulos para cada solução
         save_path : str, optional
             Caminho para salvar figura
+        dpi : int
+            Resolução da figura salva
         """
-        fig, axes = plt.subplots(1, 3, figsize=(18, 5))
+        show = self._shows(save_path)
+        fig, axes = self._subplots(show, 1, 3, figsize=(18, 5))
         
         distances = [s.total_distance for s in solutions]
         vehicles = [s.num_vehicles for s in solutions]
@@ -184,88 +367,91 @@ class VRPTWVisualizer:
         axes[2].tick_params(axis='x', rotation=45)
         axes[2].grid(axis='y', alpha=0.3)
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         if save_path:
             os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
             print(f"✓ Gráfico de comparação salvo em: {save_path}")
         
-        plt.show()
+        self._finish(fig, show)
     
-    def plot_time_windows(self, solution, save_path: str = None):
+    def plot_time_windows(self, solution, save_path: str = None, dpi: int = SAVE_DPI):
         """
         Visualização MELHORADA e COMPACTA das janelas de tempo.
         VERSÃO FINAL: Tamanho otimizado e centralizado.
         """
-        # Calcula estatísticas para ajustar escala
-        all_ready_times = [c.ready_time for v in solution.vehicles for c in v.route]
-        all_due_times = [c.due_time for v in solution.vehicles for c in v.route]
-        
-        min_time = min(all_ready_times) if all_ready_times else 0
-        max_time = max(all_due_times) if all_due_times else 480
+        # Calcula estatísticas para ajustar escala (janelas dos clientes
+        # visitados, lidas dos arrays da instância)
+        route_ids = [v.route_ids() if v.route else None for v in solution.vehicles]
+        visited = [ids for ids in route_ids if ids is not None]
+        if visited:
+            visited = np.concatenate(visited)
+            min_time = float(self.instance.tw_open[visited].min())
+            max_time = float(self.instance.tw_close[visited].max())
+        else:
+            min_time, max_time = 0, 480
         
         # Adiciona margem de 5%
         time_range = max_time - min_time
         min_time = max(0, min_time - time_range * 0.05)
         max_time = min(480, max_time + time_range * 0.05)
         
+        from matplotlib.collections import LineCollection, PolyCollection
+        from matplotlib.lines import Line2D
+        from matplotlib.patches import Patch
+        
         # TAMANHO REDUZIDO (era 20x14)
-        fig, ax = plt.subplots(figsize=(16, 10))
+        show = self._shows(save_path)
+        fig, ax = self._subplots(show, figsize=(16, 10))
         
         y_pos = 0
         vehicle_data = []
-        colors = plt.cm.tab10.colors
+        colors = self._vehicle_colors(len(solution.vehicles), 'tab10')
         
         # Estatísticas de violações
         total_violations = 0
         total_customers = 0
         
+        # Artistas acumulados e desenhados como coleções ao final (um único
+        # artista por tipo em vez de um barh/plot por cliente)
+        window_verts = []
+        service_segs, service_colors, service_lws = [], [], []
+        marker_xy, marker_colors, marker_sizes = [], [], []
+        wait_segs, wait_labels = [], []
+        late_xy = []
+        
         for v_idx, vehicle in enumerate(solution.vehicles):
             if not vehicle.route:
                 continue
             
-            color = colors[v_idx % len(colors)]
+            color = colors[v_idx]
             vehicle_start_y = y_pos
             
-            current_time = 0.0
-            current_loc = self.instance.depot
+            # Cronograma da rota (tempos de viagem da instância)
+            arrival, start, end, late, wait = self._route_times(route_ids[v_idx])
+            violations_in_vehicle = int(late.sum())
+            total_violations += violations_in_vehicle
+            total_customers += len(vehicle.route)
             
-            violations_in_vehicle = 0
-            
-            for customer in vehicle.route:
-                total_customers += 1
-                travel_time = current_loc.distance_to(customer)
-                arrival_time = current_time + travel_time
-                
+            for customer, arrival_time, service_start, service_end, is_late, wait_time in zip(
+                    vehicle.route, arrival.tolist(), start.tolist(), end.tolist(),
+                    late.tolist(), wait.tolist()):
                 # Janela de tempo (barra azul)
-                window_width = customer.due_time - customer.ready_time
-                ax.barh(y_pos, window_width, 
-                    left=customer.ready_time, 
-                    height=0.7,
-                    color='lightblue', 
-                    alpha=0.6, 
-                    edgecolor='blue',
-                    linewidth=2)
-                
-                # Tempo de atendimento
-                service_start = max(arrival_time, customer.ready_time)
-                service_end = service_start + customer.service_time
+                y_low, y_high = y_pos - 0.35, y_pos + 0.35
+                window_verts.append(((customer.ready_time, y_low),
+                                     (customer.due_time, y_low),
+                                     (customer.due_time, y_high),
+                                     (customer.ready_time, y_high)))
                 
                 # VERIFICA VIOLAÇÃO
-                is_late = arrival_time > customer.due_time
-                
                 if is_late:
-                    violations_in_vehicle += 1
-                    total_violations += 1
                     marker_color = 'red'
                     line_color = 'red'
                     linewidth = 7
                     markersize = 12
-                    # X vermelho
-                    ax.text(arrival_time, y_pos, '❌', 
-                        fontsize=14, ha='center', va='center',
-                        color='red', fontweight='bold')
+                    # X vermelho (marcador na chegada)
+                    late_xy.append((arrival_time, y_pos))
                 else:
                     marker_color = color
                     line_color = color
@@ -273,16 +459,12 @@ class VRPTWVisualizer:
                     markersize = 9
                 
                 # Linha de atendimento
-                ax.plot([service_start, service_end], 
-                    [y_pos, y_pos], 
-                    color=line_color,
-                    linewidth=linewidth,
-                    marker='o',
-                    markersize=markersize,
-                    markerfacecolor=marker_color,
-                    markeredgecolor='black',
-                    markeredgewidth=1.5,
-                    alpha=0.9)
+                service_segs.append(((service_start, y_pos), (service_end, y_pos)))
+                service_colors.append(line_color)
+                service_lws.append(linewidth)
+                marker_xy += [(service_start, y_pos), (service_end, y_pos)]
+                marker_colors += [marker_color, marker_color]
+                marker_sizes += [markersize ** 2] * 2
                 
                 # Label do cliente (à direita da janela)
                 label_x = customer.due_time + time_range * 0.01
@@ -295,30 +477,16 @@ class VRPTWVisualizer:
                                 alpha=0.8))
                 
                 # CORRIGIDO: Marca tempo de espera DENTRO da visualização
-                if arrival_time < customer.ready_time:
-                    wait_time = customer.ready_time - arrival_time
+                if wait_time > 0:
                     # Posiciona ACIMA da linha, dentro do gráfico
                     wait_x = (arrival_time + customer.ready_time) / 2
                     
                     # Só mostra se houver espaço
                     if wait_x > min_time:
-                        ax.plot([arrival_time, customer.ready_time],
-                            [y_pos, y_pos],
-                            color='orange',
-                            linestyle='--',
-                            linewidth=3,
-                            alpha=0.7)
-                        ax.text(wait_x, y_pos + 0.35, 
-                            f'⏱{wait_time:.0f}min', 
-                            fontsize=8, color='orange',
-                            ha='center', fontweight='bold',
-                            bbox=dict(boxstyle='round,pad=0.2',
-                                        facecolor='white',
-                                        alpha=0.7))
+                        wait_segs.append(((arrival_time, y_pos),
+                                          (customer.ready_time, y_pos)))
+                        wait_labels.append((wait_x, y_pos + 0.35, wait_time))
                 
-                # Atualiza tempo
-                current_time = service_end
-                current_loc = customer
                 y_pos += 1
             
             # Dados do veículo
@@ -334,6 +502,39 @@ class VRPTWVisualizer:
             
             y_pos += 0.5  # Espaço entre veículos
         
+        # Janelas, esperas e atendimentos (na ordem de sobreposição original)
+        ax.add_collection(PolyCollection(window_verts, facecolors='lightblue',
+                                         edgecolors='blue', linewidths=2,
+                                         alpha=0.6, zorder=1))
+        if wait_segs:
+            ax.add_collection(LineCollection(wait_segs, colors='orange',
+                                             linestyles='--', linewidths=3,
+                                             alpha=0.7, zorder=2))
+        if service_segs:
+            ax.add_collection(LineCollection(service_segs, colors=service_colors,
+                                             linewidths=service_lws,
+                                             capstyle='projecting',
+                                             alpha=0.9, zorder=2))
+            marker_xy = np.array(marker_xy)
+            ax.scatter(marker_xy[:, 0], marker_xy[:, 1], s=marker_sizes,
+                       c=marker_colors, edgecolors='black', linewidths=1.5,
+                       alpha=0.9, zorder=2)
+        if late_xy:
+            late_xy = np.array(late_xy)
+            ax.scatter(late_xy[:, 0], late_xy[:, 1], marker='x', s=150,
+                       c='darkred', linewidths=3, zorder=3)
+        
+        # Rótulos de espera apenas quando são poucos (texto sem emoji: a
+        # fonte padrão não tem o glifo)
+        if len(wait_labels) <= WAIT_LABELS_MAX:
+            for wait_x, label_y, wait_time in wait_labels:
+                ax.text(wait_x, label_y, f'{wait_time:.0f}min',
+                    fontsize=8, color='orange',
+                    ha='center', fontweight='bold',
+                    bbox=dict(boxstyle='round,pad=0.2',
+                                facecolor='white',
+                                alpha=0.7))
+        
         # CORRIGIDO: Desenha labels dos veículos DENTRO do gráfico
         for vdata in vehicle_data:
             # Linha separadora
@@ -372,18 +573,17 @@ class VRPTWVisualizer:
                     linewidth=1,
                     alpha=0.3)
         
-        # Grid vertical (horas)
-        hour_start = int(min_time // 60)
-        hour_end = int(max_time // 60) + 1
+        # Grid vertical (horas): linhas em uma única coleção, cobrindo o
+        # intervalo do eixo y definido abaixo
+        hours = np.arange(int(min_time // 60), int(max_time // 60) + 2)
+        hours = hours[(hours * 60 >= min_time) & (hours * 60 <= max_time)]
         
-        for hour in range(hour_start, hour_end + 1):
-            minute = hour * 60
-            if min_time <= minute <= max_time:
-                ax.axvline(x=minute, color='gray', linestyle=':', 
-                        linewidth=1, alpha=0.4)
-                ax.text(minute, -0.8, f'{hour}h', 
-                    ha='center', fontsize=10, 
-                    color='gray', fontweight='bold')
+        ax.vlines(hours * 60, -1, y_pos, color='gray', linestyle=':',
+                  linewidth=1, alpha=0.4)
+        for hour in hours.tolist():
+            ax.text(hour * 60, -0.8, f'{hour}h', 
+                ha='center', fontsize=10, 
+                color='gray', fontweight='bold')
         
         # CORRIGIDO: Ajusta limites para centralizar
         ax.set_xlim(min_time, max_time)
@@ -397,7 +597,7 @@ class VRPTWVisualizer:
         
         # Título com estatísticas
         violation_rate = (total_violations / total_customers * 100) if total_customers > 0 else 0
-        status = "✅ TODAS OK" if total_violations == 0 else f"❌ {total_violations} VIOLAÇÕES"
+        status = "TODAS OK" if total_violations == 0 else f"{total_violations} VIOLAÇÕES"
         
         ax.set_title(f'Cumprimento das Janelas de Tempo - {status}\n'
                     f'{total_customers} clientes | Taxa de violação: {violation_rate:.1f}%\n'
@@ -405,9 +605,6 @@ class VRPTWVisualizer:
                     fontsize=14, fontweight='bold', pad=20)
         
         # Legenda
-        from matplotlib.patches import Patch
-        from matplotlib.lines import Line2D
-        
         legend_elements = [
             Patch(facecolor='lightblue', edgecolor='blue', linewidth=2,
                 label='Janela de tempo permitida'),
@@ -416,7 +613,8 @@ class VRPTWVisualizer:
             Line2D([0], [0], color='red', linewidth=5, marker='o', markersize=9,
                 label='□ VIOLAÇÃO (chegou atrasado)'),
             Line2D([0], [0], color='orange', linewidth=3, linestyle='--',
-                label='⏱ Tempo de espera'),
+                label='Tempo de espera' if len(wait_labels) <= WAIT_LABELS_MAX
+                else f'Tempo de espera ({len(wait_labels)} esperas)'),
         ]
         
         ax.legend(handles=legend_elements, 
@@ -434,15 +632,17 @@ class VRPTWVisualizer:
         ax.spines['top'].set_visible(False)
         ax.spines['right'].set_visible(False)
         
-        plt.tight_layout()
+        # Eixo único: ver plot_solution
+        if show:
+            fig.tight_layout()
         
         if save_path:
             os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
             print(f"✓ Gráfico salvo: {save_path}")
             print(f"  Violações detectadas: {total_violations}/{total_customers}")
         
-        plt.show()
+        self._finish(fig, show)
 
 
 if __name__ == "__main__":